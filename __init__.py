@@ -12,32 +12,45 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 """A skill to set one or more timers for things like a kitchen timer."""
+import json
+import math
 import time
-import pickle
 from datetime import timedelta
 from pathlib import Path
-from typing import List, Optional
+from typing import Callable, List, Optional
 
 from mycroft import MycroftSkill, intent_handler
-from mycroft.audio import wait_while_speaking
 from mycroft.skills.intent_service import AdaptIntent
 from mycroft.messagebus.message import Message
-from mycroft.util import play_wav
-from mycroft.util.format import pronounce_number, nice_duration, join_list
-from mycroft.util.parse import extract_duration
+from mycroft.util.format import join_list, nice_duration
 from mycroft.util.time import now_utc, now_local
 from .skill import (
+    Beeper,
     CountdownTimer,
+    ExpirationQueue,
     extract_timer_duration,
     extract_timer_name,
-    FaceplateRenderer,
+    get_next_announcement,
+    get_speakable_number,
     get_timers_matching_reply,
     get_timers_matching_utterance,
+    IntentMetrics,
+    parse_utterance,
     remove_conjunction,
+    read_timer_requests,
+    StatusQuery,
+    TickProfiler,
     TimerDialog,
+    TimerFilter,
+    TimerJournal,
+    TimerSnapshot,
+    TimerStore,
 )
 
 ONE_DAY = 86400
+DISPLAY_ROTATION_SECONDS = 10
+DISPLAY_RESYNC_SECONDS = 60
+GUI_DISPLAY_MAX = 4
 MARK_I = "mycroft_mark_1"
 MARK_II = "mycroft_mark_2"
 
@@ -52,19 +65,82 @@ class TimerSkill(MycroftSkill):
     def __init__(self):
         """Constructor"""
         super().__init__(self.__class__.__name__)
-        self.active_timers = []
+        self.active_timers = TimerStore()
+        self.expiration_queue = ExpirationQueue()
+        self.expiration_check_repeating = False
         self.sound_file_path = Path(__file__).parent.joinpath("sounds", "two-beep.wav")
+        self.beeper = Beeper(
+            self.sound_file_path,
+            play_wav_cmdline=self.config_core.get("play_wav_cmdline"),
+        )
         self.platform = self.config_core["enclosure"].get("platform", "unknown")
-        self.timer_index = 0
         self.display_group = 0
-        self.regex_file_path = self.find_resource("name.rx", "regex")
-        self.all_timers_words = [word.strip() for word in self.translate_list("all")]
+        self.gui_display_data = None
+        self.speech_in_progress = False
+        self.mouth_events_deactivated = False
+        self._regex_file_path = None
+        self._dialog_files = {}
+        self._all_timers_words = None
         self.save_path = Path(self.file_system.path).joinpath("save_timers")
+        self.timer_journal = TimerJournal(
+            Path(self.file_system.path).joinpath("timers.journal")
+        )
+        self.faceplate_renderer = None
+        self.metrics = IntentMetrics(self._publish_metrics)
+        self.tick_profiler = TickProfiler()
+
+    @property
+    def regex_file_path(self) -> str:
+        """Location of the regular expressions that find timer names in requests."""
+        if self._regex_file_path is None:
+            self._regex_file_path = self.find_resource("name.rx", "regex")
+
+        return self._regex_file_path
+
+    def _has_dialog(self, dialog_name: str) -> bool:
+        """Determine if the dialog is translated to the skill's language.
+
+        Dialogs for more than one timer are not translated to every language, so
+        callers fall back to the dialog for a single timer.  Each dialog is only
+        looked for the first time it is needed.
+
+        Args:
+            dialog_name: the name of the dialog, e.g. "timer-expired-multiple"
+        """
+        if dialog_name not in self._dialog_files:
+            self._dialog_files[dialog_name] = self.find_resource(
+                dialog_name + ".dialog", "dialog"
+            )
+
+        return self._dialog_files[dialog_name] is not None
+
+    @property
+    def all_timers_words(self) -> List[str]:
+        """The words that refer to all timers, e.g. "all" and "every"."""
+        if self._all_timers_words is None:
+            self._all_timers_words = [
+                word.strip() for word in self.translate_list("all")
+            ]
+
+        return self._all_timers_words
 
     def initialize(self):
-        """Initialization steps to execute after the skill is loaded."""
+        """Initialization steps to execute after the skill is loaded.
+
+        The faceplate renderer is only imported on a device with a faceplate.
+        """
+        if self.platform == MARK_I:
+            from .skill.faceplate import FaceplateRenderer
+
+            self.faceplate_renderer = FaceplateRenderer(
+                self.enclosure, Path(self.file_system.path).joinpath("faceplate.png")
+            )
+        self.metrics.enabled = bool(self.settings.get("collect_metrics", False))
+        self.tick_profiler.enabled = bool(self.settings.get("profile_ticks", False))
+        # Listen before loading so other programs are told about restored timers.
+        self.active_timers.add_listener(self._publish_timer_change)
+        self.expiration_queue.add_listener(self._publish_timer_expired)
         self._load_timers()
-        self._reset_timer_index()
         if self.active_timers:
             self.log.info("found {} active timers".format(str(len(self.active_timers))))
             self._show_gui()
@@ -77,7 +153,14 @@ class TimerSkill(MycroftSkill):
             "mycroft.speech.recognition.unknown", self.handle_speech_recognition_unknown
         )
         self.add_event("speak", self.handle_speak)
+        self.add_event("recognizer_loop:audio_output_end", self.handle_audio_output_end)
         self.add_event("skill.timer.stop", self.handle_timer_stop)
+        self.add_event("mycroft.gui.connected", self.handle_gui_connected)
+        self.add_event("timer.metrics.request", self.handle_metrics_request)
+        self.add_event("timer.bulk.create", self.handle_bulk_create)
+        self.add_event("timer.bulk.cancel", self.handle_bulk_cancel)
+        self.add_event("timer.bulk.query", self.handle_bulk_query)
+        self.add_event("timer.status.request", self.handle_status_request)
 
     @intent_handler(AdaptIntent().optionally("start").require("timer"))
     def handle_start_timer_generic(self, message: Message):
@@ -171,12 +254,234 @@ class TimerSkill(MycroftSkill):
         """
         self._cancel_timers(message)
 
+    def handle_metrics_request(self, message: Message):
+        """Reply to a request for the request handling metrics collected so far.
+
+        The request can also turn metrics collection or tick profiling on or off,
+        e.g. when profiling a device without changing its settings.
+
+        Args:
+            message: Message Bus event, optionally with "enabled" and
+                "profile_ticks" flags
+        """
+        if "enabled" in message.data:
+            self.metrics.enabled = bool(message.data["enabled"])
+        if "profile_ticks" in message.data:
+            self.tick_profiler.enabled = bool(message.data["profile_ticks"])
+        self.bus.emit(
+            message.response(
+                dict(
+                    enabled=self.metrics.enabled,
+                    metrics=self.metrics.summarize(),
+                    profile_ticks=self.tick_profiler.enabled,
+                    ticks=self.tick_profiler.summarize(),
+                )
+            )
+        )
+
+    def handle_bulk_create(self, message: Message):
+        """Start all the timers in a message from another program, e.g. a recipe.
+
+        The timers are validated as a whole, journaled with a single write and
+        confirmed with a single dialog unless the message data includes
+        "speak": false.  Timers whose name is already in use are not started.
+
+        Args:
+            message: Message Bus event with a "timers" list of durations (in seconds)
+                and optional names
+        """
+        with self.metrics.request("bulk_create"):
+            try:
+                timer_requests = read_timer_requests(message.data)
+            except ValueError as exc:
+                self.log.warning(str(exc))
+                self.bus.emit(message.response(dict(error=str(exc))))
+                return
+            had_active_timers = bool(self.active_timers)
+            started_timers = []
+            rejected_names = []
+            with self.active_timers.writing(), self.timer_journal.batch():
+                for duration, name in timer_requests:
+                    if name is not None and self.active_timers.get_by_name(name):
+                        rejected_names.append(name)
+                        continue
+                    timer = CountdownTimer(duration, name)
+                    if timer.name is None:
+                        timer.name = self._assign_timer_name()
+                    self._add_active_timer(timer)
+                    started_timers.append(timer)
+            if started_timers:
+                if had_active_timers:
+                    self._refresh_display()
+                else:
+                    self._show_gui()
+                    self._start_display_update()
+                self._start_expiration_check()
+                if message.data.get("speak", True):
+                    timer_count = len(self.active_timers)
+                    self._speak_bulk_change(
+                        started_timers,
+                        "started-timer-multiple",
+                        lambda dialog: dialog.build_add_dialog(timer_count),
+                    )
+            now = time.monotonic()
+            self.bus.emit(
+                message.response(
+                    dict(
+                        timers=[timer.describe(now) for timer in started_timers],
+                        rejected=rejected_names,
+                    )
+                )
+            )
+
+    def handle_bulk_cancel(self, message: Message):
+        """Cancel the timers selected by a filter in a message from another program.
+
+        Args:
+            message: Message Bus event with the filter criteria, see TimerFilter
+        """
+        with self.metrics.request("bulk_cancel"):
+            try:
+                timer_filter = TimerFilter.from_message_data(message.data)
+            except ValueError as exc:
+                self.log.warning(str(exc))
+                self.bus.emit(message.response(dict(error=str(exc))))
+                return
+            with self.active_timers.writing(), self.timer_journal.batch():
+                cancelled_timers = timer_filter.select(self.active_timers.snapshot())
+                for timer in cancelled_timers:
+                    self._remove_active_timer(timer)
+            if cancelled_timers:
+                if self.active_timers:
+                    self._start_expiration_check()
+                    self._refresh_display()
+                else:
+                    self._reset()
+                if message.data.get("speak", True):
+                    self._speak_bulk_change(
+                        cancelled_timers,
+                        "cancelled-timer-multiple",
+                        TimerDialog.build_cancel_dialog,
+                    )
+            now = time.monotonic()
+            self.bus.emit(
+                message.response(
+                    dict(timers=[timer.describe(now) for timer in cancelled_timers])
+                )
+            )
+
+    def handle_bulk_query(self, message: Message):
+        """Reply with the timers selected by a filter in a message.
+
+        Args:
+            message: Message Bus event with the filter criteria, see TimerFilter
+        """
+        try:
+            timer_filter = TimerFilter.from_message_data(message.data)
+        except ValueError as exc:
+            self.bus.emit(message.response(dict(error=str(exc))))
+        else:
+            now = time.monotonic()
+            selected_timers = timer_filter.select(self.active_timers.snapshot(), now)
+            self.bus.emit(
+                message.response(
+                    dict(timers=[timer.describe(now) for timer in selected_timers])
+                )
+            )
+
+    def handle_status_request(self, message: Message):
+        """Reply with the status of the active timers, for dashboards and the like.
+
+        Programs that need to follow the timers as they change should listen for
+        the timer.added, timer.removed, timer.renamed, timer.cleared and
+        timer.expired messages instead of sending requests repeatedly.
+
+        Args:
+            message: Message Bus event, optionally with a "name", "within" (seconds)
+                or "next" (count) to select timers by, see StatusQuery
+        """
+        try:
+            query = StatusQuery.from_message_data(message.data)
+        except ValueError as exc:
+            self.bus.emit(message.response(dict(error=str(exc))))
+        else:
+            now = time.monotonic()
+            selected_timers = query.select(self.active_timers, now)
+            self.bus.emit(
+                message.response(
+                    dict(
+                        count=len(self.active_timers),
+                        timers=[timer.describe(now) for timer in selected_timers],
+                    )
+                )
+            )
+
+    def _publish_timer_change(self, change: str, timer: Optional[CountdownTimer]):
+        """Tell other programs about a change to the active timers.
+
+        Args:
+            change: "added", "removed", "renamed" or "cleared"
+            timer: the timer changed, None when all were cleared
+        """
+        data = {} if timer is None else dict(timer=timer.describe())
+        self.bus.emit(Message("timer." + change, data))
+
+    def _publish_timer_expired(self, timer: CountdownTimer):
+        """Tell other programs that a timer expired."""
+        self.bus.emit(Message("timer.expired", dict(timer=timer.describe())))
+
+    def _speak_bulk_change(
+        self,
+        timers: List[CountdownTimer],
+        dialog_name: str,
+        build_single_dialog: Callable[[TimerDialog], None],
+    ):
+        """Confirm the timers started or cancelled by a bulk request in one dialog.
+
+        Languages without a translation of the dialog for more than one timer get
+        the usual dialog for each timer instead.
+
+        Args:
+            timers: the timers that were started or cancelled
+            dialog_name: the dialog to speak when more than one timer changed
+            build_single_dialog: builds the usual dialog for a single timer
+        """
+        with self.metrics.stage("dialog"):
+            if len(timers) > 1 and self._has_dialog(dialog_name):
+                dialog_data = dict(
+                    number=get_speakable_number(len(timers), self.lang),
+                    timers=self._get_speakable_timer_details(timers),
+                )
+                self.speak_dialog(dialog_name, dialog_data)
+            else:
+                for timer in timers:
+                    dialog = TimerDialog(timer, self.lang)
+                    build_single_dialog(dialog)
+                    self.speak_dialog(dialog.name, dialog.data)
+
+    def _publish_metrics(self, request_metrics: dict):
+        """Emit the stage timings of a request on the message bus."""
+        self.bus.emit(Message("timer.metrics", request_metrics))
+
     def shutdown(self):
         """Perform any cleanup tasks before skill shuts down."""
+        self.cancel_scheduled_event("ResumeTimerDisplay")
         self.cancel_scheduled_event("UpdateTimerDisplay")
         self.cancel_scheduled_event("ExpirationCheck")
+        self.beeper.stop()
+        if self.tick_profiler.enabled:
+            self._log_tick_profile()
+        # The timers are only unloaded, so other programs are not told they cleared.
+        self.active_timers.remove_listener(self._publish_timer_change)
+        self.expiration_queue.remove_listener(self._publish_timer_expired)
         if self.active_timers:
-            self.active_timers = []
+            self.active_timers.clear()
+            self.expiration_queue.clear()
+
+    def _log_tick_profile(self):
+        """Log a summary of the display and expiration check ticks."""
+        for event_name, profile in self.tick_profiler.summarize().items():
+            self.log.info("{} tick profile: {}".format(event_name, json.dumps(profile)))
 
     def _start_new_timer(self, message):
         """Start a new timer as requested by the user.
@@ -184,23 +489,24 @@ class TimerSkill(MycroftSkill):
         Args:
             message: Message Bus event information from the intent parser
         """
-        utterance = message.data["utterance"]
-        try:
-            duration, name = self._validate_requested_timer(utterance)
-        except TimerValidationException as exc:
-            self.log.info(str(exc))
-        else:
-            timer = self._build_timer(duration, name)
-            self.active_timers.append(timer)
-            self.active_timers.sort(key=lambda tmr: tmr.expiration)
-            if len(self.active_timers) == 1:
-                # the expiration checker isn't started here because it is started
-                # in a speech event handler and the new timer is not spoken until
-                # after the display starts.
-                self._show_gui()
-                self._start_display_update()
-            self._speak_new_timer(timer)
-            self._save_timers()
+        with self.metrics.request("start_timer"):
+            utterance = message.data["utterance"]
+            try:
+                duration, name = self._validate_requested_timer(utterance)
+            except TimerValidationException as exc:
+                self.log.info(str(exc))
+            else:
+                timer = self._build_timer(duration, name)
+                self._add_active_timer(timer)
+                if len(self.active_timers) == 1:
+                    self._show_gui()
+                    self._start_display_update()
+                else:
+                    self._refresh_display()
+                self._speak_new_timer(timer)
+                # the new timer may expire before the one the expiration check is
+                # currently waiting on.
+                self._start_expiration_check()
 
     def _validate_requested_timer(self, utterance: str):
         """Don't create a timer unless the request has the necessary information.
@@ -215,12 +521,14 @@ class TimerSkill(MycroftSkill):
             TimerValidationError when any of the checks do not pass.
         """
         duration, remaining_utterance = self._determine_timer_duration(utterance)
-        name = extract_timer_name(remaining_utterance, self.regex_file_path)
+        with self.metrics.stage("parse"):
+            name = extract_timer_name(remaining_utterance, self.regex_file_path)
         duplicate_timer = self._check_for_duplicate_name(name)
         if duplicate_timer:
             self._handle_duplicate_name_error(duplicate_timer)
         if duration.total_seconds() >= ONE_DAY:
-            answer = self.ask_yesno("timer-too-long-alarm-instead")
+            with self.metrics.wait("user_reply"):
+                answer = self.ask_yesno("timer-too-long-alarm-instead")
             if answer == "yes":
                 self._convert_to_alarm(duration)
 
@@ -242,9 +550,12 @@ class TimerSkill(MycroftSkill):
         Raises:
             TimerValidationException when no duration can be determined.
         """
-        duration, remaining_utterance = extract_timer_duration(utterance)
-        if duration == 1:  # prevent "set one timer" doing 1 sec timer
-            duration, remaining_utterance = extract_timer_duration(remaining_utterance)
+        with self.metrics.stage("parse"):
+            duration, remaining_utterance = extract_timer_duration(utterance, self.lang)
+            if duration == 1:  # prevent "set one timer" doing 1 sec timer
+                duration, remaining_utterance = extract_timer_duration(
+                    remaining_utterance, self.lang
+                )
         if duration is None:
             duration = self._request_duration()
         else:
@@ -265,17 +576,16 @@ class TimerSkill(MycroftSkill):
 
         def validate_duration(string):
             """Check that extract_duration returns a valid duration."""
-            extracted_duration = None
-            extract = extract_duration(string, self.lang)
-            if extract is not None:
-                extracted_duration = extract[0]
+            extracted_duration, _ = extract_timer_duration(string, self.lang)
             return extracted_duration is not None
 
-        response = self.get_response("ask-how-long", validator=validate_duration)
+        with self.metrics.wait("user_reply"):
+            response = self.get_response("ask-how-long", validator=validate_duration)
         if response is None:
             raise TimerValidationException("No response to request for timer duration.")
         else:
-            duration, _ = extract_timer_duration(response)
+            # The validator already parsed the response so this is a cache hit.
+            duration, _ = extract_timer_duration(response, self.lang)
             if duration is None:
                 raise TimerValidationException("No duration specified")
 
@@ -293,9 +603,7 @@ class TimerSkill(MycroftSkill):
         """
         duplicate_timer = None
         if timer_name is not None:
-            for timer in self.active_timers:
-                if timer_name.lower() == timer.name.lower():
-                    duplicate_timer = timer
+            duplicate_timer = self.active_timers.get_by_name(timer_name)
 
         return duplicate_timer
 
@@ -308,7 +616,7 @@ class TimerSkill(MycroftSkill):
         Raises:
             TimerValidationError so that no more validations are done.
         """
-        time_remaining = duplicate_timer.expiration - now_utc()
+        time_remaining = duplicate_timer.time_remaining or timedelta(0)
         self.speak_dialog(
             "timer-duplicate-name",
             data=dict(
@@ -349,12 +657,9 @@ class TimerSkill(MycroftSkill):
         Returns:
             Newly generated timer object.
         """
-        self.timer_index += 1
         timer = CountdownTimer(duration, requested_name)
         if timer.name is None:
             timer.name = self._assign_timer_name()
-        timer.index = self.timer_index
-        timer.ordinal = self._calculate_ordinal(timer.duration)
 
         return timer
 
@@ -376,13 +681,16 @@ class TimerSkill(MycroftSkill):
             max_assigned_number = 0
             for timer in self.active_timers:
                 if timer.name == "Timer":
-                    timer.name = "Timer 1"
+                    with self.active_timers.writing():
+                        if timer in self.active_timers:
+                            self.active_timers.rename(timer, "Timer 1")
+                            self.timer_journal.record_rename(timer)
                     max_assigned_number = 1
                 elif timer.name.startswith("Timer "):
-                    _, name_number = timer.name.split()
-                    name_number = int(name_number)
-                    if name_number > max_assigned_number:
-                        max_assigned_number = name_number
+                    # Requested names like "Timer pasta" were not assigned here.
+                    name_number = timer.name[len("Timer ") :]
+                    if name_number.isdecimal():
+                        max_assigned_number = max(max_assigned_number, int(name_number))
             new_timer_number = max_assigned_number + 1
             timer_name = "Timer " + str(new_timer_number)
         else:
@@ -390,32 +698,18 @@ class TimerSkill(MycroftSkill):
 
         return timer_name
 
-    def _calculate_ordinal(self, duration: timedelta) -> int:
-        """Get ordinal based on existing timer durations.
-
-        Args:
-            duration: amount of time requested for the timer
-
-        Returns:
-            The ordinal of the new timer based on other active timers with the
-            same duration
-        """
-        timer_count = sum(
-            1 for timer in self.active_timers if timer.duration == duration
-        )
-
-        return timer_count + 1
-
     def _speak_new_timer(self, timer: CountdownTimer):
         """Speak a confirmation to the user that the new timer has been added.
 
         Args:
             timer: new timer requested by the user
         """
-        dialog = TimerDialog(timer, self.lang)
-        timer_count = len(self.active_timers)
-        dialog.build_add_dialog(timer_count)
-        self.speak_dialog(dialog.name, dialog.data, wait=True)
+        with self.metrics.stage("dialog"):
+            dialog = TimerDialog(timer, self.lang)
+            timer_count = len(self.active_timers)
+            dialog.build_add_dialog(timer_count)
+        with self.metrics.wait("speech"):
+            self.speak_dialog(dialog.name, dialog.data, wait=True)
 
     def _communicate_timer_status(self, message: Message):
         """Speak response to the user's request for status of timer(s).
@@ -423,13 +717,14 @@ class TimerSkill(MycroftSkill):
         Args:
             message: Message Bus event information from the intent parser
         """
-        if self.active_timers:
-            utterance = message.data["utterance"]
-            matches = self._get_timer_status_matches(utterance)
-            if matches is not None:
-                self._speak_timer_status_matches(matches)
-        else:
-            self.speak_dialog("no-active-timer")
+        with self.metrics.request("timer_status"):
+            if self.active_timers:
+                utterance = message.data["utterance"]
+                matches = self._get_timer_status_matches(utterance)
+                if matches is not None:
+                    self._speak_timer_status_matches(matches)
+            else:
+                self.speak_dialog("no-active-timer")
 
     def _get_timer_status_matches(self, utterance: str) -> List[CountdownTimer]:
         """Determine which active timer(s) match the user's status request.
@@ -441,13 +736,14 @@ class TimerSkill(MycroftSkill):
             Active timer(s) matching the user's request
         """
         if len(self.active_timers) == 1:
-            matches = self.active_timers
+            matches = list(self.active_timers)
         else:
-            matches = get_timers_matching_utterance(
-                utterance, self.active_timers, self.regex_file_path
-            )
+            with self.metrics.stage("match"):
+                matches = get_timers_matching_utterance(
+                    utterance, self.active_timers, self.regex_file_path, self.lang
+                )
             if matches is None:
-                matches = self.active_timers
+                matches = list(self.active_timers)
 
         while matches is not None and len(matches) > 2:
             matches = self._ask_which_timer(matches, question="ask-which-timer")
@@ -461,9 +757,13 @@ class TimerSkill(MycroftSkill):
             matches: the active timers that matched the user's request for timer status
         """
         if matches:
+            # TODO: speak_dialog should have option to not show mouth
+            #   For now, deactivate until the status has been spoken.
+            self.enclosure.deactivate_mouth_events()
+            self.mouth_events_deactivated = True
             number_of_timers = len(matches)
             if number_of_timers > 1:
-                speakable_number = pronounce_number(number_of_timers)
+                speakable_number = get_speakable_number(number_of_timers, self.lang)
                 dialog_data = dict(number=speakable_number)
                 self.speak_dialog("number-of-timers", dialog_data)
             for timer in matches:
@@ -474,18 +774,16 @@ class TimerSkill(MycroftSkill):
     def _speak_timer_status(self, timer: CountdownTimer):
         """Speak the status of an individual timer - remaining or elapsed.
 
+        The audio service speaks queued dialogs in order so there is no need to wait
+        for one status to be spoken before queueing the next.
+
         Args:
             timer: timer the status will be communicated for
         """
-        # TODO: speak_dialog should have option to not show mouth
-        #   For now, just deactivate.  The sleep() is to allow the
-        #   message to make it across the bus first.
-        self.enclosure.deactivate_mouth_events()
-        time.sleep(0.25)
-        dialog = TimerDialog(timer, self.lang)
-        dialog.build_status_dialog()
-        self.speak_dialog(dialog.name, dialog.data, wait=True)
-        self.enclosure.activate_mouth_events()
+        with self.metrics.stage("dialog"):
+            dialog = TimerDialog(timer, self.lang)
+            dialog.build_status_dialog()
+        self.speak_dialog(dialog.name, dialog.data)
 
     def _cancel_timers(self, message: Message):
         """Handle a user's request to cancel one or more timers.
@@ -493,25 +791,31 @@ class TimerSkill(MycroftSkill):
         Args:
             message: Message Bus event information from the intent parser
         """
-        utterance = message.data["utterance"]
-        utterance_words = utterance.split()
-        cancel_all = any(
-            word in utterance_words for word in self.all_timers_words
-        ) or message.data.get("all")
-        active_timer_count = len(self.active_timers)
-
-        if not self.active_timers:
-            self.speak_dialog("no-active-timer")
-        elif cancel_all:
-            self._cancel_all_timers()
-        elif active_timer_count == 1:
-            self._cancel_single_timer(utterance)
-        elif active_timer_count > 1:
-            self._determine_which_timer_to_cancel(utterance)
-        self._save_timers()
-        self.log.info("active_timers: " + str(bool(self.active_timers)))
-        if not self.active_timers:
-            self._reset()
+        with self.metrics.request("cancel_timer"):
+            utterance = message.data["utterance"]
+            with self.metrics.stage("parse"):
+                parsed_utterance = parse_utterance(
+                    utterance, self.regex_file_path, self.lang
+                )
+            cancel_all = parsed_utterance.includes_any(
+                self.all_timers_words
+            ) or message.data.get("all")
+            active_timer_count = len(self.active_timers)
+
+            if not self.active_timers:
+                self.speak_dialog("no-active-timer")
+            elif cancel_all:
+                self._cancel_all_timers()
+            elif active_timer_count == 1:
+                self._cancel_single_timer(utterance)
+            elif active_timer_count > 1:
+                self._determine_which_timer_to_cancel(utterance)
+            self.log.info("active_timers: " + str(bool(self.active_timers)))
+            if self.active_timers:
+                self._start_expiration_check()
+                self._refresh_display()
+            else:
+                self._reset()
 
     def _cancel_all_timers(self):
         """Handle a user's request to cancel all active timers."""
@@ -519,7 +823,7 @@ class TimerSkill(MycroftSkill):
             self.speak_dialog("cancelled-single-timer")
         else:
             self.speak_dialog("cancel-all", data={"count": len(self.active_timers)})
-        self.active_timers = list()
+        self._remove_all_active_timers()
 
     def _cancel_single_timer(self, utterance: str):
         """Cancel the only active timer.
@@ -538,7 +842,7 @@ class TimerSkill(MycroftSkill):
             if reply == "no":
                 timer = None
         if timer is not None:
-            self.active_timers.remove(timer)
+            self._remove_active_timer(timer)
             self.speak_dialog("cancelled-single-timer")
 
     def _match_cancel_request(self, utterance: str) -> bool:
@@ -550,9 +854,10 @@ class TimerSkill(MycroftSkill):
         Returns:
             An indicator of whether or not a match was found.
         """
-        matches = get_timers_matching_utterance(
-            utterance, self.active_timers, self.regex_file_path
-        )
+        with self.metrics.stage("match"):
+            matches = get_timers_matching_utterance(
+                utterance, self.active_timers, self.regex_file_path, self.lang
+            )
         match_criteria_in_utterance = matches is not None
         if match_criteria_in_utterance:
             timer_matched_criteria = len(matches) == 1
@@ -572,7 +877,8 @@ class TimerSkill(MycroftSkill):
         """
         dialog = TimerDialog(timer, self.lang)
         dialog.build_cancel_confirm_dialog()
-        reply = self.ask_yesno(dialog.name, dialog.data)
+        with self.metrics.wait("user_reply"):
+            reply = self.ask_yesno(dialog.name, dialog.data)
 
         return reply
 
@@ -582,19 +888,21 @@ class TimerSkill(MycroftSkill):
         Args:
             utterance: The timer cancellation request made by the user.
         """
-        matches = get_timers_matching_utterance(
-            utterance, self.active_timers, self.regex_file_path
-        )
+        with self.metrics.stage("match"):
+            matches = get_timers_matching_utterance(
+                utterance, self.active_timers, self.regex_file_path, self.lang
+            )
         if matches is None:
-            matches = self.active_timers
+            matches = list(self.active_timers)
         while matches is not None and len(matches) > 1:
             matches = self._ask_which_timer(matches, question="ask-which-timer-cancel")
 
         if matches:
             timer = matches[0]
-            self.active_timers.remove(timer)
-            dialog = TimerDialog(timer, self.lang)
-            dialog.build_cancel_dialog()
+            self._remove_active_timer(timer)
+            with self.metrics.stage("dialog"):
+                dialog = TimerDialog(timer, self.lang)
+                dialog.build_cancel_dialog()
             self.speak_dialog(dialog.name, dialog.data)
         else:
             self.speak_dialog("timer-not-found")
@@ -602,12 +910,12 @@ class TimerSkill(MycroftSkill):
     def _reset(self):
         """There are no active timers so reset all the stateful things."""
         self.gui.release()
+        self.gui_display_data = None
         self._stop_display_update()
         self._stop_expiration_check()
-        self.timer_index = 0
         if self.platform == MARK_I:
             self.enclosure.eyes_reset()
-            self.enclosure.mouth_reset()
+            self._reset_faceplate()
 
     def _ask_which_timer(
         self, timers: List[CountdownTimer], question: str
@@ -623,12 +931,13 @@ class TimerSkill(MycroftSkill):
         """
         filtered_timers = None
         speakable_matches = self._get_speakable_timer_details(timers)
-        reply = self.get_response(
-            dialog=question, data=dict(count=len(timers), names=speakable_matches)
-        )
+        with self.metrics.wait("user_reply"):
+            reply = self.get_response(
+                dialog=question, data=dict(count=len(timers), names=speakable_matches)
+            )
         if reply is not None:
             filtered_timers = get_timers_matching_reply(
-                reply, timers, self.regex_file_path
+                reply, timers, self.regex_file_path, self.lang
             )
 
         return filtered_timers
@@ -658,6 +967,7 @@ class TimerSkill(MycroftSkill):
         accurate.
         """
         if self.gui.connected:
+            self.gui_display_data = None
             self._update_gui()
             if self.platform == MARK_II:
                 page = "timer_mark_ii.qml"
@@ -668,76 +978,150 @@ class TimerSkill(MycroftSkill):
     def update_display(self):
         """Update the device's display to show the status of active timers.
 
-        Runs once a second via a repeating event to keep the information on the display
-        accurate.
+        On the Mark I, runs once a second via a repeating event to keep the time
+        remaining on the faceplate accurate.  The GUI counts the timers down on its
+        own, so otherwise this runs when the active timers change and when the group
+        of timers on the screen is due to rotate.  If there is no GUI connected,
+        nothing is scheduled until one connects.
         """
-        if self.gui.connected:
-            self._update_gui()
-        elif self.platform == MARK_I:
-            self._display_timers_on_faceplate()
+        period = 1 if self.platform == MARK_I else None
+        with self.tick_profiler.tick("UpdateTimerDisplay", period):
+            with self.tick_profiler.phase("gui_status"):
+                gui_connected = self.gui.connected
+            if gui_connected:
+                self._update_gui()
+                self._schedule_display_rotation()
+            elif self.platform == MARK_I:
+                self._display_timers_on_faceplate()
+
+    def _schedule_display_rotation(self):
+        """Update the GUI when the next group of timers is due to be displayed.
+
+        With a single group of timers, update the GUI once a minute anyway so that a
+        change to the wall clock is picked up; nothing is sent unless it changed.
+        """
+        self.cancel_scheduled_event("UpdateTimerDisplay")
+        if len(self.active_timers) > GUI_DISPLAY_MAX:
+            seconds_to_update = DISPLAY_ROTATION_SECONDS - (
+                time.time() % DISPLAY_ROTATION_SECONDS
+            )
+        elif self.active_timers:
+            seconds_to_update = DISPLAY_RESYNC_SECONDS
+        else:
+            return
+        self.schedule_event(
+            self.update_display, seconds_to_update, name="UpdateTimerDisplay"
+        )
+
+    def handle_gui_connected(self, _):
+        """Show the active timers on a GUI that connected after they were started."""
+        if self.active_timers:
+            self._show_gui()
+            self._start_display_update()
 
     def _update_gui(self):
-        """Display active timers on a device that supports the QT GUI framework."""
-        timers_to_display = self._select_timers_to_display(display_max=4)
-        display_data = [timer.display_data for timer in timers_to_display]
-        if timers_to_display:
-            self.gui["activeTimers"] = dict(timers=display_data)
-            self.gui["activeTimerCount"] = len(timers_to_display)
+        """Display active timers on a device that supports the QT GUI framework.
+
+        The GUI counts the displayed timers down on its own, so new values are only
+        sent when the timers being displayed change.  Every value set is sent over
+        the message bus with all the other session data.
+        """
+        with self.tick_profiler.phase("display_data"):
+            timers_to_display = self._select_timers_to_display(
+                self.active_timers.snapshot(), GUI_DISPLAY_MAX
+            )
+            display_data = [timer.display_data for timer in timers_to_display]
+        if display_data and display_data != self.gui_display_data:
+            with self.tick_profiler.phase("gui"):
+                self.gui["activeTimers"] = dict(timers=display_data)
+                if len(display_data) != len(self.gui_display_data or []):
+                    self.gui["activeTimerCount"] = len(display_data)
+            self.gui_display_data = display_data
 
     def _display_timers_on_faceplate(self):
         """Display one timer on a device that supports and Arduino faceplate."""
         faceplate_user = self.enclosure.display_manager.get_active()
         if faceplate_user == "TimerSkill":
             previous_display_group = self.display_group
-            timers_to_display = self._select_timers_to_display(display_max=1)
+            active_timers = self.active_timers.snapshot()
+            timers_to_display = self._select_timers_to_display(
+                active_timers, display_max=1
+            )
             if self.display_group != previous_display_group:
-                self.enclosure.mouth_reset()
+                self._reset_faceplate()
             if timers_to_display:
-                timer_to_display = timers_to_display[0]
-                renderer = FaceplateRenderer(self.enclosure, timer_to_display)
-                if len(self.active_timers) > 1:
-                    renderer.multiple_active_timers = True
-                renderer.render()
+                with self.tick_profiler.phase("faceplate"):
+                    self.faceplate_renderer.render(
+                        timers_to_display[0],
+                        multiple_active_timers=len(active_timers) > 1,
+                    )
+        else:
+            # Something else is using the faceplate so it will need a full redraw.
+            self.faceplate_renderer.reset()
 
-    def _select_timers_to_display(self, display_max: int) -> List[CountdownTimer]:
+    def _reset_faceplate(self):
+        """Clear the Mark I faceplate and redraw all of it on the next update."""
+        self.enclosure.mouth_reset()
+        self.faceplate_renderer.reset()
+
+    def _select_timers_to_display(
+        self, active_timers: TimerSnapshot, display_max: int
+    ) -> List[CountdownTimer]:
         """Determine which timers will populate the display.
 
         If there are more timers than fit on a screen or faceplate, change which
-        timers are displayed every ten seconds.
+        timers are displayed every ten seconds.  The group displayed is derived from
+        the clock so that it is known when the next group is due.
 
         Args:
+            active_timers: snapshot of the active timers taken for this update
             display_max: maximum number of timers that can be displayed at once
 
         Returns:
             The timer(s) to be displayed.
         """
-        if len(self.active_timers) <= display_max:
-            timers_to_display = self.active_timers
+        if len(active_timers) <= display_max:
+            timers_to_display = active_timers
         else:
-            if not now_utc().second % 10:
-                if (self.display_group * display_max) < len(self.active_timers):
-                    self.display_group += 1
-                else:
-                    self.display_group = 1
-
+            group_count = math.ceil(len(active_timers) / display_max)
+            rotation = int(time.time() // DISPLAY_ROTATION_SECONDS)
+            self.display_group = rotation % group_count + 1
             start_index = (self.display_group - 1) * display_max
             end_index = self.display_group * display_max
-            timers_to_display = self.active_timers[start_index:end_index]
+            timers_to_display = active_timers[start_index:end_index]
 
         return timers_to_display
 
     def check_for_expired_timers(self):
         """Provide a audible and visual indicator when one or more timers expire.
 
-        Runs once every two seconds via a repeating event.
+        Runs when the next timer is due to expire, then once every two seconds via a
+        repeating event for as long as an expired timer is active.  The beeper keeps
+        beeping in the background until the expiration check is stopped.  It is not
+        started on a pass that announces an expiration, because the announcement
+        pauses the expiration check and the beeping.
         """
-        expired_timers = [timer for timer in self.active_timers if timer.expired]
-        if expired_timers:
-            play_proc = play_wav(str(self.sound_file_path))
-            if self.platform == MARK_I:
-                self._flash_eyes()
-            self._speak_expired_timer(expired_timers)
-            play_proc.wait()
+        period = 2 if self.expiration_check_repeating else None
+        with self.tick_profiler.tick("ExpirationCheck", period):
+            with self.tick_profiler.phase("collect_expired"):
+                expired_timers = self.expiration_queue.collect_expired(time.monotonic())
+            if not expired_timers:
+                # The scheduler only has a resolution of one second so the event can
+                # fire slightly before the timer expires.
+                self._start_expiration_check()
+            else:
+                if not self.expiration_check_repeating:
+                    self._start_expiration_check()
+                timers_to_announce = self._get_timers_to_announce(expired_timers)
+                if not timers_to_announce:
+                    with self.tick_profiler.phase("beep"):
+                        self.beeper.start()
+                if self.platform == MARK_I:
+                    with self.tick_profiler.phase("eyes"):
+                        self._flash_eyes()
+                if timers_to_announce:
+                    with self.tick_profiler.phase("announce"):
+                        self._speak_expired_timer(timers_to_announce)
 
     def _flash_eyes(self):
         """Flash the eyes (if supported) as a visual indicator that a timer expired."""
@@ -746,27 +1130,51 @@ class TimerSkill(MycroftSkill):
         else:
             self.enclosure.eyes_off()
 
-    def _speak_expired_timer(self, expired_timers):
-        """Announce the expiration of any timers not already announced.
+    def _get_timers_to_announce(
+        self, expired_timers: List[CountdownTimer]
+    ) -> List[CountdownTimer]:
+        """Determine which expired timers, if any, to announce on this pass.
+
+        This occurs every two seconds, so only announce one expired timer per pass,
+        along with any other timers that expired within the announcement window
+        setting of it.
+        """
+        if self._has_dialog("timer-expired-multiple"):
+            window = float(self.settings.get("expiration_announcement_window", 5))
+        else:
+            window = 0
+
+        return get_next_announcement(expired_timers, window)
+
+    def _speak_expired_timer(self, timers_to_announce: List[CountdownTimer]):
+        """Announce the expiration of timers not already announced.
 
-        This occurs every two seconds, so only announce one expired timer per pass.
         Pause the expiration check so the expired timer is not beeping while the
-        expiration announcement is being spoken.
+        expiration announcement is being spoken.  The check resumes when the device
+        finishes speaking, which also keeps announcements from overlapping.
 
         On the Mark I, pause the display of any active timers so that the mouth can
         do the "talking".
         """
-        for timer in expired_timers:
-            if not timer.expiration_announced:
-                dialog = TimerDialog(timer, self.lang)
-                dialog.build_expiration_announcement_dialog(len(self.active_timers))
-                self._stop_expiration_check()
-                if self.platform == MARK_I:
-                    self._stop_display_update()
-                time.sleep(1)  # give the scheduled event a second to clear
-                self.speak_dialog(dialog.name, dialog.data, wait=True)
-                timer.expiration_announced = True
-                break
+        if len(timers_to_announce) == 1:
+            dialog = TimerDialog(timers_to_announce[0], self.lang)
+            dialog.build_expiration_announcement_dialog(len(self.active_timers))
+            dialog_name, dialog_data = dialog.name, dialog.data
+        else:
+            dialog_name = "timer-expired-multiple"
+            dialog_data = dict(
+                number=get_speakable_number(len(timers_to_announce), self.lang),
+                timers=self._get_speakable_timer_details(timers_to_announce),
+            )
+        self._stop_expiration_check()
+        if self.platform == MARK_I:
+            self._stop_display_update()
+        self.speak_dialog(dialog_name, dialog_data)
+        with self.active_timers.writing(), self.timer_journal.batch():
+            for timer in timers_to_announce:
+                if timer in self.active_timers:
+                    timer.expiration_announced = True
+                    self.timer_journal.record_announce(timer)
 
     def stop(self) -> bool:
         """Handle a stop command issued by the user.
@@ -779,7 +1187,7 @@ class TimerSkill(MycroftSkill):
             A boolean indicating if the stop message was consumed by this skill.
         """
         stop_handled = False
-        expired_timers = [timer for timer in self.active_timers if timer.expired]
+        expired_timers = self.expiration_queue.collect_expired(time.monotonic())
         if expired_timers:
             self._clear_expired_timers(expired_timers)
             stop_handled = True
@@ -799,10 +1207,13 @@ class TimerSkill(MycroftSkill):
         Args:
             expired_timers: list of timer objects representing expired timers
         """
-        for timer in expired_timers:
-            self.active_timers.remove(timer)
-        self._save_timers()
-        if not self.active_timers:
+        with self.active_timers.writing(), self.timer_journal.batch():
+            for timer in expired_timers:
+                self._remove_active_timer(timer)
+        if self.active_timers:
+            self._start_expiration_check()
+            self._refresh_display()
+        else:
             self._reset()
 
     def handle_timer_stop(self, _):
@@ -851,72 +1262,152 @@ class TimerSkill(MycroftSkill):
     def handle_speak(self, _):
         """Handle the device speaking a response to a user request.
 
-        Once the device stops speaking, it has finished answering the user's request.
+        Once the device stops speaking, it has finished answering the user's request,
+        which is handled when the audio output ends.
+        """
+        self.speech_in_progress = True
+
+    def handle_audio_output_end(self, _):
+        """Handle the device finishing speaking everything it was asked to speak.
+
         Resume checking for expired timers.
         The Mark I needs to wait for two seconds after the speaking is done to display
         the active timer(s) because there is an automatic display reset at that time.
         """
-        wait_while_speaking()
-        self._start_expiration_check()
-        if self.platform == MARK_I:
-            time.sleep(2)
-            self._start_display_update()
+        if self.speech_in_progress:
+            self.speech_in_progress = False
+            if self.mouth_events_deactivated:
+                self.enclosure.activate_mouth_events()
+                self.mouth_events_deactivated = False
+            self._start_expiration_check()
+            if self.platform == MARK_I:
+                self.cancel_scheduled_event("ResumeTimerDisplay")
+                self.schedule_event(
+                    self._start_display_update, 2, name="ResumeTimerDisplay"
+                )
 
     def _start_display_update(self):
-        """Start an event repeating every second to update the timer display."""
+        """Start updating the timer display.
+
+        The Mark I faceplate is updated by an event repeating every second.  Other
+        devices update the display now, which schedules any further updates.
+        """
         if self.active_timers:
-            self.log.info("starting repeating event to update timer display")
             if self.platform == MARK_I:
-                self.enclosure.mouth_reset()
-            self.schedule_repeating_event(
-                self.update_display, None, 1, name="UpdateTimerDisplay"
-            )
+                self.log.info("starting repeating event to update timer display")
+                self._reset_faceplate()
+                self.tick_profiler.restart("UpdateTimerDisplay")
+                self.schedule_repeating_event(
+                    self.update_display, None, 1, name="UpdateTimerDisplay"
+                )
+            else:
+                self.update_display()
+
+    def _refresh_display(self):
+        """Show a change to the active timers without waiting for the next update.
+
+        The Mark I faceplate picks up changes on its next update, a second later at
+        most, so only the GUI needs refreshing.
+        """
+        if self.platform != MARK_I and self.active_timers:
+            self.update_display()
 
     def _stop_display_update(self):
         """Stop the repeating event that updates the timer on the display."""
         self.log.info("stopping repeating event to update timer display")
+        self.cancel_scheduled_event("ResumeTimerDisplay")
         self.cancel_scheduled_event("UpdateTimerDisplay")
         if self.platform == MARK_I:
-            self.enclosure.mouth_reset()
+            self._reset_faceplate()
 
     def _start_expiration_check(self):
-        """Start an event repeating every two seconds to check for expired timers."""
+        """Schedule the next check for expired timers.
+
+        While any active timer is expired, check every two seconds so the beeping
+        continues.  Otherwise, sleep until the next timer is due to expire.
+        """
+        self.cancel_scheduled_event("ExpirationCheck")
+        self.expiration_check_repeating = False
         if self.active_timers:
-            self.log.info("starting repeating event to check for timer expiration")
-            self.schedule_repeating_event(
-                self.check_for_expired_timers, None, 2, name="ExpirationCheck"
-            )
+            if self.expiration_queue.collect_expired(time.monotonic()):
+                self.log.info("starting repeating event to check for timer expiration")
+                self.tick_profiler.restart("ExpirationCheck")
+                self.schedule_repeating_event(
+                    self.check_for_expired_timers, None, 2, name="ExpirationCheck"
+                )
+                self.expiration_check_repeating = True
+            else:
+                self.beeper.stop()
+                next_deadline = self.expiration_queue.next_deadline
+                # Another thread may have removed the last timer in the meantime.
+                if next_deadline is not None:
+                    seconds_to_expiration = next_deadline - time.monotonic()
+                    self.log.info(
+                        "next timer expires in {} seconds".format(seconds_to_expiration)
+                    )
+                    self.schedule_event(
+                        self.check_for_expired_timers,
+                        max(seconds_to_expiration, 0),
+                        name="ExpirationCheck",
+                    )
 
     def _stop_expiration_check(self):
-        """Stop the repeating event that checks for expired timers."""
-        self.log.info("stopping repeating event to check for timer expiration")
+        """Stop the scheduled event that checks for expired timers and the beeping."""
+        self.log.info("stopping scheduled event to check for timer expiration")
         self.cancel_scheduled_event("ExpirationCheck")
+        self.beeper.stop()
+        self.expiration_check_repeating = False
 
-    def _reset_timer_index(self):
-        """Use the timers loaded from skill storage to determine the timer index."""
-        if self.active_timers:
-            timer_with_max_index = max(
-                self.active_timers, key=lambda timer: timer.index
-            )
-            self.timer_index = timer_with_max_index.index
-        else:
-            self.timer_index = 0
+    def _add_active_timer(self, timer: CountdownTimer):
+        """Add a timer to the active timers and journal the addition.
+
+        The active timers assign the timer its index, which the journal uses to
+        refer to the timer from then on.
+
+        Args:
+            timer: the newly built timer
+        """
+        with self.active_timers.writing():
+            self.active_timers.add(timer)
+            self.expiration_queue.push(timer)
+            with self.metrics.stage("persist"):
+                self.timer_journal.record_add(timer)
+
+    def _remove_active_timer(self, timer: CountdownTimer):
+        """Remove a timer from the active timers and journal the removal.
 
-    def _save_timers(self):
-        """Write a serialized version of the data to the specified file name."""
-        with open(self.save_path, "wb") as data_file:
-            pickle.dump(self.active_timers, data_file, pickle.HIGHEST_PROTOCOL)
+        The same timer can be removed by a cancel request and a stop command at the
+        same time, so the removal is only journaled by whichever gets there first.
+
+        Args:
+            timer: the timer being cancelled or cleared
+        """
+        with self.active_timers.writing():
+            self.expiration_queue.discard(timer)
+            if self.active_timers.remove(timer):
+                with self.metrics.stage("persist"):
+                    self.timer_journal.record_cancel(timer)
+
+    def _remove_all_active_timers(self):
+        """Remove all the active timers and journal the removal."""
+        with self.active_timers.writing():
+            self.active_timers.clear()
+            self.expiration_queue.clear()
+            with self.metrics.stage("persist"):
+                self.timer_journal.record_clear()
 
     def _load_timers(self):
-        """Load any saved timers into the active timers list.
+        """Replay the timer journal to restore the timers active before a restart.
 
-        Returns:
-            None if the file does not exist or the deserialized data in the file.
+        Timers saved by versions of the skill that pickled the active timers list are
+        migrated to the journal the first time they are loaded.
         """
-        self.active_timers = list()
-        if self.save_path.exists():
-            with open(self.save_path, "rb") as data_file:
-                self.active_timers = pickle.load(data_file)
+        if self.save_path.exists() and not self.timer_journal.journal_path.exists():
+            timers = self.timer_journal.migrate_pickle(self.save_path)
+        else:
+            timers = self.timer_journal.load()
+        self.active_timers.replace_all(timers)
+        self.expiration_queue.rebuild(self.active_timers)
 
 
 def create_skill():
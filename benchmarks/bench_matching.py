@@ -0,0 +1,96 @@
+# Copyright 2021 Mycroft AI Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Measure how long it takes to match a requested timer name to the active timers.
+
+Run from the root of the skill:  python benchmarks/bench_matching.py
+"""
+import json
+import random
+import sys
+import time
+from datetime import timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parents[1]))
+
+from mycroft.util.parse import fuzzy_match  # noqa: E402
+from skill.match import FUZZY_MATCH_THRESHOLD, rank_timers_by_name  # noqa: E402
+from skill.store import TimerStore  # noqa: E402
+from skill.timer import CountdownTimer  # noqa: E402
+
+TIMER_COUNTS = (10, 100, 1000)
+REPEAT = 20
+WORDS = (
+    "pasta", "rice", "chicken", "turkey", "bread", "tea", "coffee", "laundry",
+    "pizza", "eggs", "cookies", "roast", "beans", "soup", "oven", "plants",
+    "brisket", "potatoes", "dough", "steak", "salmon", "muffins", "pie", "cake",
+)
+REQUESTED_NAMES = ("pasta", "chicken soup", "laundry", "sourdough bread", "steep")
+
+
+def _build_store(timer_count: int) -> TimerStore:
+    store = TimerStore()
+    names = set()
+    generator = random.Random(timer_count)
+    while len(names) < timer_count:
+        word_count = generator.randint(1, 3)
+        names.add(" ".join(generator.choice(WORDS) for _ in range(word_count)))
+    for index, name in enumerate(sorted(names), start=1):
+        timer = CountdownTimer(timedelta(minutes=index), name)
+        timer.index = index
+        store.add(timer)
+
+    return store
+
+
+def _rank_without_pruning(requested_name, timers):
+    """Score every timer name, as matching did before candidates were pruned."""
+    scored_timers = []
+    for timer in timers:
+        score = fuzzy_match(requested_name, timer.name.lower())
+        if score >= FUZZY_MATCH_THRESHOLD:
+            scored_timers.append((score, timer))
+    scored_timers.sort(key=lambda scored: (-scored[0], scored[1].deadline))
+
+    return [timer for _, timer in scored_timers]
+
+
+def _seconds_per_utterance(rank, store) -> float:
+    timings = []
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        for requested_name in REQUESTED_NAMES:
+            rank(requested_name, store)
+        timings.append(time.perf_counter() - start)
+
+    return min(timings) / len(REQUESTED_NAMES)
+
+
+def main():
+    for timer_count in TIMER_COUNTS:
+        store = _build_store(timer_count)
+        for requested_name in REQUESTED_NAMES:
+            pruned = rank_timers_by_name(requested_name, store)
+            assert pruned == _rank_without_pruning(requested_name, store)
+        for name, rank in (
+            ("rank_timers_by_name", rank_timers_by_name),
+            ("rank_without_pruning", _rank_without_pruning),
+        ):
+            seconds = _seconds_per_utterance(rank, store)
+            result = dict(benchmark=name, timers=timer_count, seconds=seconds)
+            print(json.dumps(result))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+# Copyright 2021 Mycroft AI Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Measure the memory used by timers loaded from persistence.
+
+Run from the root of the skill:  python benchmarks/bench_memory.py
+"""
+import json
+import sys
+import tempfile
+import tracemalloc
+from datetime import timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parents[1]))
+
+from skill.persistence import TimerJournal  # noqa: E402
+from skill.timer import CountdownTimer  # noqa: E402
+
+TIMER_COUNTS = (1000, 10000)
+
+
+def _write_journal(journal_path: Path, timer_count: int):
+    journal = TimerJournal(journal_path)
+    with journal.batch():
+        for index in range(1, timer_count + 1):
+            timer = CountdownTimer(timedelta(seconds=index), "timer {}".format(index))
+            timer.index = index
+            journal.record_add(timer)
+
+
+def main():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for timer_count in TIMER_COUNTS:
+            journal_path = Path(temp_dir).joinpath("timers.journal")
+            _write_journal(journal_path, timer_count)
+            journal = TimerJournal(journal_path)
+            journal.load()
+            tracemalloc.start()
+            timers = [
+                CountdownTimer.from_record(record)
+                for record in journal.live_records.values()
+            ]
+            # Include the cached display and speech strings in the measurement.
+            for timer in timers:
+                timer.get_status()
+                timer.get_speakable_duration()
+            timer_bytes, _ = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            result = dict(
+                benchmark="loaded_timer_memory",
+                timers=len(timers),
+                bytes=timer_bytes,
+                bytes_per_timer=timer_bytes / len(timers),
+            )
+            print(json.dumps(result))
+            journal_path.unlink()
+
+
+if __name__ == "__main__":
+    main()
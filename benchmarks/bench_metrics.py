@@ -0,0 +1,76 @@
+# Copyright 2021 Mycroft AI Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Measure what timing the stages of a request costs the request.
+
+An instrumented request is compared with the same request without instrumentation,
+with metrics disabled (the default) and enabled.
+
+Run from the root of the skill:  python benchmarks/bench_metrics.py
+"""
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parents[1]))
+
+from skill.metrics import IntentMetrics  # noqa: E402
+
+ITERATIONS = 10000
+REPEAT = 20
+
+
+def _handle_request():
+    """The same request as below without instrumentation, as a baseline."""
+    pass
+
+
+def _handle_instrumented_request(metrics: IntentMetrics):
+    """The same request, timed in three stages."""
+    with metrics.request("start_timer"):
+        with metrics.stage("parse"):
+            pass
+        with metrics.stage("persist"):
+            pass
+        with metrics.stage("dialog"):
+            pass
+
+
+def _seconds_per_request(handle_request) -> float:
+    timings = []
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        for _ in range(ITERATIONS):
+            handle_request()
+        timings.append(time.perf_counter() - start)
+
+    return min(timings) / ITERATIONS
+
+
+def main():
+    baseline = _seconds_per_request(_handle_request)
+    print(json.dumps(dict(benchmark="uninstrumented_request", seconds=baseline)))
+    for enabled in (False, True):
+        metrics = IntentMetrics(lambda _: None, enabled=enabled)
+        seconds = _seconds_per_request(lambda: _handle_instrumented_request(metrics))
+        result = dict(
+            benchmark="metrics_enabled" if enabled else "metrics_disabled",
+            seconds=seconds,
+            overhead=seconds - baseline,
+        )
+        print(json.dumps(result))
+
+
+if __name__ == "__main__":
+    main()
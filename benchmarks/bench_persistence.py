@@ -0,0 +1,86 @@
+# Copyright 2021 Mycroft AI Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Measure how long it takes to load persisted timers at skill startup.
+
+Run from the root of the skill:  python benchmarks/bench_persistence.py
+"""
+import json
+import pickle
+import sys
+import tempfile
+import time
+from datetime import timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parents[1]))
+
+from skill.persistence import TimerJournal  # noqa: E402
+from skill.timer import CountdownTimer  # noqa: E402
+
+TIMER_COUNTS = (10, 100, 500, 1000)
+REPEAT = 20
+
+
+def _build_timers(timer_count: int):
+    timers = []
+    for index in range(1, timer_count + 1):
+        timer = CountdownTimer(timedelta(minutes=index), "timer {}".format(index))
+        timer.index = index
+        timer.ordinal = 1
+        timers.append(timer)
+
+    return timers
+
+
+def _best_of(function) -> float:
+    timings = []
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+
+    return min(timings)
+
+
+def main():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        temp_dir = Path(temp_dir)
+        for timer_count in TIMER_COUNTS:
+            timers = _build_timers(timer_count)
+            journal_path = temp_dir.joinpath("timers.journal")
+            journal = TimerJournal(journal_path)
+            for timer in timers:
+                journal.record_add(timer)
+            journal_seconds = _best_of(TimerJournal(journal_path).load)
+
+            pickle_path = temp_dir.joinpath("save_timers")
+
+            def migrate():
+                with open(pickle_path, "wb") as data_file:
+                    pickle.dump(timers, data_file, pickle.HIGHEST_PROTOCOL)
+                TimerJournal(temp_dir.joinpath("migrated.journal")).migrate_pickle(
+                    pickle_path
+                )
+
+            migration_seconds = _best_of(migrate)
+            for name, seconds in (
+                ("journal_load", journal_seconds),
+                ("pickle_migration", migration_seconds),
+            ):
+                result = dict(benchmark=name, timers=timer_count, seconds=seconds)
+                print(json.dumps(result))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,215 @@
+# Copyright 2021 Mycroft AI Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Measure the cost of the skill's request handlers and recurring events.
+
+Each result is printed as a line of JSON with the benchmark name, the number of
+active timers, the best time in seconds and the messages the skill sent during a
+single run, so results can be compared between releases.
+
+Run from the root of the skill with Mycroft core installed:
+
+    python benchmarks/bench_skill.py
+"""
+import json
+import sys
+import tempfile
+import time
+from collections import Counter
+from pathlib import Path
+
+HARNESS_DIRECTORY = str(Path(__file__).parents[1].joinpath("test", "unittests"))
+sys.path.insert(0, HARNESS_DIRECTORY)
+
+from harness import (  # noqa: E402
+    add_timers,
+    expire_timers,
+    FakeBus,
+    load_skill,
+    MARK_I,
+    utterance_message,
+)
+from mycroft.messagebus.message import Message  # noqa: E402
+
+TIMER_COUNTS = (1, 10, 100, 1000)
+REPEAT = 20
+
+
+def _measure(name, skill, bus, timer_count, function, teardown=None):
+    """Time a function and print the result.
+
+    The messages and enclosure calls are those of the last run.
+    """
+    timings = []
+    for _ in range(REPEAT):
+        bus.emitted.clear()
+        skill.enclosure.calls.clear()
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+        messages = Counter(bus.emitted)
+        enclosure_calls = Counter(skill.enclosure.calls)
+        if teardown is not None:
+            teardown()
+    result = dict(
+        benchmark=name,
+        timers=timer_count,
+        seconds=min(timings),
+        messages=dict(messages),
+        enclosure_calls=dict(enclosure_calls),
+        questions_asked=skill.questions_asked,
+    )
+    print(json.dumps(result))
+
+
+def _load_skill_with_timers(data_directory, bus, timer_count, platform=None):
+    """Load the skill, replacing any timers left by a previous benchmark."""
+    skill = load_skill(data_directory, bus, platform)
+    skill._remove_all_active_timers()
+    add_timers(skill, timer_count)
+
+    return skill
+
+
+def _bench_requests(data_directory: Path, timer_count: int):
+    """Start, cancel and ask for the status of a timer with other timers running."""
+    bus = FakeBus(gui_connected=True)
+    skill = _load_skill_with_timers(data_directory, bus, timer_count)
+
+    def remove_newest_timer():
+        newest_timer = max(skill.active_timers, key=lambda timer: timer.index)
+        skill._remove_active_timer(newest_timer)
+
+    def restore_one_minute_timer():
+        add_timers(skill, 1)
+
+    _measure(
+        "start_timer",
+        skill,
+        bus,
+        timer_count,
+        lambda: skill.handle_start_timer(
+            utterance_message("start a timer for 90 minutes")
+        ),
+        teardown=remove_newest_timer,
+    )
+    _measure(
+        "timer_status",
+        skill,
+        bus,
+        timer_count,
+        lambda: skill.handle_status_timer(
+            utterance_message("how much time is left on the 1 minute timer")
+        ),
+    )
+    _measure(
+        "cancel_timer",
+        skill,
+        bus,
+        timer_count,
+        lambda: skill.handle_cancel_timer(
+            utterance_message("cancel the 1 minute timer")
+        ),
+        teardown=restore_one_minute_timer,
+    )
+    skill.shutdown()
+
+
+def _bench_recurring_events(data_directory: Path, timer_count: int):
+    """Update the display and check for expired timers once.
+
+    The display only changes once a second, so the display is also measured with
+    what was displayed forgotten before every update.
+    """
+    bus = FakeBus(gui_connected=True)
+    skill = _load_skill_with_timers(data_directory, bus, timer_count)
+    _measure("update_display_gui", skill, bus, timer_count, skill.update_display)
+    _measure(
+        "update_display_gui_changed",
+        skill,
+        bus,
+        timer_count,
+        skill.update_display,
+        teardown=lambda: setattr(skill, "gui_display_data", None),
+    )
+    check = skill.check_for_expired_timers
+    _measure("check_for_expired_timers", skill, bus, timer_count, check)
+    expire_timers(skill)
+    _measure("check_for_expired_timers_beeping", skill, bus, timer_count, check)
+    skill.shutdown()
+
+    bus = FakeBus(gui_connected=False)
+    skill = _load_skill_with_timers(data_directory, bus, timer_count, MARK_I)
+    _measure("update_display_mark_i", skill, bus, timer_count, skill.update_display)
+    _measure(
+        "update_display_mark_i_redraw",
+        skill,
+        bus,
+        timer_count,
+        skill.update_display,
+        teardown=skill.faceplate_renderer.reset,
+    )
+    skill.shutdown()
+
+
+def _bench_journal(data_directory: Path, timer_count: int):
+    """Journal timers as they are added and replay the journal at startup.
+
+    Timers are added one at a time and all at once with a bulk create message, as
+    a recipe would start its named timers.
+    """
+    bus = FakeBus()
+    skill = _load_skill_with_timers(data_directory, bus, timer_count=0)
+    _measure(
+        "journal_add_timers",
+        skill,
+        bus,
+        timer_count,
+        lambda: add_timers(skill, timer_count),
+        teardown=skill._remove_all_active_timers,
+    )
+    bulk_create = Message(
+        "timer.bulk.create",
+        dict(
+            timers=[
+                dict(duration=minutes * 60, name="step {}".format(minutes))
+                for minutes in range(1, timer_count + 1)
+            ],
+            speak=False,
+        ),
+    )
+    _measure(
+        "bulk_create_timers",
+        skill,
+        bus,
+        timer_count,
+        lambda: skill.handle_bulk_create(bulk_create),
+        teardown=skill._remove_all_active_timers,
+    )
+    add_timers(skill, timer_count)
+    _measure("load_timers", skill, bus, timer_count, skill._load_timers)
+    skill._remove_all_active_timers()
+    skill.shutdown()
+
+
+def main():
+    for timer_count in TIMER_COUNTS:
+        with tempfile.TemporaryDirectory() as data_directory:
+            data_directory = Path(data_directory)
+            _bench_requests(data_directory, timer_count)
+            _bench_recurring_events(data_directory, timer_count)
+            _bench_journal(data_directory, timer_count)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+# Copyright 2021 Mycroft AI Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Measure how long the skill takes to load, which adds to the device boot time.
+
+The import is timed in a fresh interpreter each run, after importing what the skill
+loader has already imported by the time it loads a skill.  The modules the skill
+should only import when first needed are listed if the skill's import, rather than
+Mycroft core, brought them in.
+Loading (construction and initialize) is timed with and without timers persisted
+by a previous run, on a device with a GUI and on a Mark I.
+
+Each result is printed as a line of JSON, like the other benchmarks.  Run from the
+root of the skill with Mycroft core installed:
+
+    python benchmarks/bench_startup.py
+"""
+import json
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+HARNESS_DIRECTORY = str(Path(__file__).parents[1].joinpath("test", "unittests"))
+sys.path.insert(0, HARNESS_DIRECTORY)
+
+from harness import add_timers, FakeBus, import_skill, load_skill, MARK_I  # noqa: E402
+
+PERSISTED_TIMER_COUNTS = (0, 10, 100, 1000)
+REPEAT = 20
+DEFERRED_MODULES = ("mycroft_timer.skill.faceplate", "PIL")
+IMPORT_SCRIPT = """
+import json, sys, time
+sys.path.insert(0, {harness_directory!r})
+from mycroft import MycroftSkill
+from harness import import_skill
+already_imported = set(sys.modules)
+start = time.perf_counter()
+import_skill()
+seconds = time.perf_counter() - start
+modules = [
+    module
+    for module in {deferred!r}
+    if module in sys.modules and module not in already_imported
+]
+print(json.dumps(dict(seconds=seconds, imported=modules)))
+"""
+
+
+def _bench_import():
+    """Import the skill in a fresh interpreter and report the best time."""
+    script = IMPORT_SCRIPT.format(
+        harness_directory=HARNESS_DIRECTORY, deferred=DEFERRED_MODULES
+    )
+    runs = []
+    for _ in range(REPEAT):
+        output = subprocess.run(
+            [sys.executable, "-c", script], check=True, capture_output=True, text=True
+        ).stdout
+        runs.append(json.loads(output))
+    result = dict(
+        benchmark="import",
+        seconds=min(run["seconds"] for run in runs),
+        imported=runs[-1]["imported"],
+    )
+    print(json.dumps(result))
+
+
+def _bench_load(data_directory: Path, timer_count: int, platform=None):
+    """Load the skill with timers persisted by a previous run of the skill."""
+    skill_module = import_skill()
+    bus = FakeBus(gui_connected=platform is None)
+    skill = load_skill(data_directory, bus, platform, skill_module)
+    skill._remove_all_active_timers()
+    add_timers(skill, timer_count)
+    skill.shutdown()
+    timings = []
+    for _ in range(REPEAT):
+        bus = FakeBus(gui_connected=platform is None)
+        start = time.perf_counter()
+        skill = load_skill(data_directory, bus, platform, skill_module)
+        timings.append(time.perf_counter() - start)
+        loaded_timer_count = len(skill.active_timers)
+        skill.shutdown()
+    result = dict(
+        benchmark="load_mark_i" if platform == MARK_I else "load",
+        timers=loaded_timer_count,
+        seconds=min(timings),
+    )
+    print(json.dumps(result))
+
+
+def main():
+    _bench_import()
+    for timer_count in PERSISTED_TIMER_COUNTS:
+        for platform in (None, MARK_I):
+            with tempfile.TemporaryDirectory() as data_directory:
+                _bench_load(Path(data_directory), timer_count, platform)
+
+
+if __name__ == "__main__":
+    main()
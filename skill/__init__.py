@@ -11,15 +11,27 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+from .beeper import Beeper
+from .bulk import read_timer_requests, StatusQuery, TimerFilter
 from .dialog import TimerDialog
-from .faceplate import FaceplateRenderer
-from .match import get_timers_matching_reply, get_timers_matching_utterance
+from .expiration import ExpirationQueue, get_next_announcement
+from .match import (
+    get_timers_matching_reply,
+    get_timers_matching_utterance,
+    rank_timers_by_name,
+)
+from .metrics import IntentMetrics, TickProfiler
 from .name_extractor import extract_timer_name
+from .persistence import TimerJournal
+from .store import TimerSnapshot, TimerStore
 from .timer import CountdownTimer
 from .util import (
     extract_timer_duration,
     extract_ordinal,
+    format_seconds,
     format_timedelta,
+    get_speakable_number,
     get_speakable_ordinal,
+    parse_utterance,
     remove_conjunction
 )
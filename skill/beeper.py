@@ -0,0 +1,235 @@
+# Copyright 2021 Mycroft AI Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Play the beeping of expired timers without starting a player for every beep.
+
+The beep is decoded once, padded with silence to the length of a beeping cycle and
+streamed to a single audio player process for as long as the beeping continues.
+Stopping the beeping terminates the player, so it stops immediately rather than at
+the end of the current beep.
+"""
+import shutil
+import subprocess
+import threading
+import wave
+from pathlib import Path
+from typing import List, NamedTuple, Optional
+
+from mycroft.util import play_wav
+from mycroft.util.log import LOG
+
+BEEP_CYCLE_SECONDS = 2
+PAPLAY_FORMATS = {1: "u8", 2: "s16le", 4: "s32le"}
+APLAY_FORMATS = {1: "U8", 2: "S16_LE", 4: "S32_LE"}
+
+
+class BeepCycle(NamedTuple):
+    """One cycle of beeping as raw audio frames."""
+
+    frames: bytes
+    channels: int
+    sample_width: int
+    frame_rate: int
+
+
+def read_beep_cycle(sound_file_path: Path, cycle_seconds: float) -> BeepCycle:
+    """Decode a wav file and pad it with silence to the length of a cycle.
+
+    Args:
+        sound_file_path: the wav file containing the beep
+        cycle_seconds: how often the beep repeats
+
+    Returns:
+        the raw audio for a single cycle
+    """
+    with wave.open(str(sound_file_path), "rb") as wav_file:
+        params = wav_file.getparams()
+        frames = wav_file.readframes(params.nframes)
+    frame_size = params.nchannels * params.sampwidth
+    padding_frames = max(int(cycle_seconds * params.framerate) - params.nframes, 0)
+    # 8-bit wav samples are unsigned, so their silence is the midpoint.
+    silence = b"\x80" if params.sampwidth == 1 else b"\x00"
+    frames += silence * (padding_frames * frame_size)
+
+    return BeepCycle(frames, params.nchannels, params.sampwidth, params.framerate)
+
+
+def get_player_command(
+    beep_cycle: BeepCycle, play_wav_cmdline: Optional[str] = None
+) -> Optional[List[str]]:
+    """Build the command for a player that accepts raw audio on its standard input.
+
+    The player Mycroft is configured to play wav files with is used, along with
+    the options it is configured with (e.g. the output device), so the beeps are
+    heard wherever other sounds are.  A configured player other than paplay or
+    aplay cannot be streamed to.
+
+    Args:
+        beep_cycle: the audio that will be played
+        play_wav_cmdline: the configured command for playing a wav file, where %1
+            is replaced with the file; any installed player is used if not specified
+
+    Returns:
+        the command to run, or None if the player does not accept raw audio
+    """
+    if play_wav_cmdline is None:
+        player_commands = [["paplay"], ["aplay"]]
+    else:
+        configured_command = [arg for arg in play_wav_cmdline.split() if arg != "%1"]
+        player_commands = [configured_command] if configured_command else []
+    for player_command in player_commands:
+        if not shutil.which(player_command[0]):
+            continue
+        player = Path(player_command[0]).name
+        if player == "paplay" and beep_cycle.sample_width in PAPLAY_FORMATS:
+            return player_command + [
+                "--raw",
+                "--format=" + PAPLAY_FORMATS[beep_cycle.sample_width],
+                "--rate={}".format(beep_cycle.frame_rate),
+                "--channels={}".format(beep_cycle.channels),
+            ]
+        if player == "aplay" and beep_cycle.sample_width in APLAY_FORMATS:
+            return player_command + [
+                "-q",
+                "-t",
+                "raw",
+                "-f",
+                APLAY_FORMATS[beep_cycle.sample_width],
+                "-r",
+                str(beep_cycle.frame_rate),
+                "-c",
+                str(beep_cycle.channels),
+            ]
+
+    return None
+
+
+class Beeper:
+    """Repeat a beep through one long-lived audio player until told to stop.
+
+    If the configured wav player does not accept raw audio, or fails to start, the
+    beep is played with it once per cycle instead.
+
+    Args:
+        sound_file_path: the wav file containing the beep
+        cycle_seconds: how often the beep repeats
+        player_command: command of a player reading raw audio from its standard
+            input, determined from the configured wav player if not specified
+        play_wav_cmdline: Mycroft's configured command for playing a wav file
+    """
+
+    def __init__(
+        self,
+        sound_file_path: Path,
+        cycle_seconds: float = BEEP_CYCLE_SECONDS,
+        player_command: Optional[List[str]] = None,
+        play_wav_cmdline: Optional[str] = None,
+    ):
+        self.sound_file_path = sound_file_path
+        self.cycle_seconds = cycle_seconds
+        self.player_command = player_command
+        self.play_wav_cmdline = play_wav_cmdline
+        self._beep_cycle = None
+        self._lock = threading.Lock()
+        self._process = None
+        self._stopped = None
+
+    @property
+    def beeping(self) -> bool:
+        """True while the beep is repeating."""
+        return self._stopped is not None
+
+    def start(self):
+        """Start beeping, unless already beeping."""
+        with self._lock:
+            if self._stopped is not None:
+                return
+            if self._beep_cycle is None:
+                self._beep_cycle = read_beep_cycle(
+                    self.sound_file_path, self.cycle_seconds
+                )
+                if self.player_command is None:
+                    self.player_command = get_player_command(
+                        self._beep_cycle, self.play_wav_cmdline
+                    )
+            target = self._play_each_cycle
+            if self.player_command is not None:
+                try:
+                    self._process = subprocess.Popen(
+                        self.player_command,
+                        stdin=subprocess.PIPE,
+                        stdout=subprocess.DEVNULL,
+                        stderr=subprocess.DEVNULL,
+                        bufsize=0,
+                    )
+                except OSError:
+                    LOG.exception("Failed to start the timer beep player")
+                    self.player_command = None
+                else:
+                    target = self._stream
+            self._stopped = threading.Event()
+            thread = threading.Thread(
+                target=target, args=(self._process, self._stopped), daemon=True
+            )
+            thread.start()
+
+    def stop(self):
+        """Stop beeping immediately."""
+        with self._lock:
+            if self._stopped is None:
+                return
+            self._stopped.set()
+            self._stopped = None
+            process, self._process = self._process, None
+        if process is not None:
+            process.terminate()
+
+    def _stream(self, process: subprocess.Popen, stopped: threading.Event):
+        """Write the beep cycle to the player until stopped.
+
+        The pipe to the player only holds a fraction of a second of audio, so the
+        writes block in step with playback.
+        """
+        frames = self._beep_cycle.frames
+        chunk_size = max(len(frames) // 20, 1)
+        try:
+            while not stopped.is_set():
+                for offset in range(0, len(frames), chunk_size):
+                    if stopped.is_set():
+                        break
+                    process.stdin.write(frames[offset : offset + chunk_size])
+        except (OSError, ValueError):
+            if not stopped.is_set():
+                LOG.exception("Timer beep player stopped unexpectedly")
+        finally:
+            try:
+                process.stdin.close()
+            except OSError:
+                pass
+            if not stopped.is_set():
+                process.terminate()
+                with self._lock:
+                    if self._stopped is stopped:
+                        self._stopped = None
+                        self._process = None
+            process.wait()
+
+    def _play_each_cycle(self, _, stopped: threading.Event):
+        """Play the beep with the configured wav player once per cycle until stopped."""
+        while not stopped.is_set():
+            play_process = play_wav(str(self.sound_file_path))
+            with self._lock:
+                if self._stopped is stopped:
+                    self._process = play_process
+            if stopped.wait(self.cycle_seconds) and play_process is not None:
+                play_process.terminate()
@@ -0,0 +1,285 @@
+# Copyright 2021 Mycroft AI Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Read the structured timer requests sent by other programs on the message bus.
+
+Bulk requests create, cancel or query any number of timers in one message, and
+status requests look up timers using the indexes of the active timers.  They are
+built by programs rather than spoken, so nothing in them is parsed as language.
+"""
+import time
+from datetime import timedelta
+from typing import Iterable, List, Optional, Tuple
+
+from mycroft.util.time import now_utc
+from .store import TimerStore
+from .timer import CountdownTimer
+
+
+def read_timer_requests(data: dict) -> List[Tuple[timedelta, Optional[str]]]:
+    """Read the timers requested by a timer.bulk.create message.
+
+    Args:
+        data: message data with a "timers" list, each item having a "duration" in
+            seconds and an optional "name"
+
+    Returns:
+        the duration and name (None if not specified) of each requested timer
+
+    Raises:
+        ValueError when the timers are not a list of objects, or a timer is missing
+            a positive duration, expires too far in the future to be represented or
+            has a blank name
+    """
+    timers_data = data.get("timers", [])
+    if not isinstance(timers_data, list):
+        raise ValueError("Invalid timers {}".format(timers_data))
+    timer_requests = []
+    for timer_data in timers_data:
+        if not isinstance(timer_data, dict):
+            raise ValueError("Invalid timer {}".format(timer_data))
+        try:
+            duration = timedelta(seconds=float(timer_data["duration"]))
+        except (KeyError, TypeError, ValueError, OverflowError):
+            raise ValueError("Invalid timer duration in {}".format(timer_data))
+        if duration <= timedelta(0):
+            raise ValueError("Timer duration must be positive in {}".format(timer_data))
+        try:
+            # The timer's expiration has to be a date that datetime can represent.
+            now_utc() + duration
+        except OverflowError:
+            raise ValueError("Timer duration too long in {}".format(timer_data))
+        name = timer_data.get("name")
+        if name is not None:
+            name = str(name).strip()
+            if not name:
+                raise ValueError("Blank timer name in {}".format(timer_data))
+        timer_requests.append((duration, name))
+
+    return timer_requests
+
+
+class TimerFilter:
+    """Select the timers a bulk cancel or query message applies to.
+
+    Every criterion specified must be met for a timer to be selected.  A filter
+    without any criteria selects nothing unless it was built with all_timers set.
+
+    Args:
+        name_prefix: select timers whose names start with this, regardless of case
+        min_duration: select timers with at least this duration
+        max_duration: select timers with at most this duration
+        expired: select only expired timers if True, only running timers if False
+        all_timers: select every timer that meets the other criteria, if any
+    """
+
+    def __init__(
+        self,
+        name_prefix: str = None,
+        min_duration: timedelta = None,
+        max_duration: timedelta = None,
+        expired: bool = None,
+        all_timers: bool = False,
+    ):
+        self.name_prefix = None if name_prefix is None else name_prefix.casefold()
+        self.min_duration = min_duration
+        self.max_duration = max_duration
+        self.expired = expired
+        self.all_timers = all_timers
+
+    @classmethod
+    def from_message_data(cls, data: dict) -> "TimerFilter":
+        """Build a filter from the data of a bulk cancel or query message.
+
+        Args:
+            data: message data with any of "name_prefix", "min_duration" and
+                "max_duration" (in seconds), "expired" and "all"
+
+        Returns:
+            the filter described by the message
+
+        Raises:
+            ValueError when the name prefix is not a string, a duration is not a
+                number or expired or all is not a boolean
+        """
+        name_prefix = data.get("name_prefix")
+        if name_prefix is not None and not isinstance(name_prefix, str):
+            raise ValueError("Invalid name_prefix {}".format(name_prefix))
+
+        return cls(
+            name_prefix=name_prefix,
+            min_duration=_read_duration(data, "min_duration"),
+            max_duration=_read_duration(data, "max_duration"),
+            expired=_read_flag(data, "expired"),
+            all_timers=bool(_read_flag(data, "all")),
+        )
+
+    @property
+    def has_criteria(self) -> bool:
+        """Whether the filter was given anything to select timers by."""
+        return any(
+            criterion is not None
+            for criterion in (
+                self.name_prefix,
+                self.min_duration,
+                self.max_duration,
+                self.expired,
+            )
+        )
+
+    def select(
+        self, timers: Iterable[CountdownTimer], now: float = None
+    ) -> List[CountdownTimer]:
+        """Select the timers that meet the criteria.
+
+        Args:
+            timers: the timers to choose from, e.g. a snapshot of the active timers
+            now: value of time.monotonic() to determine expiration at
+
+        Returns:
+            the selected timers, in the order they were provided
+        """
+        if not (self.has_criteria or self.all_timers):
+            return []
+        if now is None:
+            now = time.monotonic()
+
+        return [timer for timer in timers if self._matches(timer, now)]
+
+    def _matches(self, timer: CountdownTimer, now: float) -> bool:
+        if self.name_prefix is not None:
+            if not timer.name.casefold().startswith(self.name_prefix):
+                return False
+        if self.min_duration is not None and timer.duration < self.min_duration:
+            return False
+        if self.max_duration is not None and timer.duration > self.max_duration:
+            return False
+        if self.expired is not None and (timer.deadline < now) != self.expired:
+            return False
+
+        return True
+
+
+class StatusQuery:
+    """Select the timers a timer.status.request message asks about.
+
+    Each criterion is served from an index of the active timers rather than by
+    looking at every timer.  When more than one is specified, the timers found by
+    the first of name, within and next are narrowed down by the others.
+
+    Args:
+        name: select the timer with this name, regardless of case
+        within: select running timers expiring within this many seconds
+        next_count: select at most this many running timers, soonest first
+    """
+
+    def __init__(self, name: str = None, within: float = None, next_count: int = None):
+        self.name = name
+        self.within = within
+        self.next_count = next_count
+
+    @classmethod
+    def from_message_data(cls, data: dict) -> "StatusQuery":
+        """Build a query from the data of a status request message.
+
+        Args:
+            data: message data with any of "name", "within" (in seconds) and "next"
+
+        Returns:
+            the query described by the message
+
+        Raises:
+            ValueError when the name is not a string, within is not a number or next
+                is not a positive whole number
+        """
+        name = data.get("name")
+        within = data.get("within")
+        next_count = data.get("next")
+        try:
+            query = cls(
+                name=name,
+                within=None if within is None else float(within),
+                next_count=None if next_count is None else int(next_count),
+            )
+        except (TypeError, ValueError, OverflowError):
+            raise ValueError("Invalid timer status request {}".format(data))
+        if name is not None and not isinstance(name, str):
+            raise ValueError("Invalid timer status request {}".format(data))
+        if query.next_count is not None and query.next_count < 1:
+            raise ValueError("Invalid timer status request {}".format(data))
+
+        return query
+
+    def select(self, timers: TimerStore, now: float = None) -> List[CountdownTimer]:
+        """Select the active timers that meet the criteria.
+
+        Args:
+            timers: the active timers
+            now: value of time.monotonic() to evaluate the timers at
+
+        Returns:
+            the selected timers, in order of expiration
+        """
+        if now is None:
+            now = time.monotonic()
+        snapshot = timers.snapshot()
+        if self.name is not None:
+            named_timer = timers.get_by_name(self.name)
+            selected_timers = [] if named_timer is None else [named_timer]
+        elif self.within is not None:
+            return self._limit(snapshot.get_expiring_between(now, now + self.within))
+        elif self.next_count is not None:
+            return snapshot.get_next_expiring(self.next_count, now)
+        else:
+            return list(snapshot)
+        if self.within is not None:
+            selected_timers = [
+                timer
+                for timer in selected_timers
+                if now <= timer.deadline <= now + self.within
+            ]
+        if self.next_count is not None:
+            selected_timers = [
+                timer for timer in selected_timers if timer.deadline > now
+            ]
+
+        return self._limit(selected_timers)
+
+    def _limit(self, timers: List[CountdownTimer]) -> List[CountdownTimer]:
+        if self.next_count is None:
+            return timers
+
+        return timers[: self.next_count]
+
+
+def _read_duration(data: dict, key: str) -> Optional[timedelta]:
+    """Convert a number of seconds in message data to a duration, if present."""
+    seconds = data.get(key)
+    if seconds is None:
+        return None
+    try:
+        return timedelta(seconds=float(seconds))
+    except (TypeError, ValueError, OverflowError):
+        raise ValueError("Invalid {} {}".format(key, seconds))
+
+
+def _read_flag(data: dict, key: str) -> Optional[bool]:
+    """Read a true or false value in message data, if present.
+
+    Strings like "false" are rejected rather than taken to be true.
+    """
+    value = data.get(key)
+    if value is not None and not isinstance(value, bool):
+        raise ValueError("Invalid {} {}".format(key, value))
+
+    return value
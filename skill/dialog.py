@@ -12,6 +12,8 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 """Determine what the spoken response to a users timer request should be."""
+from functools import lru_cache
+
 from mycroft.util.format import nice_duration
 from .util import get_speakable_ordinal
 
@@ -36,7 +38,7 @@ class TimerDialog:
             timer_count: number of active timers
         """
         self.name = "started-timer"
-        self.data = dict(duration=self.timer.speakable_duration)
+        self.data = dict(duration=self.timer.get_speakable_duration(self.language))
         if timer_count > 1 or self.timer.name != "Timer":
             self.name += "-named"
             self.data.update(name=self.timer.name)
@@ -44,44 +46,49 @@ class TimerDialog:
 
     def build_status_dialog(self):
         """Build dialog for communicating the status of active timers."""
-        if self.timer.expired:
+        timer_status = self.timer.get_status()
+        if timer_status.expired:
             self.name = "time-elapsed"
             self.data = dict(
-                time_diff=nice_duration(self.timer.time_since_expiration.seconds)
+                time_diff=_speakable_seconds(
+                    timer_status.time_since_expiration.seconds, self.language
+                )
             )
         else:
             self.name = "time-remaining"
             self.data = dict(
-                time_diff=nice_duration(self.timer.time_remaining.seconds)
+                time_diff=_speakable_seconds(
+                    timer_status.time_remaining.seconds, self.language
+                )
             )
         self._check_for_named_timer()
         self._check_for_ordinal()
-        self.data.update(duration=self.timer.speakable_duration)
+        self.data.update(duration=self.timer.get_speakable_duration(self.language))
 
     def build_details_dialog(self):
         """Build dialog used when asking a user which timer to select."""
         self.name = "timer-details"
-        self.data = dict(duration=self.timer.speakable_duration)
+        self.data = dict(duration=self.timer.get_speakable_duration(self.language))
         self._check_for_named_timer()
         self._check_for_ordinal()
 
     def build_cancel_dialog(self):
         """Build dialog used to confirm the cancellation of a timer."""
         self.name = "cancelled-timer"
-        self.data = dict(duration=self.timer.speakable_duration)
+        self.data = dict(duration=self.timer.get_speakable_duration(self.language))
         self._check_for_named_timer()
         self._check_for_ordinal()
 
     def build_cancel_confirm_dialog(self):
         """Build dialog used to confirm which timer will be cancelled."""
         self.name = "confirm-timer-to-cancel"
-        timer_name = self.timer.name or self.timer.speakable_duration
+        timer_name = self.timer.name or self.timer.get_speakable_duration(self.language)
         self.data = dict(name=timer_name)
 
     def build_expiration_announcement_dialog(self, timer_count: int):
         """Build dialog used to announce that a timer has expired."""
         self.name = "timer-expired"
-        self.data = dict(duration=self.timer.speakable_duration)
+        self.data = dict(duration=self.timer.get_speakable_duration(self.language))
         if timer_count > 1:
             self.name += "-named"
             self.data.update(name=self.timer.name)
@@ -106,3 +113,9 @@ class TimerDialog:
             self.name += "-ordinal"
             speakable_ordinal = get_speakable_ordinal(self.timer.ordinal)
             self.data.update(ordinal=speakable_ordinal)
+
+
+@lru_cache(maxsize=256)
+def _speakable_seconds(seconds: int, language: str) -> str:
+    """Convert a number of seconds to words, e.g. for the time remaining on a timer."""
+    return nice_duration(seconds, lang=language)
@@ -0,0 +1,173 @@
+# Copyright 2021 Mycroft AI Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Track when active timers expire so the skill only wakes up when one does."""
+import heapq
+from itertools import count
+from threading import Lock
+from typing import Callable, Iterable, List, Optional
+
+from .timer import CountdownTimer
+
+
+class ExpirationQueue:
+    """Min-heap of pending timers keyed on their monotonic clock deadline.
+
+    Removed timers are marked in place and discarded when they reach the top of the
+    heap, so adding and removing a timer are both O(log n).  Timers that have expired
+    but are still active (i.e. beeping) are moved to the expired list.
+
+    Timers are pushed and discarded from intent and bus handler threads while the
+    expiration check collects them on the scheduler thread, so every operation holds
+    a lock for the few heap operations it makes.
+
+    Listeners are called with each timer as it is found to have expired.
+    """
+
+    def __init__(self):
+        self._lock = Lock()
+        self._listeners = []
+        self._heap = []
+        self._entries = {}
+        self._sequence = count()
+        self.expired = []
+
+    def __len__(self) -> int:
+        return len(self._entries) + len(self.expired)
+
+    def add_listener(self, listener: Callable[[CountdownTimer], None]):
+        """Call a function whenever a timer expires.
+
+        Args:
+            listener: called with the expired timer
+        """
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener: Callable[[CountdownTimer], None]):
+        """Stop calling a function added with add_listener when timers expire."""
+        with self._lock:
+            if listener in self._listeners:
+                self._listeners.remove(listener)
+
+    def push(self, timer: CountdownTimer):
+        """Add a timer to the queue.
+
+        Args:
+            timer: the timer to track
+        """
+        with self._lock:
+            entry = [timer.deadline, next(self._sequence), timer]
+            self._entries[timer] = entry
+            heapq.heappush(self._heap, entry)
+
+    def discard(self, timer: CountdownTimer):
+        """Stop tracking a timer that was cancelled or cleared.
+
+        Args:
+            timer: the timer to stop tracking
+        """
+        with self._lock:
+            entry = self._entries.pop(timer, None)
+            if entry is None:
+                if timer in self.expired:
+                    self.expired.remove(timer)
+            else:
+                entry[-1] = None
+
+    def clear(self):
+        """Stop tracking all timers."""
+        with self._lock:
+            self._heap = []
+            self._entries = {}
+            self.expired = []
+
+    def rebuild(self, timers: Iterable[CountdownTimer]):
+        """Replace the contents of the queue, e.g. after loading saved timers.
+
+        Args:
+            timers: the active timers
+        """
+        heap = []
+        entries = {}
+        for timer in timers:
+            entry = [timer.deadline, next(self._sequence), timer]
+            entries[timer] = entry
+            heap.append(entry)
+        heapq.heapify(heap)
+        with self._lock:
+            self._heap = heap
+            self._entries = entries
+            self.expired = []
+
+    @property
+    def next_deadline(self) -> Optional[float]:
+        """The deadline of the next timer to expire, or None if none are pending."""
+        with self._lock:
+            self._drop_removed()
+
+            return self._heap[0][0] if self._heap else None
+
+    def collect_expired(self, now: float) -> List[CountdownTimer]:
+        """Move timers that expired as of "now" to the expired list.
+
+        Args:
+            now: the current time, as returned by time.monotonic()
+
+        Returns:
+            all active timers that have expired, in order of expiration
+        """
+        with self._lock:
+            self._drop_removed()
+            while self._heap and self._heap[0][0] < now:
+                _, _, timer = heapq.heappop(self._heap)
+                if timer is not None:
+                    del self._entries[timer]
+                    self.expired.append(timer)
+                    for listener in self._listeners:
+                        listener(timer)
+                self._drop_removed()
+
+            return list(self.expired)
+
+    def _drop_removed(self):
+        """Pop entries for removed timers off the top of the heap."""
+        while self._heap and self._heap[0][-1] is None:
+            heapq.heappop(self._heap)
+
+
+def get_next_announcement(
+    expired_timers: List[CountdownTimer], window: float
+) -> List[CountdownTimer]:
+    """Determine which expired timers to announce together.
+
+    Timers expiring at nearly the same time are announced in a single utterance
+    instead of one per expiration check.
+
+    Args:
+        expired_timers: the expired timers, in order of expiration
+        window: the number of seconds after the first unannounced timer expired that
+            another timer can expire and still be announced with it
+
+    Returns:
+        the first expired timer that has not been announced and any other unannounced
+        timers that expired within the window, or an empty list if all the expired
+        timers were announced
+    """
+    unannounced_timers = [
+        timer for timer in expired_timers if not timer.expiration_announced
+    ]
+    if not unannounced_timers or window <= 0:
+        return unannounced_timers[:1]
+    latest_deadline = unannounced_timers[0].deadline + window
+
+    return [timer for timer in unannounced_timers if timer.deadline <= latest_deadline]
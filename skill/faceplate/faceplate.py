@@ -11,8 +11,17 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
-"""Manage what is displayed on the faceplate of the Mark I for the timer skill."""
+"""Manage what is displayed on the faceplate of the Mark I for the timer skill.
+
+Every image drawn is a separate message to the faceplate, so the renderer remembers
+what it last drew and only redraws the characters that changed.  When more than one
+character changed, and Pillow is available, the changed characters are combined into
+a single image.
+"""
+import os
+from functools import lru_cache
 from pathlib import Path
+from typing import List, Optional, Sequence, Tuple
 
 CHARACTER_WIDTH = 3
 COLON_WIDTH = 2
@@ -21,58 +30,163 @@ FACEPLATE_WIDTH = 32
 TIMER_INDEX_WIDTH = 6
 SPACING = 1
 
+CHARACTER_DIRECTORY = Path(__file__).parent.joinpath("characters")
+GLYPH_FILES = dict(
+    [(str(digit), str(digit) + ".png") for digit in range(10)]
+    + [(":", "colon.png"), ("-", "negative.png")]
+)
+GLYPH_PATHS = {
+    character: str(CHARACTER_DIRECTORY.joinpath(file_name))
+    for character, file_name in GLYPH_FILES.items()
+}
+GLYPH_WIDTHS = dict(
+    [(str(digit), CHARACTER_WIDTH + SPACING) for digit in range(10)]
+    + [(":", COLON_WIDTH), ("-", HYPHEN_WIDTH + SPACING)]
+)
+
+# A character drawn on the faceplate and the x-coordinate it was drawn at.
+Cell = Tuple[int, str]
+
 
 class FaceplateRenderer:
-    """Render timer information on the Mark I display."""
+    """Render timer information on the Mark I display.
 
-    def __init__(self, enclosure, timer):
+    A single renderer is kept for the life of the skill.  Call reset() whenever the
+    faceplate is cleared or drawn on by something else so that the next render draws
+    everything again.
+
+    Args:
+        enclosure: the enclosure API of the skill
+        composite_path: where to write combined images, or None to always draw each
+            character separately
+    """
+
+    def __init__(self, enclosure, composite_path: Optional[Path] = None):
         self.enclosure = enclosure
-        self.timer_index = timer.index
-        self.timer_display = timer.display_data["timeDelta"]
-        self.multiple_active_timers = False
-        self.character_directory = Path(__file__).parent.joinpath("characters")
-        self.x_coordinate = 0
+        self.composite_path = composite_path
         self.y_coordinate = 2
+        self.displayed_cells = []
+
+    def render(self, timer, multiple_active_timers: bool = False):
+        """Main function to render a timer on the faceplate.
 
-    def render(self):
-        """Main function to render a timer on the faceplate."""
-        if self.multiple_active_timers:
-            self._render_timer_index()
-        self._calculate_timer_x_coordinate()
-        for character in self.timer_display:
-            self._render_character(character)
-
-    def _render_timer_index(self):
-        """If there are multiple timers, display a numeric identifier."""
-        self.x_coordinate += SPACING
-        self._render_character(str(self.timer_index))
-
-    def _calculate_timer_x_coordinate(self):
-        """Determine where on the faceplate to start the timer display."""
-        timer_width = 0
-        for character in self.timer_display:
-            if character == ":":
-                timer_width += COLON_WIDTH
-            elif character == "-":
-                timer_width = HYPHEN_WIDTH + SPACING
-            else:
-                timer_width += CHARACTER_WIDTH + SPACING
-        timer_width -= 1
-        self.x_coordinate += (FACEPLATE_WIDTH - timer_width) // 2
-
-    def _render_character(self, character):
-        """Render a single character on the display and advance the x-coordinate."""
-        if character == ":":
-            file_name = "colon.png"
-            character_width = COLON_WIDTH
-        elif character == "-":
-            file_name = "negative.png"
-            character_width = HYPHEN_WIDTH + SPACING
+        Args:
+            timer: the timer to display
+            multiple_active_timers: show the timer's number ahead of the time remaining
+        """
+        timer_number = str(timer.number) if multiple_active_timers else ""
+        cells = self._layout(timer_number, timer.formatted_time_delta)
+        if _geometry(cells) == _geometry(self.displayed_cells):
+            changed = [
+                position
+                for position, cell in enumerate(cells)
+                if cell != self.displayed_cells[position]
+            ]
+            if changed:
+                self._draw(cells[changed[0] : changed[-1] + 1], changed)
         else:
-            file_name = character + ".png"
-            character_width = CHARACTER_WIDTH + SPACING
-        path = self.character_directory.joinpath(file_name)
-        self.enclosure.mouth_display_png(
-            str(path), x=self.x_coordinate, y=self.y_coordinate, refresh=False
+            if self.displayed_cells:
+                self.enclosure.mouth_reset()
+            self._draw(cells, range(len(cells)))
+        self.displayed_cells = cells
+
+    def reset(self):
+        """Forget what was drawn so the next render redraws the whole display."""
+        self.displayed_cells = []
+
+    @staticmethod
+    def _layout(timer_number: str, timer_display: str) -> List[Cell]:
+        """Determine where on the faceplate each character is drawn.
+
+        The timer display is centered.  If there are multiple timers, a numeric
+        identifier is drawn on the left and the timer display is shifted right to
+        clear it, but no further than the right edge.  The identifier is left out
+        when there is no room for both.
+        """
+        cells = []
+        x_coordinate = 0
+        timer_width = sum(GLYPH_WIDTHS[character] for character in timer_display)
+        timer_width -= SPACING
+        number_width = SPACING + sum(
+            GLYPH_WIDTHS[character] for character in timer_number
         )
-        self.x_coordinate += character_width
+        if timer_number and number_width + timer_width <= FACEPLATE_WIDTH:
+            x_coordinate += SPACING
+            for character in timer_number:
+                cells.append((x_coordinate, character))
+                x_coordinate += GLYPH_WIDTHS[character]
+        centered_x_coordinate = x_coordinate + (FACEPLATE_WIDTH - timer_width) // 2
+        x_coordinate = max(
+            min(centered_x_coordinate, FACEPLATE_WIDTH - timer_width), x_coordinate
+        )
+        for character in timer_display:
+            cells.append((x_coordinate, character))
+            x_coordinate += GLYPH_WIDTHS[character]
+
+        return cells
+
+    def _draw(self, cells: List[Cell], changed: Sequence[int]):
+        """Send the changed characters to the faceplate.
+
+        Args:
+            cells: the run of cells from the first to the last changed cell
+            changed: the positions of the changed cells within the whole display
+        """
+        if len(changed) > 1 and self.composite_path is not None:
+            composite = _composite_glyphs(cells)
+            if composite is not None:
+                temp_path = self.composite_path.with_suffix(".tmp")
+                composite.save(str(temp_path), format="PNG")
+                os.replace(temp_path, self.composite_path)
+                self.enclosure.mouth_display_png(
+                    str(self.composite_path),
+                    x=cells[0][0],
+                    y=self.y_coordinate,
+                    refresh=False,
+                )
+                return
+        first_position = changed[0]
+        for position in changed:
+            x_coordinate, character = cells[position - first_position]
+            self.enclosure.mouth_display_png(
+                GLYPH_PATHS[character],
+                x=x_coordinate,
+                y=self.y_coordinate,
+                refresh=False,
+            )
+
+
+def _geometry(cells: List[Cell]) -> List[Tuple[int, int]]:
+    """The position and width of each cell, regardless of the character in it."""
+    return [(x, GLYPH_WIDTHS[character]) for x, character in cells]
+
+
+def _composite_glyphs(cells: List[Cell]):
+    """Combine the glyphs for a run of adjacent cells into one image.
+
+    Returns:
+        the combined image, or None if Pillow is not installed
+    """
+    glyphs = [_load_glyph(character) for _, character in cells]
+    if None in glyphs:
+        return None
+    from PIL import Image
+
+    left = cells[0][0]
+    right = cells[-1][0] + glyphs[-1].width
+    composite = Image.new("RGB", (right - left, glyphs[0].height), "white")
+    for (x_coordinate, _), glyph in zip(cells, glyphs):
+        composite.paste(glyph, (x_coordinate - left, 0))
+
+    return composite
+
+
+@lru_cache(maxsize=None)
+def _load_glyph(character: str):
+    """Read the pixels of a character's image once, or None without Pillow."""
+    try:
+        from PIL import Image
+    except ImportError:
+        return None
+    with Image.open(GLYPH_PATHS[character]) as glyph:
+        return glyph.convert("RGB")
@@ -12,34 +12,47 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 """Logic to match one or more timers to a user's request."""
-from typing import List
+from difflib import SequenceMatcher
+from typing import Iterable, List, Optional
 
 from mycroft.util.log import LOG
-from mycroft.util.parse import fuzzy_match
-from .name_extractor import extract_timer_name
+from .store import TimerSnapshot, TimerStore
 from .timer import CountdownTimer
-from .util import extract_ordinal, extract_timer_duration
+from .util import parse_utterance
 
 FUZZY_MATCH_THRESHOLD = 0.7
 
 
 class TimerMatcher:
-    """Matches timers to a request made by the user."""
-
-    def __init__(self, utterance: str, timers: List[CountdownTimer], regex_path: str):
+    """Matches timers to a request made by the user.
+
+    When matching against the active timers, all the lookups are made in the same
+    snapshot of them, so that a timer changed by another thread in the meantime is
+    matched on its name and ordinal as of the snapshot.
+    """
+
+    def __init__(
+        self,
+        utterance: str,
+        timers: List[CountdownTimer],
+        regex_path: str,
+        lang: str = None,
+    ):
         self.utterance = utterance
+        if isinstance(timers, TimerStore):
+            timers = timers.snapshot()
         self.timers = timers
         self.matches = None
-        self.requested_duration, _ = extract_timer_duration(self.utterance)
-        self.requested_name = extract_timer_name(self.utterance, regex_path)
-        self.requested_ordinal = extract_ordinal(self.utterance)
+        parsed_utterance = parse_utterance(self.utterance, regex_path, lang)
+        self.requested_duration = parsed_utterance.duration
+        self.requested_name = parsed_utterance.name
+        self.requested_ordinal = parsed_utterance.ordinal
 
     def match(self):
         """Main method to perform the matching"""
         if self.requested_duration is not None or self.requested_name is not None:
             duration_matches = self._match_timers_to_duration()
             name_matches = self._match_timers_to_name()
-            print(name_matches)
             if duration_matches and name_matches:
                 self.matches = [
                     timer for timer in name_matches if timer in duration_matches
@@ -55,29 +68,44 @@ class TimerMatcher:
         """If the utterance includes a duration, find timers that match it."""
         duration_matches = []
         if self.requested_duration is not None:
-            for timer in self.timers:
-                if self.requested_duration == timer.duration:
-                    duration_matches.append(timer)
+            if isinstance(self.timers, TimerSnapshot):
+                duration_matches = self.timers.get_by_duration(self.requested_duration)
+            else:
+                for timer in self.timers:
+                    if self.requested_duration == timer.duration:
+                        duration_matches.append(timer)
             LOG.info("Found {} duration matches".format(len(duration_matches)))
 
         return duration_matches
 
     def _match_timers_to_name(self) -> List[CountdownTimer]:
-        """If the utterance includes a timer name, find timers that match it."""
+        """If the utterance includes a timer name, find timers that match it.
+
+        Fuzzy matching is only done when no timer has exactly the requested name.
+        """
         name_matches = []
         if self.requested_name is not None:
-            best_score = 0
-            for timer in self.timers:
-                score = fuzzy_match(self.requested_name, timer.name.lower())
-                if score == 1.0:
-                    name_matches = [timer]
-                    break
-                elif score >= FUZZY_MATCH_THRESHOLD and score > best_score:
-                    name_matches.insert(0, timer)
+            exact_match = self._get_timer_with_requested_name()
+            if exact_match is not None:
+                name_matches = [exact_match]
+            else:
+                name_matches = rank_timers_by_name(self.requested_name, self.timers)
             LOG.info("Found {} name matches".format(len(name_matches)))
 
         return name_matches
 
+    def _get_timer_with_requested_name(self) -> Optional[CountdownTimer]:
+        """Find the timer whose name is the requested name, regardless of case."""
+        if isinstance(self.timers, TimerSnapshot):
+            return self.timers.get_by_name(self.requested_name)
+
+        requested_name = self.requested_name.casefold()
+        for timer in self.timers:
+            if timer.name.casefold() == requested_name:
+                return timer
+
+        return None
+
     def _match_ordinal(self):
         """If the utterance includes a ordinal, find timers that match it."""
         if self.matches is not None:
@@ -88,7 +116,11 @@ class TimerMatcher:
     def _filter_matches_by_ordinal(self):
         """Examine the timers already filtered by name and/or duration for ordinal."""
         for timer in self.matches:
-            if self.requested_ordinal == timer.ordinal:
+            if isinstance(self.timers, TimerSnapshot):
+                ordinal = self.timers.get_ordinal(timer)
+            else:
+                ordinal = timer.ordinal
+            if self.requested_ordinal == ordinal:
                 self.matches = [timer]
                 break
 
@@ -100,21 +132,69 @@ class TimerMatcher:
                 self.matches = [timer]
 
 
+def rank_timers_by_name(
+    requested_name: str, timers: Iterable[CountdownTimer], limit: int = None
+) -> List[CountdownTimer]:
+    """Rank the timers with names similar to the requested name.
+
+    Scores are the same similarity ratio as mycroft's fuzzy_match.  Timers that can't
+    reach the match threshold, based on name length and then on the characters in
+    the name, are rejected before the full ratio is calculated.  The active timers
+    are ranked on their names as of a single snapshot.
+
+    Args:
+        requested_name: the timer name extracted from the user's request
+        timers: the timers to rank, or the active timers
+        limit: the maximum number of timers to return, or None for all matches
+
+    Returns:
+        timers scoring at least FUZZY_MATCH_THRESHOLD, best match first.  Timers
+        with the same score are in order of expiration.
+    """
+    if isinstance(timers, TimerStore):
+        timers = timers.snapshot()
+    if isinstance(timers, TimerSnapshot):
+        candidates = timers.get_name_candidates(requested_name, FUZZY_MATCH_THRESHOLD)
+        get_name = timers.get_name
+    else:
+        candidates = timers
+        get_name = _get_timer_name
+    scored_timers = []
+    for timer in candidates:
+        matcher = SequenceMatcher(None, requested_name, get_name(timer).lower())
+        if matcher.real_quick_ratio() < FUZZY_MATCH_THRESHOLD:
+            continue
+        if matcher.quick_ratio() < FUZZY_MATCH_THRESHOLD:
+            continue
+        score = matcher.ratio()
+        if score >= FUZZY_MATCH_THRESHOLD:
+            scored_timers.append((score, timer))
+    scored_timers.sort(key=lambda scored: (-scored[0], scored[1].deadline))
+    if limit is not None:
+        scored_timers = scored_timers[:limit]
+
+    return [timer for _, timer in scored_timers]
+
+
+def _get_timer_name(timer: CountdownTimer) -> str:
+    return timer.name
+
+
 def get_timers_matching_utterance(
-    utterance: str, timers: List[CountdownTimer], regex_path: str
+    utterance: str, timers: List[CountdownTimer], regex_path: str, lang: str = None
 ) -> List[CountdownTimer]:
     """Match timers to an utterance that matched a timer intent."""
-    matcher = TimerMatcher(utterance, timers, regex_path)
+    matcher = TimerMatcher(utterance, timers, regex_path, lang)
     matcher.match()
 
     return matcher.matches
 
 
 def get_timers_matching_reply(
-    reply: str, timers: List[CountdownTimer], regex_path: str
+    reply: str, timers: List[CountdownTimer], regex_path: str, lang: str = None
 ) -> List[CountdownTimer]:
     """Match timers to a reply for clarification of which timers to select."""
-    matcher = TimerMatcher(reply, timers, regex_path)
+    matcher = TimerMatcher(reply, timers, regex_path, lang)
     if matcher.requested_name is None:
         matcher.requested_name = reply
     matcher.match()
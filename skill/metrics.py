@@ -0,0 +1,406 @@
+# Copyright 2021 Mycroft AI Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Measure how long each stage of handling a user request takes.
+
+The time spent in each stage of a request (e.g. parsing the utterance, matching it
+to active timers, journaling the change, building the dialog) is added up while the
+request is handled.  When the request is done, the stage timings are passed to a
+callback for publishing and added to rolling histograms that can be queried while
+the skill is running.
+
+The recurring events that update the display and check for expired timers are
+profiled in the same way, tick by tick, along with how late each tick ran.
+
+Time spent waiting for speech to finish or for the user to reply is recorded as a
+stage of its own and left out of the request's total, so the total only measures
+the skill.
+
+When metrics are disabled, instrumenting a request or stage only costs a check of
+the enabled flag.
+"""
+import bisect
+import threading
+import time
+from collections import deque
+from typing import Callable, Dict, List, Optional
+
+HISTOGRAM_SIZE = 100
+# Upper bounds of the histogram buckets, in milliseconds
+BUCKET_BOUNDS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000)
+BUCKET_LABELS = ["<={}ms".format(bound) for bound in BUCKET_BOUNDS] + [
+    ">{}ms".format(BUCKET_BOUNDS[-1])
+]
+
+
+class RollingHistogram:
+    """The distribution of the most recent samples of a duration.
+
+    Args:
+        size: the number of samples kept
+    """
+
+    def __init__(self, size: int = HISTOGRAM_SIZE):
+        self.samples = deque(maxlen=size)
+        self.bucket_counts = [0] * len(BUCKET_LABELS)
+
+    def add(self, seconds: float):
+        """Add a sample, dropping the oldest sample if the histogram is full."""
+        if len(self.samples) == self.samples.maxlen:
+            self.bucket_counts[_get_bucket(self.samples[0])] -= 1
+        self.samples.append(seconds)
+        self.bucket_counts[_get_bucket(seconds)] += 1
+
+    def summarize(self) -> dict:
+        """Summarize the samples in a form that can be sent over the message bus.
+
+        Returns:
+            the sample count, mean, median, 90th percentile and maximum, in seconds,
+            and the number of samples in each bucket
+        """
+        samples = sorted(self.samples)
+        sample_count = len(samples)
+        if sample_count:
+            summary = dict(
+                count=sample_count,
+                mean=sum(samples) / sample_count,
+                p50=_get_percentile(samples, 0.5),
+                p90=_get_percentile(samples, 0.9),
+                max=samples[-1],
+            )
+        else:
+            summary = dict(count=0, mean=None, p50=None, p90=None, max=None)
+        summary.update(
+            buckets={
+                label: count
+                for label, count in zip(BUCKET_LABELS, self.bucket_counts)
+                if count
+            }
+        )
+
+        return summary
+
+
+class IntentMetrics:
+    """Collect the time spent in each stage of handling user requests.
+
+    Args:
+        publish: called with the stage timings of each request once it is done
+        enabled: collect metrics; they can also be enabled and disabled later
+    """
+
+    def __init__(self, publish: Callable[[dict], None], enabled: bool = False):
+        self.publish = publish
+        self.enabled = enabled
+        self.histograms = {}
+        self._lock = threading.Lock()
+        self._current = threading.local()
+
+    def request(self, intent: str):
+        """Time the handling of a request, as a context manager.
+
+        Args:
+            intent: what the user requested, e.g. "start_timer"
+        """
+        if not self.enabled:
+            return _NOT_TIMED
+
+        return _RequestTimer(self, intent)
+
+    def stage(self, stage: str):
+        """Time a stage of the request being handled, as a context manager.
+
+        Time spent in a stage that occurs more than once in a request is added up.
+        Stages outside of a timed request are not timed.
+
+        Args:
+            stage: the name of the stage, e.g. "parse"
+        """
+        if not self.enabled:
+            return _NOT_TIMED
+        request = getattr(self._current, "request", None)
+        if request is None:
+            return _NOT_TIMED
+
+        return _StageTimer(request, stage)
+
+    def wait(self, stage: str):
+        """Time a wait on speech or the user during a request, as a context manager.
+
+        The wait is timed like any other stage but is not counted in the total.
+
+        Args:
+            stage: the name of the wait, e.g. "user_reply"
+        """
+        if not self.enabled:
+            return _NOT_TIMED
+        request = getattr(self._current, "request", None)
+        if request is None:
+            return _NOT_TIMED
+
+        return _WaitTimer(request, stage)
+
+    def summarize(self) -> Dict[str, Dict[str, dict]]:
+        """Summarize the histograms of each stage of each type of request.
+
+        Returns:
+            histogram summaries keyed by intent, then by stage; the "total" stage is
+            the time taken to handle the whole request, less any waits
+        """
+        with self._lock:
+            return {
+                intent: {
+                    stage: histogram.summarize()
+                    for stage, histogram in stage_histograms.items()
+                }
+                for intent, stage_histograms in self.histograms.items()
+            }
+
+    def clear(self):
+        """Discard all the samples collected so far."""
+        with self._lock:
+            self.histograms = {}
+
+    def _record(self, intent: str, total: float, stages: Dict[str, float]):
+        """Add the timings of a completed request to the histograms and publish them."""
+        with self._lock:
+            stage_histograms = self.histograms.setdefault(intent, {})
+            for stage, seconds in [("total", total)] + list(stages.items()):
+                if stage not in stage_histograms:
+                    stage_histograms[stage] = RollingHistogram()
+                stage_histograms[stage].add(seconds)
+        self.publish(dict(intent=intent, total=total, stages=stages))
+
+
+class TickProfiler:
+    """Profile the ticks of the skill's recurring scheduled events.
+
+    For each tick, the wall clock and CPU time are recorded along with the time
+    spent in each phase of the tick.  For events repeating at a known period, the
+    drift of each tick from its schedule and any ticks that were missed entirely are
+    recorded too.
+
+    Args:
+        enabled: profile ticks; profiling can also be enabled and disabled later
+    """
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self.events = {}
+        self._lock = threading.Lock()
+        self._current = threading.local()
+
+    def tick(self, event_name: str, period: Optional[float] = None):
+        """Profile a tick of a scheduled event, as a context manager.
+
+        Args:
+            event_name: the name the event was scheduled with
+            period: seconds between ticks of a repeating event, None for an event
+                that only runs once
+        """
+        if not self.enabled:
+            return _NOT_TIMED
+
+        return _TickTimer(self, event_name, period)
+
+    def phase(self, phase: str):
+        """Time a phase of the tick being profiled, as a context manager.
+
+        Args:
+            phase: the name of the phase, e.g. "gui"
+        """
+        if not self.enabled:
+            return _NOT_TIMED
+        tick = getattr(self._current, "tick", None)
+        if tick is None:
+            return _NOT_TIMED
+
+        return _StageTimer(tick, phase)
+
+    def restart(self, event_name: str):
+        """Forget the last tick of an event that is being rescheduled.
+
+        The gap between stopping and restarting a repeating event is not drift.
+        """
+        with self._lock:
+            if event_name in self.events:
+                self.events[event_name].last_tick_start = None
+
+    def summarize(self) -> Dict[str, dict]:
+        """Summarize the ticks of each profiled event.
+
+        Returns:
+            for each event, the number of ticks and missed ticks and histogram
+            summaries of the wall clock time, CPU time, drift and phases of a tick
+        """
+        with self._lock:
+            return {
+                event_name: event_profile.summarize()
+                for event_name, event_profile in self.events.items()
+            }
+
+    def _record(self, tick: "_TickTimer", wall_time: float, cpu_time: float):
+        """Add the profile of a completed tick to the profile of its event."""
+        with self._lock:
+            event_profile = self.events.get(tick.event_name)
+            if event_profile is None:
+                event_profile = _EventProfile()
+                self.events[tick.event_name] = event_profile
+            event_profile.add_tick(tick, wall_time, cpu_time)
+
+
+class _EventProfile:
+    """The profile of the ticks of one scheduled event."""
+
+    def __init__(self):
+        self.tick_count = 0
+        self.missed_ticks = 0
+        self.last_tick_start = None
+        self.wall_time = RollingHistogram()
+        self.cpu_time = RollingHistogram()
+        self.drift = RollingHistogram()
+        self.phases = {}
+
+    def add_tick(self, tick: "_TickTimer", wall_time: float, cpu_time: float):
+        self.tick_count += 1
+        self.wall_time.add(wall_time)
+        self.cpu_time.add(cpu_time)
+        for phase, seconds in tick.stages.items():
+            if phase not in self.phases:
+                self.phases[phase] = RollingHistogram()
+            self.phases[phase].add(seconds)
+        if tick.period is None:
+            self.last_tick_start = None
+        else:
+            if self.last_tick_start is not None:
+                interval = tick.start - self.last_tick_start
+                periods = max(round(interval / tick.period), 1)
+                self.missed_ticks += periods - 1
+                self.drift.add(abs(interval - periods * tick.period))
+            self.last_tick_start = tick.start
+
+    def summarize(self) -> dict:
+        return dict(
+            ticks=self.tick_count,
+            missed_ticks=self.missed_ticks,
+            wall_time=self.wall_time.summarize(),
+            cpu_time=self.cpu_time.summarize(),
+            drift=self.drift.summarize(),
+            phases={
+                phase: histogram.summarize() for phase, histogram in self.phases.items()
+            },
+        )
+
+
+class _NotTimed:
+    """Context manager used in place of a timer when metrics are disabled."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NOT_TIMED = _NotTimed()
+
+
+class _RequestTimer:
+    """Time the handling of a request and the stages within it."""
+
+    def __init__(self, metrics: IntentMetrics, intent: str):
+        self.metrics = metrics
+        self.intent = intent
+        self.stages = {}
+        self.waiting = 0.0
+        self.start = None
+        self.outer_request = None
+
+    def __enter__(self):
+        self.outer_request = getattr(self.metrics._current, "request", None)
+        self.metrics._current.request = self
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        total = time.perf_counter() - self.start - self.waiting
+        self.metrics._current.request = self.outer_request
+        self.metrics._record(self.intent, total, self.stages)
+        return False
+
+
+class _TickTimer:
+    """Profile a tick of a scheduled event and the phases within it."""
+
+    def __init__(
+        self, profiler: TickProfiler, event_name: str, period: Optional[float]
+    ):
+        self.profiler = profiler
+        self.event_name = event_name
+        self.period = period
+        self.stages = {}
+        self.start = None
+        self.cpu_start = None
+
+    def __enter__(self):
+        self.profiler._current.tick = self
+        self.start = time.monotonic()
+        self.cpu_start = time.thread_time()
+        return self
+
+    def __exit__(self, *exc_info):
+        cpu_time = time.thread_time() - self.cpu_start
+        wall_time = time.monotonic() - self.start
+        self.profiler._current.tick = None
+        self.profiler._record(self, wall_time, cpu_time)
+        return False
+
+
+class _StageTimer:
+    """Add the time spent in a stage to the request or tick being timed."""
+
+    def __init__(self, timer, stage: str):
+        self.timer = timer
+        self.stage = stage
+        self.start = None
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        elapsed = time.perf_counter() - self.start
+        stages = self.timer.stages
+        stages[self.stage] = stages.get(self.stage, 0.0) + elapsed
+        return False
+
+
+class _WaitTimer(_StageTimer):
+    """Add the time spent waiting to a stage of the request, but not to its total."""
+
+    def __exit__(self, *exc_info):
+        elapsed = time.perf_counter() - self.start
+        stages = self.timer.stages
+        stages[self.stage] = stages.get(self.stage, 0.0) + elapsed
+        self.timer.waiting += elapsed
+        return False
+
+
+def _get_bucket(seconds: float) -> int:
+    """Find the histogram bucket for a duration."""
+    return bisect.bisect_left(BUCKET_BOUNDS, seconds * 1000)
+
+
+def _get_percentile(ordered_samples: List[float], fraction: float) -> float:
+    """Find a percentile of samples in ascending order, without interpolation."""
+    return ordered_samples[round(fraction * (len(ordered_samples) - 1))]
@@ -12,11 +12,16 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 """Logic to extract a timer name from a user request."""
+import os
 import re
-from typing import List
+from typing import List, Pattern
 
 from mycroft.util.log import LOG
 
+# Compiled name patterns and the modification time of the file they were read from,
+# keyed by regex file path (which is different for each language).
+_compiled_patterns = {}
+
 
 class TimerNameExtractor:
     """Attempt to find a name in the an utterance and match it to active timers."""
@@ -32,21 +37,14 @@ class TimerNameExtractor:
             regex_patterns = self._get_timer_name_search_patterns()
             self._search_for_timer_name(regex_patterns)
 
-    def _get_timer_name_search_patterns(self) -> List[str]:
-        """Read a file containing one or more regular expressions to find timer name."""
-        regex_patterns = []
-        with open(self.regex_file_path) as regex_file:
-            for pattern in regex_file.readlines():
-                pattern = pattern.strip()
-                if pattern and pattern[0] != "#":
-                    regex_patterns.append(pattern)
-
-        return regex_patterns
+    def _get_timer_name_search_patterns(self) -> List[Pattern]:
+        """Get the compiled regular expressions used to find the timer name."""
+        return get_timer_name_patterns(self.regex_file_path)
 
-    def _search_for_timer_name(self, regex_patterns: List[str]):
+    def _search_for_timer_name(self, regex_patterns: List[Pattern]):
         """Match regular expressions to user request looking for timer name match."""
         for pattern in regex_patterns:
-            pattern_match = re.search(pattern, self.utterance)
+            pattern_match = pattern.search(self.utterance)
             if pattern_match:
                 self._handle_pattern_match(pattern_match)
                 if self.extracted_name is not None:
@@ -70,6 +68,33 @@ class TimerNameExtractor:
             LOG.info("Timer name extracted from utterance: " + self.extracted_name)
 
 
+def get_timer_name_patterns(regex_file_path: str) -> List[Pattern]:
+    """Get the compiled regular expressions in a file used to find a timer name.
+
+    The file is only read and compiled the first time it is used or when it has been
+    modified since it was last read.
+
+    Args:
+        regex_file_path: path to the name.rx file for the skill's language
+
+    Returns:
+        compiled regular expressions, in the order they appear in the file
+    """
+    modified_time = os.stat(regex_file_path).st_mtime_ns
+    cached_patterns = _compiled_patterns.get(regex_file_path)
+    if cached_patterns is None or cached_patterns[0] != modified_time:
+        regex_patterns = []
+        with open(regex_file_path) as regex_file:
+            for pattern in regex_file.readlines():
+                pattern = pattern.strip()
+                if pattern and pattern[0] != "#":
+                    regex_patterns.append(re.compile(pattern))
+        cached_patterns = (modified_time, regex_patterns)
+        _compiled_patterns[regex_file_path] = cached_patterns
+
+    return cached_patterns[1]
+
+
 def extract_timer_name(utterance: str, regex_file_path: str) -> str:
     """Helper function to extract a timer name from an utterance."""
     extractor = TimerNameExtractor(utterance, regex_file_path)
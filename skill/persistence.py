@@ -0,0 +1,270 @@
+# Copyright 2021 Mycroft AI Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Persist active timers across restarts using an append-only journal.
+
+Every change to the active timers is appended to the journal as a single line of
+JSON.  A record is only considered written once its terminating newline is on disk,
+so a journal cut short by a power failure loses at most the change being written.
+The journal is compacted into one "add" record per active timer when it is loaded
+and whenever it grows well past the number of active timers.
+
+Timers are stored as flat records (see CountdownTimer.to_record) rather than pickled
+objects so the journal does not depend on the layout of the timer class.  The first
+record of a compacted journal holds the version of the record schema.
+"""
+import json
+import os
+import pickle
+from contextlib import contextmanager
+from pathlib import Path
+from threading import RLock
+from typing import List
+
+from mycroft.util.log import LOG
+from .timer import CountdownTimer
+
+COMPACTION_MIN_RECORDS = 64
+JOURNAL_VERSION = 1
+
+
+class TimerJournal:
+    """Append-only record of the changes made to the active timers.
+
+    Changes can be journaled from several threads at once.  A lock keeps their
+    records from interleaving, and is held for the whole of a batch so that the
+    batch is written as a unit.
+
+    Args:
+        journal_path: location of the journal file in the skill's file system
+    """
+
+    def __init__(self, journal_path: Path):
+        self.journal_path = journal_path
+        self.live_records = {}
+        self.record_count = 0
+        self._lock = RLock()
+        self._pending = None
+
+    def load(self) -> List[CountdownTimer]:
+        """Replay the journal to rebuild the active timers.
+
+        Returns:
+            the timers that were active when the journal was last written
+        """
+        self.live_records = {}
+        if self.journal_path.exists():
+            with open(self.journal_path, "rb") as journal:
+                journal_lines = journal.read().split(b"\n")
+            # Anything after the last newline is a record that was never finished.
+            for line in journal_lines[:-1]:
+                try:
+                    record = json.loads(line)
+                    self._apply(record)
+                except UnsupportedJournalVersion as exc:
+                    self._set_aside(exc)
+                    break
+                except (ValueError, KeyError, TypeError):
+                    LOG.warning("Ignoring unreadable timer journal record")
+        self.compact()
+
+        return [
+            CountdownTimer.from_record(record) for record in self.live_records.values()
+        ]
+
+    def migrate_pickle(self, pickle_path: Path) -> List[CountdownTimer]:
+        """Convert timers saved by older versions of the skill into a journal.
+
+        Args:
+            pickle_path: location of the pickled list of timers
+
+        Returns:
+            the timers read from the pickle file
+        """
+        try:
+            with open(pickle_path, "rb") as data_file:
+                legacy_timers = _LegacyTimerUnpickler(data_file).load()
+            self.live_records = {
+                timer.index: _legacy_timer_to_record(timer) for timer in legacy_timers
+            }
+        except Exception:
+            LOG.exception("Saved timers could not be migrated, discarding them")
+            self.live_records = {}
+        self.compact()
+        pickle_path.unlink()
+
+        return [
+            CountdownTimer.from_record(record) for record in self.live_records.values()
+        ]
+
+    def record_add(self, timer: CountdownTimer):
+        """Journal the addition of a timer."""
+        self._append(dict(op="add", timer=timer.to_record()))
+
+    def record_cancel(self, timer: CountdownTimer):
+        """Journal the removal of a timer."""
+        self._append(dict(op="cancel", index=timer.index))
+
+    def record_clear(self):
+        """Journal the removal of all timers."""
+        self._append(dict(op="clear"))
+
+    def record_rename(self, timer: CountdownTimer):
+        """Journal a change to the name of a timer."""
+        self._append(dict(op="rename", index=timer.index, name=timer.name))
+
+    def record_announce(self, timer: CountdownTimer):
+        """Journal that the expiration of a timer was announced."""
+        self._append(dict(op="announce", index=timer.index))
+
+    @contextmanager
+    def batch(self):
+        """Write all the records journaled within the block with a single sync."""
+        with self._lock:
+            if self._pending is not None:
+                yield
+            else:
+                self._pending = []
+                try:
+                    yield
+                finally:
+                    pending, self._pending = self._pending, None
+                    self._write(pending)
+
+    def compact(self):
+        """Atomically rewrite the journal with one record per active timer."""
+        temp_path = self.journal_path.with_suffix(".tmp")
+        with open(temp_path, "w") as journal:
+            journal.write(_encode(dict(op="version", version=JOURNAL_VERSION)))
+            for record in self.live_records.values():
+                journal.write(_encode(dict(op="add", timer=record)))
+            journal.flush()
+            os.fsync(journal.fileno())
+        os.replace(temp_path, self.journal_path)
+        _sync_directory(self.journal_path.parent)
+        self.record_count = len(self.live_records) + 1
+
+    def _set_aside(self, exc: Exception):
+        """Keep a journal this version of the skill can't read instead of losing it."""
+        LOG.error(str(exc))
+        self.live_records = {}
+        os.replace(self.journal_path, self.journal_path.with_suffix(".unsupported"))
+
+    def _append(self, record: dict):
+        """Apply a record to the journal state and write it to disk."""
+        with self._lock:
+            self._apply(record)
+            if self._pending is None:
+                self._write([record])
+            else:
+                self._pending.append(record)
+
+    def _apply(self, record: dict):
+        """Update the active timer records to reflect a journal record."""
+        operation = record["op"]
+        if operation == "version":
+            if record["version"] > JOURNAL_VERSION:
+                raise UnsupportedJournalVersion(record["version"])
+        elif operation == "add":
+            self.live_records[record["timer"]["index"]] = record["timer"]
+        elif operation == "cancel":
+            self.live_records.pop(record["index"], None)
+        elif operation == "clear":
+            self.live_records = {}
+        elif operation == "rename":
+            self.live_records[record["index"]]["name"] = record["name"]
+        elif operation == "announce":
+            self.live_records[record["index"]]["announced"] = True
+        self.record_count += 1
+
+    def _write(self, records: List[dict]):
+        """Append records to the journal, compacting it if it has grown too large."""
+        if not records:
+            return
+        if self.record_count > max(COMPACTION_MIN_RECORDS, 2 * len(self.live_records)):
+            self.compact()
+        else:
+            with open(self.journal_path, "a") as journal:
+                journal.write("".join(_encode(record) for record in records))
+                journal.flush()
+                os.fsync(journal.fileno())
+
+
+def _encode(record: dict) -> str:
+    """Serialize a journal record as a single line of JSON."""
+    return json.dumps(record, separators=(",", ":")) + "\n"
+
+
+class UnsupportedJournalVersion(Exception):
+    """The journal was written by a newer version of the skill."""
+
+    def __init__(self, version: int):
+        super().__init__(
+            "Timer journal version {} is newer than supported version {}".format(
+                version, JOURNAL_VERSION
+            )
+        )
+
+
+class _LegacyTimer:
+    """Stand-in for the CountdownTimer objects pickled by older skill versions.
+
+    Only the attributes are needed, so unpickling doesn't depend on the current
+    layout of the CountdownTimer class.
+    """
+
+    index = None
+    ordinal = 0
+    expiration_announced = False
+
+
+class _LegacyTimerUnpickler(pickle.Unpickler):
+    """Unpickle a legacy timer list without running arbitrary code.
+
+    Only the timer itself and the date and time types it holds may be loaded.
+    """
+
+    def find_class(self, module, name):
+        if name == "CountdownTimer" and module.endswith("skill.timer"):
+            return _LegacyTimer
+        if module == "datetime" and name in ("datetime", "timedelta", "timezone"):
+            return super().find_class(module, name)
+        if module.startswith("dateutil.tz"):
+            return super().find_class(module, name)
+        raise pickle.UnpicklingError("{}.{} is not a timer".format(module, name))
+
+
+def _legacy_timer_to_record(timer: _LegacyTimer) -> dict:
+    """Build a flat timer record from a timer pickled by an older skill version."""
+    return dict(
+        duration=timer.duration.total_seconds(),
+        expiration=timer.expiration.timestamp(),
+        name=timer.name,
+        index=timer.index,
+        ordinal=timer.ordinal,
+        announced=timer.expiration_announced,
+    )
+
+
+def _sync_directory(directory: Path):
+    """Make a rename within a directory durable."""
+    try:
+        directory_fd = os.open(str(directory), os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(directory_fd)
+    except OSError:
+        pass
+    finally:
+        os.close(directory_fd)
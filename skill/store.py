@@ -0,0 +1,547 @@
+# Copyright 2021 Mycroft AI Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Defines the collection of active timers."""
+import math
+import time
+from bisect import bisect_left, bisect_right
+from datetime import timedelta
+from threading import RLock
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .timer import CountdownTimer
+
+
+class TimerSnapshot:
+    """An immutable view of the active timers, in order of expiration.
+
+    The indexes of the timers by name and by duration are part of the snapshot, so
+    lookups are consistent with the timers in it.  Neither the indexes nor the
+    tuples in them are changed once the snapshot is published.
+
+    The timer objects are shared with later snapshots, so their name and ordinal
+    attributes are always the latest.  Use get_name and get_ordinal for a timer's
+    name and ordinal as of the snapshot.
+
+    Args:
+        keys: the (deadline, index) sort key of each timer
+        timers: the timers, in the same order as their keys
+        names: the timers with each case folded name
+        name_lengths: the timers with each length of name
+        durations: the timers with each duration, in order of their ordinal
+        timer_names: the name of each timer, by timer index
+    """
+
+    __slots__ = (
+        "_keys",
+        "_timers",
+        "_names",
+        "_name_lengths",
+        "_durations",
+        "_timer_names",
+    )
+
+    def __init__(
+        self,
+        keys: Tuple = (),
+        timers: Tuple = (),
+        names: Dict[str, Tuple[CountdownTimer, ...]] = None,
+        name_lengths: Dict[int, Tuple[CountdownTimer, ...]] = None,
+        durations: Dict[timedelta, Tuple[CountdownTimer, ...]] = None,
+        timer_names: Dict[int, str] = None,
+    ):
+        self._keys = keys
+        self._timers = timers
+        self._names = names or {}
+        self._name_lengths = name_lengths or {}
+        self._durations = durations or {}
+        self._timer_names = timer_names or {}
+
+    def __len__(self) -> int:
+        return len(self._timers)
+
+    def __iter__(self) -> Iterator[CountdownTimer]:
+        return iter(self._timers)
+
+    def __getitem__(self, key):
+        return self._timers[key]
+
+    def get_next_expiring(
+        self, count: int, now: Optional[float] = None
+    ) -> List[CountdownTimer]:
+        """Find the timers that will expire next.
+
+        Args:
+            count: the maximum number of timers to return
+            now: value of time.monotonic() to evaluate the timers at
+
+        Returns:
+            up to count timers that have not expired, soonest first
+        """
+        if now is None:
+            now = time.monotonic()
+        start = bisect_right(self._keys, (now, math.inf))
+
+        return list(self._timers[start : start + count])
+
+    def get_expiring_between(
+        self, earliest: float, latest: float
+    ) -> List[CountdownTimer]:
+        """Find the timers with a deadline in a range of the monotonic clock.
+
+        Args:
+            earliest: the earliest deadline to include
+            latest: the latest deadline to include
+
+        Returns:
+            the timers with a deadline in the range, in order of expiration
+        """
+        start = bisect_left(self._keys, (earliest, -math.inf))
+        stop = bisect_right(self._keys, (latest, math.inf), lo=start)
+
+        return list(self._timers[start:stop])
+
+    def get_expired(self, now: Optional[float] = None) -> List[CountdownTimer]:
+        """Find the active timers that have expired.
+
+        Args:
+            now: value of time.monotonic() to evaluate the timers at
+
+        Returns:
+            the expired timers, in order of expiration
+        """
+        if now is None:
+            now = time.monotonic()
+
+        return list(self._timers[: bisect_left(self._keys, (now, -math.inf))])
+
+    def get_by_name(self, name: str) -> Optional[CountdownTimer]:
+        """Find the active timer with the specified name, regardless of case.
+
+        Args:
+            name: the name of the timer
+
+        Returns:
+            the timer with the name or None if no active timer has the name
+        """
+        named_timers = self._names.get(_fold(name))
+
+        return named_timers[0] if named_timers else None
+
+    def get_by_duration(self, duration: timedelta) -> List[CountdownTimer]:
+        """Find the active timers with the specified duration.
+
+        Args:
+            duration: the duration of the timers, as requested by the user
+
+        Returns:
+            the timers with the duration, in order of their ordinal
+        """
+        return list(self._durations.get(duration, ()))
+
+    def get_name(self, timer: CountdownTimer) -> Optional[str]:
+        """Find the name of a timer as of this snapshot.
+
+        Args:
+            timer: a timer in the snapshot
+
+        Returns:
+            the name the timer had, or None if the timer is not in the snapshot
+        """
+        return self._timer_names.get(timer.index)
+
+    def get_ordinal(self, timer: CountdownTimer) -> Optional[int]:
+        """Find the ordinal of a timer as of this snapshot.
+
+        Args:
+            timer: a timer in the snapshot
+
+        Returns:
+            the position of the timer among the timers with the same duration,
+            starting at one, or None if the timer is not in the snapshot
+        """
+        same_duration_timers = self._durations.get(timer.duration, ())
+        for ordinal, other_timer in enumerate(same_duration_timers, start=1):
+            if other_timer is timer:
+                return ordinal
+
+        return None
+
+    def get_name_candidates(self, name: str, min_ratio: float) -> List[CountdownTimer]:
+        """Find the timers whose names could be a fuzzy match for a name.
+
+        A similarity ratio of two strings can't exceed 2 * shorter / (sum of lengths),
+        so only timers with names in the length range that could reach the minimum
+        ratio are candidates.
+
+        Args:
+            name: the requested timer name
+            min_ratio: the minimum similarity ratio for a name to match
+
+        Returns:
+            the timers that could match, in no particular order
+        """
+        if min_ratio <= 0:
+            return list(self._timers)
+        name_length = len(name)
+        shortest = math.floor(name_length * min_ratio / (2 - min_ratio))
+        longest = math.ceil(name_length * (2 - min_ratio) / min_ratio)
+        candidates = []
+        if longest - shortest < len(self._name_lengths):
+            for length in range(shortest, longest + 1):
+                candidates.extend(self._name_lengths.get(length, ()))
+        else:
+            for length, timers in self._name_lengths.items():
+                if shortest <= length <= longest:
+                    candidates.extend(timers)
+
+        return candidates
+
+
+class TimerStore:
+    """The active timers, in order of expiration, indexed for fast lookup.
+
+    The timers are kept sorted on (deadline, index) so that the position of a timer
+    being added or removed is found with a binary search.  Every change copies the
+    timers, their keys and the indexes into the next snapshot, which takes time in
+    proportion to the number of active timers.  Each timer's index is a
+    stable handle for the timer: the store assigns it from a counter that only ever
+    increases, even when all the timers are cleared, so a handle never refers to a
+    different timer later on.  Handles grow too long to show where there is only
+    room for a digit or two, e.g. on the Mark I faceplate, so each timer is also
+    given a number to show.  Numbers count up from one again once there are no
+    active timers.
+
+    The timers are read from intent handlers, bus handlers and scheduled events, all
+    on different threads.  Changes are made under a lock and published as a new
+    TimerSnapshot, which replaces the previous one in a single assignment.  Readers
+    never take the lock; a snapshot obtained from snapshot() is consistent for as
+    long as it is used, no matter what is changed in the meantime, provided names
+    and ordinals are read from the snapshot rather than from the timers.  Iterating
+    over the store, or indexing it, uses the latest snapshot.
+
+    Timers can be looked up by name without regard to case.  Timer names are also
+    bucketed by length so that candidates for fuzzy matching can be narrowed down
+    before any of them are scored.
+
+    Timers are also grouped by duration, in the order they were added.  The store
+    maintains each timer's ordinal, its position within that group, so that when
+    there are three ten minute timers and the first one is cancelled, the other two
+    become the first and second ten minute timers.
+
+    Listeners are told about every change, under the writer lock so that they hear
+    about the changes in the order they were made.  A listener is called with the
+    change ("added", "removed", "renamed" or "cleared") and the timer changed, or
+    None when all the timers were cleared.
+    """
+
+    def __init__(self):
+        self._lock = RLock()
+        self._listeners = []
+        self._snapshot = TimerSnapshot()
+        self._entries = {}
+        self._last_index = 0
+        self._last_number = 0
+
+    def __len__(self) -> int:
+        return len(self._snapshot)
+
+    def __iter__(self) -> Iterator[CountdownTimer]:
+        return iter(self._snapshot)
+
+    def __getitem__(self, key):
+        return self._snapshot[key]
+
+    def __contains__(self, timer: CountdownTimer) -> bool:
+        entry = self._entries.get(timer.index)
+
+        return entry is not None and entry[1] is timer
+
+    @property
+    def last_index(self) -> int:
+        """The most recently assigned timer index."""
+        return self._last_index
+
+    def snapshot(self) -> TimerSnapshot:
+        """The active timers as of the most recent change."""
+        return self._snapshot
+
+    def writing(self) -> RLock:
+        """The writer lock, held by changes made to the store in several steps.
+
+        Hold it to journal a change to the active timers in the same order the
+        changes are made.  Take it before any other lock, e.g. a journal batch.
+        """
+        return self._lock
+
+    def add_listener(self, listener: Callable[[str, Optional[CountdownTimer]], None]):
+        """Call a function whenever the active timers change.
+
+        Args:
+            listener: called with the change and the timer changed
+        """
+        self._listeners.append(listener)
+
+    def remove_listener(
+        self, listener: Callable[[str, Optional[CountdownTimer]], None]
+    ):
+        """Stop calling a function added with add_listener when timers change."""
+        with self._lock:
+            if listener in self._listeners:
+                self._listeners.remove(listener)
+
+    def add(self, timer: CountdownTimer):
+        """Add a new timer to the active timers and assign its index and ordinal.
+
+        Timers that already have an index, e.g. timers loaded at startup, keep it.
+        The timer is also given the next number to show.
+
+        Args:
+            timer: the timer to add
+        """
+        with self._lock:
+            self._assign_index(timer)
+            self._assign_number(timer)
+            key = (timer.deadline, timer.index)
+            keys = list(self._snapshot._keys)
+            timers = list(self._snapshot._timers)
+            position = bisect_right(keys, key)
+            keys.insert(position, key)
+            timers.insert(position, timer)
+            self._entries[timer.index] = (key, timer)
+            names, name_lengths, durations, timer_names = self._copy_indexes()
+            _index_name(names, name_lengths, timer_names, timer)
+            _index_duration(durations, timer)
+            self._snapshot = TimerSnapshot(
+                tuple(keys), tuple(timers), names, name_lengths, durations, timer_names
+            )
+            self._notify("added", timer)
+
+    def remove(self, timer: CountdownTimer) -> bool:
+        """Remove a cancelled or cleared timer from the active timers.
+
+        Args:
+            timer: the timer to remove
+
+        Returns:
+            False if the timer was not active, e.g. because another thread removed
+            it first
+        """
+        with self._lock:
+            if timer not in self:
+                return False
+            key, _ = self._entries.pop(timer.index)
+            keys = self._snapshot._keys
+            timers = self._snapshot._timers
+            position = bisect_left(keys, key)
+            names, name_lengths, durations, timer_names = self._copy_indexes()
+            _unindex_name(names, name_lengths, timer_names, timer)
+            _unindex_duration(durations, timer)
+            self._snapshot = TimerSnapshot(
+                keys[:position] + keys[position + 1 :],
+                timers[:position] + timers[position + 1 :],
+                names,
+                name_lengths,
+                durations,
+                timer_names,
+            )
+            if not self._entries:
+                self._last_number = 0
+            self._notify("removed", timer)
+
+        return True
+
+    def clear(self):
+        """Remove all the active timers.  Indexes are not reused afterwards."""
+        with self._lock:
+            had_timers = bool(self._snapshot)
+            self._snapshot = TimerSnapshot()
+            self._entries = {}
+            self._last_number = 0
+            if had_timers:
+                self._notify("cleared", None)
+
+    def replace_all(self, timers: Iterable[CountdownTimer]):
+        """Replace the active timers, e.g. with timers loaded at startup.
+
+        Ordinals are reassigned in case a timer was removed without its ordinal
+        being persisted.  Listeners are told the timers were cleared, then about
+        each timer as if it was added.
+
+        Args:
+            timers: the new active timers
+        """
+        with self._lock:
+            self.clear()
+            names, name_lengths, durations, timer_names = {}, {}, {}, {}
+            for timer in sorted(timers, key=lambda tmr: tmr.ordinal):
+                self._assign_index(timer)
+                self._entries[timer.index] = ((timer.deadline, timer.index), timer)
+                _index_name(names, name_lengths, timer_names, timer)
+                _index_duration(durations, timer)
+            for index in sorted(self._entries):
+                self._assign_number(self._entries[index][1])
+            keys = sorted(key for key, _ in self._entries.values())
+            self._snapshot = TimerSnapshot(
+                tuple(keys),
+                tuple(self._entries[index][1] for _, index in keys),
+                names,
+                name_lengths,
+                durations,
+                timer_names,
+            )
+            for timer in self._snapshot:
+                self._notify("added", timer)
+
+    def rename(self, timer: CountdownTimer, name: str):
+        """Change the name of an active timer.
+
+        Args:
+            timer: the timer to rename
+            name: the new name of the timer
+        """
+        with self._lock:
+            names, name_lengths, durations, timer_names = self._copy_indexes()
+            _unindex_name(names, name_lengths, timer_names, timer)
+            timer.name = name
+            _index_name(names, name_lengths, timer_names, timer)
+            self._snapshot = TimerSnapshot(
+                self._snapshot._keys,
+                self._snapshot._timers,
+                names,
+                name_lengths,
+                durations,
+                timer_names,
+            )
+            self._notify("renamed", timer)
+
+    def get(self, index: int) -> Optional[CountdownTimer]:
+        """Find the active timer with the specified index.
+
+        Args:
+            index: the stable handle assigned to the timer when it was added
+
+        Returns:
+            the timer with the index or None if it is no longer active
+        """
+        entry = self._entries.get(index)
+
+        return None if entry is None else entry[1]
+
+    def get_next_expiring(
+        self, count: int, now: Optional[float] = None
+    ) -> List[CountdownTimer]:
+        """Find the timers that will expire next.  See TimerSnapshot."""
+        return self._snapshot.get_next_expiring(count, now)
+
+    def get_expiring_between(
+        self, earliest: float, latest: float
+    ) -> List[CountdownTimer]:
+        """Find the timers with a deadline in a range.  See TimerSnapshot."""
+        return self._snapshot.get_expiring_between(earliest, latest)
+
+    def get_expired(self, now: Optional[float] = None) -> List[CountdownTimer]:
+        """Find the active timers that have expired.  See TimerSnapshot."""
+        return self._snapshot.get_expired(now)
+
+    def get_by_name(self, name: str) -> Optional[CountdownTimer]:
+        """Find the active timer with a name, regardless of case.  See TimerSnapshot."""
+        return self._snapshot.get_by_name(name)
+
+    def get_by_duration(self, duration: timedelta) -> List[CountdownTimer]:
+        """Find the active timers with a duration.  See TimerSnapshot."""
+        return self._snapshot.get_by_duration(duration)
+
+    def get_name(self, timer: CountdownTimer) -> Optional[str]:
+        """Find the name of an active timer.  See TimerSnapshot."""
+        return self._snapshot.get_name(timer)
+
+    def get_ordinal(self, timer: CountdownTimer) -> Optional[int]:
+        """Find the ordinal of an active timer.  See TimerSnapshot."""
+        return self._snapshot.get_ordinal(timer)
+
+    def get_name_candidates(self, name: str, min_ratio: float) -> List[CountdownTimer]:
+        """Find the timers whose names could match a name.  See TimerSnapshot."""
+        return self._snapshot.get_name_candidates(name, min_ratio)
+
+    def _notify(self, change: str, timer: Optional[CountdownTimer]):
+        for listener in self._listeners:
+            listener(change, timer)
+
+    def _assign_index(self, timer: CountdownTimer):
+        if timer.index is None:
+            self._last_index += 1
+            timer.index = self._last_index
+        else:
+            self._last_index = max(self._last_index, timer.index)
+
+    def _assign_number(self, timer: CountdownTimer):
+        self._last_number += 1
+        timer.number = self._last_number
+
+    def _copy_indexes(self):
+        """Copy the indexes of the latest snapshot, to change for the next one."""
+        snapshot = self._snapshot
+
+        return (
+            dict(snapshot._names),
+            dict(snapshot._name_lengths),
+            dict(snapshot._durations),
+            dict(snapshot._timer_names),
+        )
+
+
+def _index_name(
+    names: dict, name_lengths: dict, timer_names: dict, timer: CountdownTimer
+):
+    folded_name = _fold(timer.name)
+    names[folded_name] = names.get(folded_name, ()) + (timer,)
+    name_length = len(timer.name.lower())
+    name_lengths[name_length] = name_lengths.get(name_length, ()) + (timer,)
+    timer_names[timer.index] = timer.name
+
+
+def _unindex_name(
+    names: dict, name_lengths: dict, timer_names: dict, timer: CountdownTimer
+):
+    _discard(names, _fold(timer.name), timer)
+    _discard(name_lengths, len(timer.name.lower()), timer)
+    del timer_names[timer.index]
+
+
+def _index_duration(durations: dict, timer: CountdownTimer):
+    same_duration_timers = durations.get(timer.duration, ()) + (timer,)
+    durations[timer.duration] = same_duration_timers
+    timer.ordinal = len(same_duration_timers)
+
+
+def _unindex_duration(durations: dict, timer: CountdownTimer):
+    same_duration_timers = durations[timer.duration]
+    position = same_duration_timers.index(timer)
+    for later_timer in same_duration_timers[position + 1 :]:
+        later_timer.ordinal -= 1
+    _discard(durations, timer.duration, timer)
+
+
+def _discard(index: dict, key, timer: CountdownTimer):
+    """Replace the timers under a key of an index with a tuple without the timer."""
+    remaining_timers = tuple(other for other in index[key] if other is not timer)
+    if remaining_timers:
+        index[key] = remaining_timers
+    else:
+        del index[key]
+
+
+def _fold(name: str) -> str:
+    """Normalize a timer name for case-insensitive lookup."""
+    return name.casefold()
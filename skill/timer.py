@@ -12,87 +12,265 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 """Defines a timer object."""
-from datetime import timedelta
+import math
+import time
+from datetime import datetime, timedelta, timezone
 from typing import Optional
 
 from mycroft.util.format import nice_duration
 from mycroft.util.time import now_utc
-from .util import format_timedelta
+from .util import format_seconds
 
 BACKGROUND_COLORS = ("#22A7F0", "#40DBB0", "#BDC3C7", "#4DE0FF")
 
 
 class CountdownTimer:
-    """Data attributes that define a timer."""
+    """Data attributes that define a timer.
 
-    _speakable_duration = None
+    The expiration is the wall clock time the timer is set to expire, which is
+    persisted and shown on the display.  Whether or not the timer has expired is
+    determined by the deadline, the value of time.monotonic() at expiration, so that
+    changes to the system clock don't make timers expire early or late.
+
+    Timers are slotted to keep large numbers of them compact.  Spoken durations are
+    cached per language and the displayed time delta is cached for the second it
+    applies to.
+    """
+
+    __slots__ = (
+        "duration",
+        "name",
+        "index",
+        "number",
+        "expiration",
+        "deadline",
+        "expiration_announced",
+        "ordinal",
+        "_speakable_durations",
+        "_formatted_second",
+        "_formatted_time_delta",
+        "_display_expiration",
+    )
 
     def __init__(self, duration: timedelta, name: str):
         self.duration = duration
         self.name = name
         self.index = None
+        self.number = None
         self.expiration = now_utc() + duration
+        self.deadline = time.monotonic() + duration.total_seconds()
         self.expiration_announced = False
         self.ordinal = 0
+        self._speakable_durations = None
+        self._formatted_second = None
+        self._formatted_time_delta = None
+        self._display_expiration = None
+
+    @classmethod
+    def from_record(cls, record: dict) -> "CountdownTimer":
+        """Rebuild a timer from the flat record written by to_record.
+
+        Args:
+            record: persisted timer attributes
+
+        Returns:
+            the timer the record was built from
+        """
+        timer = cls.__new__(cls)
+        timer.duration = timedelta(seconds=record["duration"])
+        timer.name = record["name"]
+        timer.index = record["index"]
+        timer.number = None
+        timer.expiration = datetime.fromtimestamp(record["expiration"], timezone.utc)
+        timer.deadline = time.monotonic() + record["expiration"] - time.time()
+        timer.expiration_announced = record["announced"]
+        timer.ordinal = record["ordinal"]
+        timer._speakable_durations = None
+        timer._formatted_second = None
+        timer._formatted_time_delta = None
+        timer._display_expiration = None
+
+        return timer
+
+    def to_record(self) -> dict:
+        """Build a flat representation of the timer suitable for persisting."""
+        return dict(
+            duration=self.duration.total_seconds(),
+            expiration=self.expiration.timestamp(),
+            name=self.name,
+            index=self.index,
+            ordinal=self.ordinal,
+            announced=self.expiration_announced,
+        )
+
+    def describe(self, now: float = None) -> dict:
+        """Build a compact description of the timer for other programs on the bus.
+
+        Args:
+            now: value of time.monotonic() to evaluate the timer at
+
+        Returns:
+            the timer's index, name, duration and expiration (a UNIX timestamp),
+            the seconds remaining (negative once expired) and whether it expired
+        """
+        if now is None:
+            now = time.monotonic()
+        seconds_remaining = self.deadline - now
+
+        return dict(
+            index=self.index,
+            name=self.name,
+            duration=self.duration.total_seconds(),
+            expiration=self.expiration.timestamp(),
+            remaining=round(seconds_remaining, 3),
+            expired=seconds_remaining < 0,
+        )
+
+    def get_status(self, now: float = None) -> "TimerStatus":
+        """Evaluate the state of the timer at a single point in time.
+
+        Args:
+            now: value of time.monotonic() to evaluate the timer at.  Pass the same
+                value when evaluating several timers to get a consistent view of them.
+
+        Returns:
+            the state of the timer at the specified time
+        """
+        if now is None:
+            now = time.monotonic()
+
+        return TimerStatus(self, now)
 
     @property
     def expired(self) -> bool:
         """Boolean value representing whether or not the timer has expired."""
-        return self.expiration < now_utc()
+        return self.deadline < time.monotonic()
 
     @property
     def speakable_duration(self) -> str:
         """Generate a string that can be used to speak the timer's initial duration."""
-        if self._speakable_duration is None:
-            self._speakable_duration = nice_duration(self.duration)
+        return self.get_speakable_duration()
+
+    def get_speakable_duration(self, lang: str = None) -> str:
+        """Generate a string that can be used to speak the timer's initial duration.
+
+        Args:
+            lang: language the duration will be spoken in, defaults to the
+                configured language
+
+        Returns:
+            the duration in words, e.g. "five minutes"
+        """
+        if self._speakable_durations is None:
+            self._speakable_durations = {}
+        speakable_duration = self._speakable_durations.get(lang)
+        if speakable_duration is None:
+            speakable_duration = nice_duration(self.duration, lang=lang)
+            self._speakable_durations[lang] = speakable_duration
+
+        return speakable_duration
+
+    def format_time_delta(self, seconds_remaining: float) -> str:
+        """Format the time remaining (negative once expired) for display.
+
+        The result only changes once a second, so it is cached for that second.
 
-        return self._speakable_duration
+        Args:
+            seconds_remaining: seconds until the deadline, negative when expired
+
+        Returns:
+            the time remaining, or "-" and the time since expiration
+        """
+        if seconds_remaining < 0:
+            display_second = -math.floor(-seconds_remaining) - 1
+        else:
+            display_second = math.floor(seconds_remaining)
+        if display_second != self._formatted_second:
+            if display_second < 0:
+                formatted_time_delta = "-" + format_seconds(-display_second - 1)
+            else:
+                formatted_time_delta = format_seconds(display_second)
+            self._formatted_second = display_second
+            self._formatted_time_delta = formatted_time_delta
+
+        return self._formatted_time_delta
 
     @property
     def time_remaining(self) -> Optional[timedelta]:
         """The amount of time remaining until the timer expires."""
-        if self.expired:
-            time_remaining = None
-        else:
-            time_remaining = self.expiration - now_utc()
-
-        return time_remaining
+        return self.get_status().time_remaining
 
     @property
     def percent_remaining(self) -> float:
         """The percentage of the timer duration that remains until expiration."""
-        if self.expired:
-            percent_remaining = None
-        else:
-            percent_remaining = (
-                self.time_remaining.total_seconds() / self.duration.total_seconds()
-            )
-
-        return percent_remaining
+        return self.get_status().percent_remaining
 
     @property
     def time_since_expiration(self) -> Optional[timedelta]:
         """The amount of time elapsed since the timer expired."""
-        if self.expired:
-            time_since_expiration = now_utc() - self.expiration
-        else:
-            time_since_expiration = None
+        return self.get_status().time_since_expiration
 
-        return time_since_expiration
+    @property
+    def formatted_time_delta(self) -> str:
+        """The time remaining, or elapsed since expiration, formatted for display."""
+        return self.get_status().formatted_time_delta
 
     @property
     def display_data(self) -> dict:
-        """Build the name/value pairs to be passed to the GUI."""
+        """Build the name/value pairs to be passed to the GUI.
+
+        None of the values change as the timer counts down.  The GUI calculates the
+        time remaining, percent remaining and expired state from the expiration and
+        duration (both in milliseconds) so it only needs to be sent new data when the
+        timers on the screen change.
+
+        The GUI counts down against the wall clock but the timer expires on the
+        monotonic clock, so the expiration sent is derived from the deadline,
+        rounded to the second.  It only changes when the wall clock is moved, e.g.
+        by NTP, by a second or more, which makes the GUI data differ and be resent.
+        """
         color_index = (self.index % 4) - 1
-        if self.expired:
-            expiration_delta = "-" + format_timedelta(self.time_since_expiration)
-        else:
-            expiration_delta = format_timedelta(self.time_remaining)
 
         return dict(
             backgroundColor=BACKGROUND_COLORS[color_index],
-            expired=self.expired,
-            percentRemaining=self.percent_remaining,
+            duration=self.duration.total_seconds() * 1000,
+            expiration=self._get_display_expiration() * 1000,
             timerName=self.name,
-            timeDelta=expiration_delta,
         )
+
+    def _get_display_expiration(self) -> int:
+        """The wall clock time the timer expires at, as a UNIX timestamp."""
+        expiration = time.time() + self.deadline - time.monotonic()
+        if (
+            self._display_expiration is None
+            or abs(expiration - self._display_expiration) >= 1
+        ):
+            self._display_expiration = round(expiration)
+
+        return self._display_expiration
+
+
+class TimerStatus:
+    """The values derived from a timer's deadline, all calculated for the same time.
+
+    Args:
+        timer: the timer being evaluated
+        now: value of time.monotonic() the timer is evaluated at
+    """
+
+    def __init__(self, timer: CountdownTimer, now: float):
+        seconds_remaining = timer.deadline - now
+        self.expired = seconds_remaining < 0
+        if self.expired:
+            self.time_remaining = None
+            self.percent_remaining = None
+            self.time_since_expiration = timedelta(seconds=-seconds_remaining)
+        else:
+            duration_seconds = timer.duration.total_seconds()
+            self.time_remaining = timedelta(seconds=seconds_remaining)
+            if duration_seconds:
+                self.percent_remaining = seconds_remaining / duration_seconds
+            else:
+                self.percent_remaining = 0.0
+            self.time_since_expiration = None
+        self.formatted_time_delta = timer.format_time_delta(seconds_remaining)
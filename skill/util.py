@@ -12,27 +12,114 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 """Utility functions for the timer skill."""
+import os
 import re
 from datetime import timedelta
-from typing import Optional, Tuple
+from functools import lru_cache
+from typing import FrozenSet, Iterable, Optional, Tuple
 
 from mycroft.util.format import pronounce_number
 from mycroft.util.log import LOG
 from mycroft.util.parse import extract_duration, extract_number
+from .name_extractor import extract_timer_name
 
+# The same utterance is parsed by several steps of a single request, so keep the
+# results for the most recent utterances.
+PARSE_CACHE_SIZE = 64
 
-def extract_timer_duration(utterance: str) -> Tuple[Optional[timedelta], Optional[str]]:
+# Timers are almost always displayed with less than an hour remaining, so the
+# display strings for the first hour are built once up front.
+ONE_HOUR = 3600
+_MINUTES_AND_SECONDS = tuple(
+    "{:02d}:{:02d}".format(*divmod(seconds, 60)) for seconds in range(ONE_HOUR)
+)
+
+
+class ParsedUtterance:
+    """The timer attributes found in an utterance.
+
+    Instances are shared between callers through the parse cache so they should not
+    be modified.
+    """
+
+    def __init__(
+        self,
+        duration: Optional[timedelta],
+        remainder: Optional[str],
+        name: Optional[str],
+        ordinal: Optional[int],
+        words: FrozenSet[str],
+    ):
+        self.duration = duration
+        self.remainder = remainder
+        self.name = name
+        self.ordinal = ordinal
+        self.words = words
+
+    def includes_any(self, words: Iterable[str]) -> bool:
+        """Determine if any of the specified words were spoken, e.g. "all"."""
+        return not self.words.isdisjoint(words)
+
+
+def parse_utterance(
+    utterance: str, regex_file_path: str, lang: str = None
+) -> ParsedUtterance:
+    """Parse everything the skill needs to know about an utterance in one pass.
+
+    The result is cached until the name.rx file is modified, so that a changed file
+    is used for the next request like it is by get_timer_name_patterns.
+
+    Args:
+        utterance: Full request, e.g. "cancel the second 30 second timer"
+        regex_file_path: path to the name.rx file used to find the timer name
+        lang: language of the utterance, defaults to the configured language
+
+    Returns:
+        the duration, remainder, name and ordinal found in the utterance
+    """
+    if regex_file_path:
+        regex_modified_time = os.stat(regex_file_path).st_mtime_ns
+    else:
+        regex_modified_time = None
+
+    return _parse_utterance(utterance, regex_file_path, regex_modified_time, lang)
+
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def _parse_utterance(
+    utterance: str,
+    regex_file_path: str,
+    regex_modified_time: Optional[int],
+    lang: Optional[str],
+) -> ParsedUtterance:
+    """Parse an utterance, cached by the modification time of the name.rx file."""
+    duration, remainder = extract_timer_duration(utterance, lang)
+
+    return ParsedUtterance(
+        duration=duration,
+        remainder=remainder,
+        name=extract_timer_name(utterance, regex_file_path),
+        ordinal=extract_ordinal(utterance, lang),
+        words=frozenset(utterance.split()),
+    )
+
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def extract_timer_duration(
+    utterance: str, lang: str = None
+) -> Tuple[Optional[timedelta], Optional[str]]:
     """Extract duration in seconds.
 
     Args:
         utterance: Full request, e.g. "set a 30 second timer"
+        lang: language of the utterance, defaults to the configured language
 
     Returns
         Number of seconds requested (or None if no duration was extracted) and remainder
         of utterance
     """
     normalized_utterance = _normalize_utterance(utterance)
-    extract_result = extract_duration(normalized_utterance)
+    extract_result = extract_duration(normalized_utterance, lang)
     if extract_result is None:
         duration = remaining_utterance = None
     else:
@@ -83,24 +170,40 @@ def remove_conjunction(conjunction: str, utterance: str) -> str:
     return remaining_utterance
 
 
-def extract_ordinal(utterance: str) -> str:
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def extract_ordinal(utterance: str, lang: str = None) -> Optional[int]:
     """Extract ordinal number from the utterance.
 
     Args:
         utterance: Full request, e.g. "set a 30 second timer"
+        lang: language of the utterance, defaults to the configured language
 
     Returns:
         An integer representing the numeric value of the ordinal or None if no ordinal
         is found in the utterance.
     """
     ordinal = None
-    extracted_number = extract_number(utterance, ordinals=True)
+    extracted_number = extract_number(utterance, ordinals=True, lang=lang)
     if type(extracted_number) == int:
         ordinal = extracted_number
 
     return ordinal
 
 
+def get_speakable_number(number: int, lang: str = None) -> str:
+    """Get a number of timers in a form that can be passed to TTS.
+
+    Args:
+        number: the number to speak
+        lang: language the number will be spoken in, defaults to the configured
+            language
+
+    Returns:
+        The number in words, e.g. "three"
+    """
+    return pronounce_number(number, lang=lang)
+
+
 def get_speakable_ordinal(ordinal) -> str:
     """Get speakable ordinal if other timers exist with same duration.
 
@@ -123,12 +226,27 @@ def format_timedelta(time_delta: timedelta) -> str:
     Returns:
         the value to display on a device's screen or faceplate.
     """
-    hours = abs(time_delta // timedelta(hours=1))
-    minutes = abs((time_delta - timedelta(hours=hours)) // timedelta(minutes=1))
-    seconds = abs(
-        (time_delta - timedelta(hours=hours) - timedelta(minutes=minutes))
-        // timedelta(seconds=1)
-    )
+    return format_seconds(time_delta // timedelta(seconds=1))
+
+
+def format_seconds(seconds: int) -> str:
+    """Convert a whole number of seconds into a displayable time string.
+
+    Equivalent to format_timedelta for a timedelta of the same whole seconds, without
+    the timedelta arithmetic.  Anything less than an hour is a table lookup.
+
+    Args:
+        seconds: the number of seconds to convert to a displayable string.
+
+    Returns:
+        the value to display on a device's screen or faceplate, e.g. "04:59" or
+        "1:04:59"
+    """
+    if 0 <= seconds < ONE_HOUR:
+        return _MINUTES_AND_SECONDS[seconds]
+    hours = abs(seconds // ONE_HOUR)
+    minutes = abs((seconds - hours * ONE_HOUR) // 60)
+    seconds = abs(seconds - hours * ONE_HOUR - minutes * 60)
     if hours:
         time_elements = [str(hours), str(minutes).zfill(2), str(seconds).zfill(2)]
     else:
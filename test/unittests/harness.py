@@ -0,0 +1,222 @@
+# Copyright 2021 Mycroft AI Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Run the timer skill in-process without the rest of Mycroft.
+
+The message bus, GUI, enclosure and scheduler are replaced with fakes that record
+what the skill sent to them, so the skill can be driven directly by the unit tests
+and timed by the benchmarks.  Skills talk to the GUI and the scheduler over the
+message bus, so those fakes are part of the fake bus.  Mycroft core must be
+installed to load the skill.
+"""
+import importlib.util
+import sys
+import time
+from collections import Counter, defaultdict
+from datetime import timedelta
+from pathlib import Path
+from typing import Callable, Optional
+
+from mycroft.messagebus.message import Message
+
+SKILL_DIRECTORY = Path(__file__).parents[2]
+SKILL_ID = "mycroft-timer.mycroftai"
+MARK_I = "mycroft_mark_1"
+
+
+class FakeBus:
+    """In-process message bus that records the messages emitted by the skill.
+
+    Messages are dispatched to handlers registered on the bus as they are emitted.
+    The GUI status request is answered with the gui_connected attribute, and events
+    scheduled through the bus are kept in scheduled_events, keyed by event name.
+    """
+
+    def __init__(self, gui_connected: bool = False):
+        self.gui_connected = gui_connected
+        self.handlers = defaultdict(list)
+        self.emitted = Counter()
+        self.scheduled_events = {}
+
+    def on(self, message_type: str, handler: Callable):
+        self.handlers[message_type].append(handler)
+
+    def once(self, message_type: str, handler: Callable):
+        self.handlers[message_type].append(handler)
+
+    def remove(self, message_type: str, handler: Callable):
+        if handler in self.handlers.get(message_type, []):
+            self.handlers[message_type].remove(handler)
+
+    def remove_all_listeners(self, message_type: str):
+        self.handlers.pop(message_type, None)
+
+    def emit(self, message: Message):
+        self.emitted[message.msg_type] += 1
+        if message.msg_type == "mycroft.scheduler.schedule_event":
+            self.scheduled_events[message.data["event"]] = message.data
+        elif message.msg_type == "mycroft.scheduler.remove_event":
+            self.scheduled_events.pop(message.data["event"], None)
+        for handler in list(self.handlers.get(message.msg_type, [])):
+            handler(message)
+
+    def wait_for_response(
+        self, message: Message, reply_type: Optional[str] = None, timeout: float = 3.0
+    ) -> Optional[Message]:
+        self.emit(message)
+        if message.msg_type == "gui.status.request":
+            return message.response(dict(connected=self.gui_connected))
+
+        return None
+
+    def run_in_thread(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class FakeDisplayManager:
+    """The Mark I faceplate, always in use by the timer skill."""
+
+    @staticmethod
+    def get_active() -> str:
+        return "TimerSkill"
+
+
+class FakeEnclosure:
+    """Count the calls made to the enclosure API instead of sending them."""
+
+    def __init__(self):
+        self.calls = Counter()
+        self.display_manager = FakeDisplayManager()
+
+    def __getattr__(self, name: str):
+        def record_call(*args, **kwargs):
+            self.calls[name] += 1
+
+        return record_call
+
+
+class FakeBeeper:
+    """Count requests to start and stop beeping instead of playing audio."""
+
+    def __init__(self):
+        self.calls = Counter()
+        self.beeping = False
+
+    def start(self):
+        self.calls["start"] += 1
+        self.beeping = True
+
+    def stop(self):
+        self.calls["stop"] += 1
+        self.beeping = False
+
+
+def import_skill():
+    """Import the skill's module the way the skill loader does.
+
+    Returns:
+        the freshly imported module
+    """
+    spec = importlib.util.spec_from_file_location(
+        "mycroft_timer",
+        str(SKILL_DIRECTORY.joinpath("__init__.py")),
+        submodule_search_locations=[str(SKILL_DIRECTORY)],
+    )
+    skill_module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = skill_module
+    spec.loader.exec_module(skill_module)
+
+    return skill_module
+
+
+def load_skill(
+    data_directory: Path,
+    bus: FakeBus,
+    platform: Optional[str] = None,
+    skill_module=None,
+):
+    """Load the skill the way the skill loader does, then swap in the fakes.
+
+    Args:
+        data_directory: where the skill keeps its timer journal
+        bus: the fake message bus to bind the skill to
+        platform: the enclosure platform to emulate, e.g. the Mark I
+        skill_module: the module to load the skill from, imported if not specified
+
+    Returns:
+        the initialized skill
+    """
+    if skill_module is None:
+        skill_module = import_skill()
+    skill = skill_module.create_skill()
+    skill.save_path = data_directory.joinpath("save_timers")
+    skill.timer_journal = skill_module.TimerJournal(
+        data_directory.joinpath("timers.journal")
+    )
+    skill.beeper = FakeBeeper()
+    if platform is not None:
+        skill.platform = platform
+    skill._startup(bus, SKILL_ID)
+
+    enclosure = FakeEnclosure()
+    if isinstance(getattr(type(skill), "enclosure", None), property):
+        skill._enclosure = enclosure
+    else:
+        skill.enclosure = enclosure
+    if skill.faceplate_renderer is not None:
+        skill.faceplate_renderer.enclosure = enclosure
+    # Anything that asks the user a question would wait for a reply that never
+    # comes, so answer immediately and count the questions instead.
+    skill.questions_asked = 0
+
+    def get_response(*args, **kwargs):
+        skill.questions_asked += 1
+
+    skill.get_response = get_response
+
+    return skill
+
+
+def add_timers(skill, timer_count: int):
+    """Start timers of one minute, two minutes, etc. without parsing any requests.
+
+    Args:
+        skill: the skill to add the timers to
+        timer_count: the number of timers to add
+    """
+    for minutes in range(1, timer_count + 1):
+        timer = skill._build_timer(timedelta(minutes=minutes), None)
+        skill._add_active_timer(timer)
+    skill._start_expiration_check()
+
+
+def expire_timers(skill):
+    """Make all the active timers look like they expired a minute ago.
+
+    Args:
+        skill: the skill with the active timers
+    """
+    expiration = time.monotonic() - 60
+    for timer in skill.active_timers:
+        timer.deadline = expiration
+        timer.expiration_announced = True
+    skill.active_timers.replace_all(list(skill.active_timers))
+    skill.expiration_queue.rebuild(skill.active_timers)
+
+
+def utterance_message(utterance: str) -> Message:
+    """Build the message an intent handler receives for an utterance."""
+    return Message("intent", dict(utterance=utterance))
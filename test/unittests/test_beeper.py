@@ -0,0 +1,89 @@
+# Copyright 2021 Mycroft AI Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Unit tests for the expired timer beeper."""
+import time
+import wave
+from pathlib import Path
+
+from skill.beeper import Beeper, get_player_command, read_beep_cycle
+
+SOUND_DIRECTORY = Path(__file__).parents[2].joinpath("sounds")
+
+
+def test_beep_cycle_padded_with_silence():
+    sound_file_path = SOUND_DIRECTORY.joinpath("two-beep.wav")
+    with wave.open(str(sound_file_path), "rb") as wav_file:
+        beep_frames = wav_file.readframes(wav_file.getnframes())
+
+    beep_cycle = read_beep_cycle(sound_file_path, cycle_seconds=2)
+
+    frame_size = beep_cycle.channels * beep_cycle.sample_width
+    assert len(beep_cycle.frames) == 2 * beep_cycle.frame_rate * frame_size
+    assert beep_cycle.frames.startswith(beep_frames)
+    assert not beep_cycle.frames[len(beep_frames) :].strip(b"\x00")
+
+
+def test_player_command_keeps_configured_options(monkeypatch):
+    monkeypatch.setattr("shutil.which", lambda player: "/usr/bin/" + player)
+    beep_cycle = read_beep_cycle(SOUND_DIRECTORY.joinpath("two-beep.wav"), 2)
+
+    player_command = get_player_command(beep_cycle, "aplay -Dhw:0,0 %1")
+
+    assert player_command[:3] == ["aplay", "-Dhw:0,0", "-q"]
+    assert get_player_command(beep_cycle, "mpg123 %1") is None
+
+
+def test_one_player_process_until_stopped():
+    beeper = Beeper(
+        SOUND_DIRECTORY.joinpath("two-beep.wav"), player_command=["sleep", "60"]
+    )
+    beeper.start()
+    process = beeper._process
+    beeper.start()
+    assert beeper._process is process
+    assert beeper.beeping
+
+    beeper.stop()
+
+    assert not beeper.beeping
+    for _ in range(50):
+        if process.poll() is not None:
+            break
+        time.sleep(0.1)
+    assert process.poll() is not None
+
+
+def test_player_that_fails_to_start_falls_back_to_each_cycle(monkeypatch, tmp_path):
+    played = []
+    monkeypatch.setattr("skill.beeper.play_wav", played.append)
+    beeper = Beeper(
+        SOUND_DIRECTORY.joinpath("two-beep.wav"),
+        cycle_seconds=0.05,
+        player_command=[str(tmp_path.joinpath("missing-player"))],
+    )
+
+    beeper.start()
+    assert beeper.beeping
+    for _ in range(50):
+        if played:
+            break
+        time.sleep(0.01)
+    beeper.stop()
+
+    assert played
+    assert not beeper.beeping
+    beeper.start()
+    assert beeper.beeping
+    assert beeper.player_command is None
+    beeper.stop()
@@ -0,0 +1,129 @@
+# Copyright 2021 Mycroft AI Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Unit tests for reading bulk timer requests."""
+import time
+from datetime import timedelta
+
+import pytest
+
+from skill.bulk import read_timer_requests, StatusQuery, TimerFilter
+from skill.store import TimerStore
+from skill.timer import CountdownTimer
+
+
+def _build_timers():
+    timers = [
+        CountdownTimer(timedelta(minutes=10), "Pasta"),
+        CountdownTimer(timedelta(minutes=12), "pasta sauce"),
+        CountdownTimer(timedelta(minutes=30), "rice"),
+        CountdownTimer(timedelta(seconds=30), "egg"),
+    ]
+    timers[-1].deadline = time.monotonic() - 1
+    return timers
+
+
+def test_read_timer_requests():
+    data = dict(timers=[dict(duration=90, name=" pasta "), dict(duration="600")])
+
+    assert read_timer_requests(data) == [
+        (timedelta(seconds=90), "pasta"),
+        (timedelta(minutes=10), None),
+    ]
+
+
+@pytest.mark.parametrize(
+    "timer_data",
+    [
+        dict(name="pasta"),
+        dict(duration="soon"),
+        dict(duration=0),
+        dict(duration=float("inf")),
+        dict(duration=1e12),
+        dict(duration=60, name=" "),
+        [60, "pasta"],
+        "pasta",
+        None,
+    ],
+)
+def test_read_timer_requests_rejects_invalid_timers(timer_data):
+    with pytest.raises(ValueError):
+        read_timer_requests(dict(timers=[dict(duration=60), timer_data]))
+
+
+@pytest.mark.parametrize("timers_data", [None, dict(duration=60), "pasta", 60])
+def test_read_timer_requests_rejects_timers_not_in_a_list(timers_data):
+    with pytest.raises(ValueError):
+        read_timer_requests(dict(timers=timers_data))
+
+
+def test_filter_criteria_are_combined():
+    timers = _build_timers()
+
+    by_prefix = TimerFilter.from_message_data(dict(name_prefix="PASTA"))
+    assert by_prefix.select(timers) == timers[:2]
+    by_duration = TimerFilter.from_message_data(
+        dict(name_prefix="pasta", max_duration=600)
+    )
+    assert by_duration.select(timers) == timers[:1]
+    by_range = TimerFilter.from_message_data(dict(min_duration=60, max_duration=720))
+    assert by_range.select(timers) == timers[:2]
+    assert TimerFilter(expired=True).select(timers) == timers[3:]
+    assert TimerFilter(expired=False).select(timers) == timers[:3]
+
+
+def test_filter_without_criteria_selects_nothing_unless_all_requested():
+    timers = _build_timers()
+
+    assert TimerFilter.from_message_data({}).select(timers) == []
+    assert TimerFilter.from_message_data(dict(all=True)).select(timers) == timers
+
+
+@pytest.mark.parametrize(
+    "filter_data",
+    [
+        dict(min_duration="long"),
+        dict(max_duration=float("inf")),
+        dict(name_prefix=5),
+        dict(all="false"),
+        dict(all=1),
+        dict(expired="false"),
+        dict(expired=0),
+    ],
+)
+def test_filter_rejects_invalid_criteria(filter_data):
+    with pytest.raises(ValueError):
+        TimerFilter.from_message_data(filter_data)
+
+
+def test_status_query_selects_from_indexes():
+    store = TimerStore()
+    store.replace_all(_build_timers())
+    now = time.monotonic()
+    egg, pasta, sauce, rice = store.snapshot()
+
+    assert StatusQuery().select(store, now) == [egg, pasta, sauce, rice]
+    assert StatusQuery(name="EGG").select(store, now) == [egg]
+    assert StatusQuery(next_count=2).select(store, now) == [pasta, sauce]
+    assert StatusQuery(within=11 * 60).select(store, now) == [pasta]
+    assert StatusQuery(within=3600, next_count=2).select(store, now) == [pasta, sauce]
+    assert StatusQuery(name="egg", next_count=1).select(store, now) == []
+    assert StatusQuery(name="rice", within=600).select(store, now) == []
+
+
+@pytest.mark.parametrize(
+    "query_data", [dict(next="a few"), dict(next=0), dict(next=-1), dict(name=5)]
+)
+def test_status_query_rejects_invalid_criteria(query_data):
+    with pytest.raises(ValueError):
+        StatusQuery.from_message_data(query_data)
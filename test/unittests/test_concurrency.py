@@ -0,0 +1,96 @@
+# Copyright 2021 Mycroft AI Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Stress test of the timer state shared by the skill's threads."""
+import random
+import sys
+import threading
+from datetime import timedelta
+
+import pytest
+
+from harness import FakeBus, load_skill, MARK_I
+from skill.persistence import TimerJournal
+
+WRITER_THREADS = 8
+OPERATIONS_PER_WRITER = 300
+
+
+def _hammer(skill, seed: int, errors: list):
+    """Start, cancel and stop timers the way the skill's handlers do."""
+    rng = random.Random(seed)
+    try:
+        for _ in range(OPERATIONS_PER_WRITER):
+            action = rng.random()
+            if action < 0.5:
+                duration = timedelta(milliseconds=rng.randint(-50, 50))
+                skill._add_active_timer(skill._build_timer(duration, "timer"))
+            elif action < 0.8:
+                timers = skill.active_timers.snapshot()
+                if timers:
+                    skill._remove_active_timer(rng.choice(timers))
+            else:
+                skill.stop()
+    except Exception as exc:
+        errors.append(exc)
+
+
+def _watch_display(skill, done: threading.Event, errors: list):
+    """Run the display and expiration ticks while the timers are being changed."""
+    try:
+        while not done.is_set():
+            skill.update_display()
+            skill.check_for_expired_timers()
+            timers = skill.active_timers.snapshot()
+            deadlines = [timer.deadline for timer in timers]
+            assert deadlines == sorted(deadlines)
+            assert len({timer.index for timer in timers}) == len(timers)
+            next_timers = timers.get_next_expiring(4)
+            assert len(next_timers) <= 4
+            assert all(timer in timers for timer in next_timers)
+            assert set(timers.get_by_duration(timedelta(0))) <= set(timers)
+    except Exception as exc:
+        errors.append(exc)
+
+
+@pytest.mark.parametrize("gui_connected, platform", [(True, None), (False, MARK_I)])
+def test_concurrent_start_cancel_and_stop_keep_state_consistent(
+    tmp_path, gui_connected, platform
+):
+    switch_interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    skill = load_skill(tmp_path, FakeBus(gui_connected), platform)
+    errors = []
+    done = threading.Event()
+    display = threading.Thread(target=_watch_display, args=(skill, done, errors))
+    writers = [
+        threading.Thread(target=_hammer, args=(skill, seed, errors))
+        for seed in range(WRITER_THREADS)
+    ]
+    try:
+        display.start()
+        for writer in writers:
+            writer.start()
+        for writer in writers:
+            writer.join()
+    finally:
+        done.set()
+        display.join()
+        sys.setswitchinterval(switch_interval)
+
+    assert not errors
+    active_indexes = {timer.index for timer in skill.active_timers}
+    assert len(active_indexes) == len(skill.active_timers)
+    assert all(skill.active_timers.get(index) for index in active_indexes)
+    journaled_timers = TimerJournal(tmp_path.joinpath("timers.journal")).load()
+    assert {timer.index for timer in journaled_timers} == active_indexes
@@ -0,0 +1,90 @@
+# Copyright 2021 Mycroft AI Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Unit tests for tracking and announcing timer expirations."""
+import time
+from datetime import timedelta
+
+from skill.expiration import ExpirationQueue, get_next_announcement
+from skill.timer import CountdownTimer
+
+TIMER_NAMES = ["pasta", "rice", "eggs", "tea", "bread"]
+
+
+def _expire_timers_at_once(queue: ExpirationQueue, now: float):
+    for index, name in enumerate(TIMER_NAMES, start=1):
+        timer = CountdownTimer(timedelta(minutes=10), name)
+        timer.index = index
+        timer.deadline = now - 1 + index * 0.01
+        queue.push(timer)
+
+
+def _count_announcements(expired_timers, window: float) -> int:
+    """Announce the expired timers the way the skill does, one batch per pass."""
+    announcements = 0
+    timers_to_announce = get_next_announcement(expired_timers, window)
+    while timers_to_announce:
+        announcements += 1
+        for timer in timers_to_announce:
+            timer.expiration_announced = True
+        timers_to_announce = get_next_announcement(expired_timers, window)
+
+    return announcements
+
+
+def test_timers_expiring_together_are_announced_together():
+    queue = ExpirationQueue()
+    now = time.monotonic()
+    _expire_timers_at_once(queue, now)
+    expired_timers = queue.collect_expired(now)
+
+    assert [timer.name for timer in expired_timers] == TIMER_NAMES
+    assert _count_announcements(expired_timers, window=5) == 1
+
+
+def test_timers_announced_separately_without_window():
+    queue = ExpirationQueue()
+    now = time.monotonic()
+    _expire_timers_at_once(queue, now)
+    expired_timers = queue.collect_expired(now)
+
+    assert _count_announcements(expired_timers, window=0) == len(TIMER_NAMES)
+
+
+def test_window_measured_from_first_unannounced_timer():
+    queue = ExpirationQueue()
+    now = time.monotonic()
+    _expire_timers_at_once(queue, now)
+    late_timer = CountdownTimer(timedelta(minutes=10), "soup")
+    late_timer.deadline = now + 10
+    queue.push(late_timer)
+    expired_timers = queue.collect_expired(now + 11)
+
+    first_announcement = get_next_announcement(expired_timers, window=5)
+    for timer in first_announcement:
+        timer.expiration_announced = True
+
+    assert [timer.name for timer in first_announcement] == TIMER_NAMES
+    assert get_next_announcement(expired_timers, window=5) == [late_timer]
+
+
+def test_listeners_told_about_each_expiration_once():
+    queue = ExpirationQueue()
+    expired_timers = []
+    queue.add_listener(expired_timers.append)
+    now = time.monotonic()
+    _expire_timers_at_once(queue, now)
+
+    queue.collect_expired(now)
+    queue.collect_expired(now)
+    assert [timer.name for timer in expired_timers] == TIMER_NAMES
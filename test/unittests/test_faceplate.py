@@ -0,0 +1,95 @@
+# Copyright 2021 Mycroft AI Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Unit tests for drawing timers on the Mark I faceplate."""
+from unittest.mock import Mock
+
+import pytest
+
+from skill.faceplate import FaceplateRenderer
+from skill.faceplate.faceplate import FACEPLATE_WIDTH, GLYPH_WIDTHS, SPACING
+
+
+def _timer(formatted_time_delta: str, number: int = 1) -> Mock:
+    return Mock(number=number, formatted_time_delta=formatted_time_delta)
+
+
+def _drawn_characters(enclosure: Mock) -> list:
+    return [
+        call.args[0].rsplit("/", 1)[-1]
+        for call in enclosure.mouth_display_png.call_args_list
+    ]
+
+
+def test_only_changed_characters_are_redrawn():
+    enclosure = Mock()
+    renderer = FaceplateRenderer(enclosure)
+    renderer.render(_timer("10:00"))
+    assert len(enclosure.mouth_display_png.call_args_list) == 5
+
+    enclosure.reset_mock()
+    renderer.render(_timer("09:59"))
+    assert _drawn_characters(enclosure) == ["0.png", "9.png", "5.png", "9.png"]
+
+    enclosure.reset_mock()
+    renderer.render(_timer("09:58"))
+    assert _drawn_characters(enclosure) == ["8.png"]
+    enclosure.mouth_reset.assert_not_called()
+
+
+def test_layout_change_clears_and_redraws_everything():
+    enclosure = Mock()
+    renderer = FaceplateRenderer(enclosure)
+    renderer.render(_timer("1:00:00"))
+    enclosure.reset_mock()
+
+    renderer.render(_timer("59:59"))
+
+    enclosure.mouth_reset.assert_called_once()
+    assert len(enclosure.mouth_display_png.call_args_list) == 5
+
+
+def test_reset_forces_full_redraw():
+    enclosure = Mock()
+    renderer = FaceplateRenderer(enclosure)
+    renderer.render(_timer("00:05", number=2), multiple_active_timers=True)
+    renderer.reset()
+    enclosure.reset_mock()
+
+    renderer.render(_timer("00:04", number=2), multiple_active_timers=True)
+
+    assert _drawn_characters(enclosure) == [
+        "2.png", "0.png", "0.png", "colon.png", "0.png", "4.png"
+    ]
+
+
+@pytest.mark.parametrize("timer_number", ["", "1", "12"])
+@pytest.mark.parametrize(
+    "timer_display",
+    ["00:05", "59:59", "-59:59", "1:00:00", "-1:00:00", "23:59:59", "-23:59:59"],
+)
+def test_layout_fits_on_faceplate(timer_number, timer_display):
+    cells = FaceplateRenderer._layout(timer_number, timer_display)
+
+    assert "".join(character for _, character in cells).endswith(timer_display)
+    assert cells[0][0] >= 0
+    for (x_coordinate, character), (next_x_coordinate, _) in zip(cells, cells[1:]):
+        assert next_x_coordinate >= x_coordinate + GLYPH_WIDTHS[character]
+    x_coordinate, character = cells[-1]
+    assert x_coordinate + GLYPH_WIDTHS[character] - SPACING <= FACEPLATE_WIDTH
+
+
+def test_layout_keeps_number_when_it_fits():
+    cells = FaceplateRenderer._layout("12", "1:00:00")
+
+    assert "".join(character for _, character in cells) == "121:00:00"
@@ -0,0 +1,44 @@
+# Copyright 2021 Mycroft AI Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Unit tests for importing the faceplate renderer only on a Mark I."""
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+LOAD_SCRIPT = """
+import sys
+from pathlib import Path
+from harness import FakeBus, load_skill
+load_skill(Path({data_directory!r}), FakeBus(), {platform!r})
+print("mycroft_timer.skill.faceplate" in sys.modules)
+"""
+
+
+@pytest.mark.parametrize(
+    "platform, faceplate_imported", [(None, False), ("mycroft_mark_1", True)]
+)
+def test_faceplate_only_imported_on_mark_i(tmp_path, platform, faceplate_imported):
+    script = LOAD_SCRIPT.format(data_directory=str(tmp_path), platform=platform)
+    # The harness is importable from the working directory of the script.
+    output = subprocess.run(
+        [sys.executable, "-c", script],
+        check=True,
+        capture_output=True,
+        text=True,
+        cwd=str(Path(__file__).parent),
+    ).stdout
+
+    assert output.split()[-1] == str(faceplate_imported)
@@ -0,0 +1,83 @@
+# Copyright 2021 Mycroft AI Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Unit tests for ranking active timers by how well their names match a request."""
+import random
+from datetime import timedelta
+from difflib import SequenceMatcher
+
+from skill.match import FUZZY_MATCH_THRESHOLD, rank_timers_by_name
+from skill.store import TimerStore
+from skill.timer import CountdownTimer
+
+WORDS = ("pasta", "rice", "bread", "tea", "eggs", "pie", "cake", "soup", "roast")
+
+
+def _build_store(*names_and_minutes) -> TimerStore:
+    store = TimerStore()
+    for name, minutes in names_and_minutes:
+        store.add(CountdownTimer(timedelta(minutes=minutes), name))
+
+    return store
+
+
+def _rank_every_timer(requested_name, timers):
+    """Score every timer name without pruning, like mycroft's fuzzy_match."""
+    scored_timers = []
+    for timer in timers:
+        score = SequenceMatcher(None, requested_name, timer.name.lower()).ratio()
+        if score >= FUZZY_MATCH_THRESHOLD:
+            scored_timers.append((score, timer))
+    scored_timers.sort(key=lambda scored: (-scored[0], scored[1].deadline))
+
+    return [timer for _, timer in scored_timers]
+
+
+def test_best_match_first_regardless_of_expiration():
+    store = _build_store(("pista", 1), ("pastas", 2), ("pasta", 3), ("rice", 4))
+    pista, pastas, pasta, _ = store.snapshot()
+
+    assert rank_timers_by_name("pasta", store) == [pasta, pastas, pista]
+    assert rank_timers_by_name("pasta", list(store)) == [pasta, pastas, pista]
+
+
+def test_equal_scores_ranked_in_order_of_expiration():
+    store = _build_store(("Pasta", 30), ("pasta", 10), ("PASTA", 20))
+    first, second, third = store.snapshot()
+
+    assert rank_timers_by_name("pasta", store) == [first, second, third]
+    assert [timer.deadline for timer in (first, second, third)] == sorted(
+        timer.deadline for timer in store
+    )
+
+
+def test_limit_keeps_the_best_matches():
+    store = _build_store(("pista", 1), ("pastas", 2), ("pasta", 3))
+    _, pastas, pasta = store.snapshot()
+
+    assert rank_timers_by_name("pasta", store, limit=2) == [pasta, pastas]
+    assert rank_timers_by_name("pasta", store, limit=0) == []
+
+
+def test_pruned_ranking_matches_scoring_every_timer():
+    rng = random.Random(2021)
+    names = {
+        " ".join(rng.choice(WORDS) for _ in range(rng.randint(1, 3)))
+        for _ in range(300)
+    }
+    store = _build_store(*((name, minutes) for minutes, name in enumerate(names, 1)))
+
+    for requested_name in ("pasta", "rice soup", "egg", "roast bread", "teapot"):
+        assert rank_timers_by_name(requested_name, store) == _rank_every_timer(
+            requested_name, store
+        )
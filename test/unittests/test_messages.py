@@ -0,0 +1,72 @@
+# Copyright 2021 Mycroft AI Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Unit tests for the timer changes the skill publishes on the message bus."""
+from mycroft.messagebus.message import Message
+
+from harness import add_timers, FakeBus, load_skill
+
+
+def test_restored_timers_published_and_unloaded_timers_not_cleared(tmp_path):
+    bus = FakeBus()
+    skill = load_skill(tmp_path, bus)
+    add_timers(skill, 2)
+    bus.emitted.clear()
+
+    skill.shutdown()
+    assert bus.emitted["timer.cleared"] == 0
+
+    bus = FakeBus()
+    skill = load_skill(tmp_path, bus)
+    assert bus.emitted["timer.added"] == 2
+    assert bus.emitted["timer.cleared"] == 0
+
+
+def test_bulk_create_names_unnamed_timers_after_requested_timer_names(tmp_path):
+    bus = FakeBus()
+    skill = load_skill(tmp_path, bus)
+    responses = []
+    bus.on("timer.bulk.create.response", responses.append)
+    timers_data = [dict(duration=60, name="Timer pasta"), dict(duration=90)]
+
+    skill.handle_bulk_create(
+        Message("timer.bulk.create", dict(timers=timers_data, speak=False))
+    )
+    skill.handle_bulk_create(
+        Message("timer.bulk.create", dict(timers=[dict(duration=120)]))
+    )
+
+    assert [timer.name for timer in skill.active_timers] == [
+        "Timer pasta",
+        "Timer 1",
+        "Timer 2",
+    ]
+    assert all("error" not in response.data for response in responses)
+
+
+def test_bulk_create_without_a_list_of_timers_answers_with_an_error(tmp_path):
+    bus = FakeBus()
+    skill = load_skill(tmp_path, bus)
+    responses = []
+    bus.on("timer.bulk.create.response", responses.append)
+
+    skill.handle_bulk_create(Message("timer.bulk.create", dict(timers=None)))
+    skill.handle_bulk_create(
+        Message("timer.bulk.create", dict(timers=dict(duration=60)))
+    )
+
+    assert [bool(response.data.get("error")) for response in responses] == [
+        True,
+        True,
+    ]
+    assert not skill.active_timers
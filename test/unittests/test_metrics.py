@@ -0,0 +1,107 @@
+# Copyright 2021 Mycroft AI Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Unit tests for the request handling metrics."""
+import time
+
+from skill.metrics import IntentMetrics, RollingHistogram, TickProfiler
+
+
+def _handle_request(metrics: IntentMetrics):
+    with metrics.request("start_timer"):
+        with metrics.stage("parse"):
+            pass
+        with metrics.stage("persist"):
+            pass
+        with metrics.stage("parse"):
+            pass
+
+
+def test_stage_timings_published_and_kept():
+    published = []
+    metrics = IntentMetrics(published.append, enabled=True)
+
+    _handle_request(metrics)
+    _handle_request(metrics)
+
+    assert len(published) == 2
+    assert published[0]["intent"] == "start_timer"
+    assert set(published[0]["stages"]) == {"parse", "persist"}
+    assert published[0]["total"] >= sum(published[0]["stages"].values())
+    summary = metrics.summarize()
+    assert set(summary["start_timer"]) == {"total", "parse", "persist"}
+    assert summary["start_timer"]["total"]["count"] == 2
+
+
+def test_nothing_collected_when_disabled():
+    published = []
+    metrics = IntentMetrics(published.append)
+
+    _handle_request(metrics)
+    with metrics.stage("parse"):
+        pass
+
+    assert not published
+    assert metrics.summarize() == {}
+
+
+def test_waits_recorded_but_not_counted_in_total():
+    published = []
+    metrics = IntentMetrics(published.append, enabled=True)
+
+    with metrics.request("start_timer"):
+        with metrics.wait("speech"):
+            time.sleep(0.05)
+
+    assert published[0]["stages"]["speech"] >= 0.05
+    assert published[0]["total"] < 0.05
+
+
+def test_histogram_only_keeps_recent_samples():
+    histogram = RollingHistogram(size=3)
+    for seconds in (10.0, 0.0005, 0.0005, 0.003):
+        histogram.add(seconds)
+
+    summary = histogram.summarize()
+
+    assert summary["count"] == 3
+    assert summary["max"] == 0.003
+    assert summary["buckets"] == {"<=1ms": 2, "<=5ms": 1}
+
+
+def test_tick_profile_records_phases_drift_and_missed_ticks():
+    profiler = TickProfiler(enabled=True)
+    for pause in (0.1, 0.3, 0):
+        with profiler.tick("UpdateTimerDisplay", period=0.1):
+            with profiler.phase("gui"):
+                pass
+        time.sleep(pause)
+
+    profile = profiler.summarize()["UpdateTimerDisplay"]
+
+    assert profile["ticks"] == 3
+    assert profile["missed_ticks"] == 2
+    assert profile["drift"]["count"] == 2
+    assert profile["phases"]["gui"]["count"] == 3
+
+
+def test_restarted_event_does_not_count_missed_ticks():
+    profiler = TickProfiler(enabled=True)
+    with profiler.tick("ExpirationCheck", period=0.1):
+        pass
+    time.sleep(0.3)
+    profiler.restart("ExpirationCheck")
+    with profiler.tick("ExpirationCheck", period=0.1):
+        pass
+
+    assert profiler.summarize()["ExpirationCheck"]["missed_ticks"] == 0
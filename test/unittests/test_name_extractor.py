@@ -0,0 +1,35 @@
+# Copyright 2021 Mycroft AI Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Unit tests for extracting timer names from utterances."""
+import os
+
+from skill.name_extractor import extract_timer_name, get_timer_name_patterns
+
+
+def test_patterns_cached_until_regex_file_modified(tmp_path):
+    regex_file = tmp_path.joinpath("name.rx")
+    regex_file.write_text("# names\nfor (?P<Name>.+)\n")
+    patterns = get_timer_name_patterns(str(regex_file))
+
+    assert get_timer_name_patterns(str(regex_file)) is patterns
+    assert extract_timer_name("start a timer for pasta", str(regex_file)) == "pasta"
+
+    regex_file.write_text("called (?P<Name>.+)\n")
+    modified_time = os.stat(regex_file).st_mtime_ns + 1_000_000_000
+    os.utime(regex_file, ns=(modified_time, modified_time))
+
+    reloaded_patterns = get_timer_name_patterns(str(regex_file))
+    assert reloaded_patterns is not patterns
+    assert [pattern.pattern for pattern in reloaded_patterns] == ["called (?P<Name>.+)"]
+    assert extract_timer_name("a timer called rice", str(regex_file)) == "rice"
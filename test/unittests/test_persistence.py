@@ -0,0 +1,145 @@
+# Copyright 2021 Mycroft AI Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Unit tests for the timer journal."""
+import copy
+import pickle
+from datetime import timedelta
+
+from skill.persistence import TimerJournal
+from skill.timer import CountdownTimer
+
+
+def _build_timer(seconds: int, name: str, index: int) -> CountdownTimer:
+    timer = CountdownTimer(timedelta(seconds=seconds), name)
+    timer.index = index
+    timer.ordinal = 1
+    return timer
+
+
+def _write_journal(journal: TimerJournal):
+    """Journal a series of changes, returning the timer records after each change."""
+    states = [{}]
+    pasta = _build_timer(600, "pasta", 1)
+    rice = _build_timer(900, "rice", 2)
+    unnamed = _build_timer(300, "Timer", 3)
+    changes = (
+        lambda: journal.record_add(pasta),
+        lambda: journal.record_add(rice),
+        lambda: journal.record_add(unnamed),
+        lambda: journal.record_announce(pasta),
+        lambda: journal.record_cancel(rice),
+        lambda: journal.record_rename(unnamed),
+        lambda: journal.record_clear(),
+        lambda: journal.record_add(rice),
+    )
+    for change in changes:
+        change()
+        states.append(copy.deepcopy(journal.live_records))
+
+    return states
+
+
+def test_load_replays_journal(tmp_path):
+    journal_path = tmp_path.joinpath("timers.journal")
+    states = _write_journal(TimerJournal(journal_path))
+
+    timers = TimerJournal(journal_path).load()
+
+    assert [timer.name for timer in timers] == ["rice"]
+    assert timers[0].duration == timedelta(seconds=900)
+    assert len(states) == 9
+
+
+def test_batch_writes_records_together(tmp_path):
+    journal_path = tmp_path.joinpath("timers.journal")
+    journal = TimerJournal(journal_path)
+    timers = [_build_timer(60, "timer {}".format(i), i) for i in range(1, 4)]
+    with journal.batch():
+        for timer in timers:
+            journal.record_add(timer)
+        assert not journal_path.exists()
+
+    assert len(journal_path.read_bytes().splitlines()) == 3
+
+
+def test_truncated_journal_loads_last_complete_change(tmp_path):
+    journal_path = tmp_path.joinpath("timers.journal")
+    states = _write_journal(TimerJournal(journal_path))
+    journal_bytes = journal_path.read_bytes()
+
+    truncated_path = tmp_path.joinpath("truncated.journal")
+    for offset in range(len(journal_bytes) + 1):
+        truncated_bytes = journal_bytes[:offset]
+        truncated_path.write_bytes(truncated_bytes)
+        journal = TimerJournal(truncated_path)
+        journal.load()
+        complete_records = truncated_bytes.count(b"\n")
+        assert journal.live_records == states[complete_records], offset
+
+
+def test_compaction_keeps_active_timers(tmp_path):
+    journal_path = tmp_path.joinpath("timers.journal")
+    journal = TimerJournal(journal_path)
+    keeper = _build_timer(60, "keeper", 1)
+    journal.record_add(keeper)
+    for index in range(2, 200):
+        timer = _build_timer(60, "timer {}".format(index), index)
+        journal.record_add(timer)
+        journal.record_cancel(timer)
+
+    assert len(journal_path.read_bytes().splitlines()) < 100
+    timers = TimerJournal(journal_path).load()
+    assert [timer.name for timer in timers] == ["keeper"]
+
+
+def test_pickled_timers_are_migrated(tmp_path):
+    pickle_path = tmp_path.joinpath("save_timers")
+    legacy_timers = [_build_timer(600, "pasta", 1), _build_timer(900, "rice", 2)]
+    with open(pickle_path, "wb") as data_file:
+        pickle.dump(legacy_timers, data_file, pickle.HIGHEST_PROTOCOL)
+    journal = TimerJournal(tmp_path.joinpath("timers.journal"))
+
+    timers = journal.migrate_pickle(pickle_path)
+
+    assert not pickle_path.exists()
+    assert [timer.name for timer in timers] == ["pasta", "rice"]
+    assert timers[0].expiration == legacy_timers[0].expiration
+    assert [timer.name for timer in journal.load()] == ["pasta", "rice"]
+
+
+def test_pickle_migration_does_not_run_code(tmp_path):
+    pickle_path = tmp_path.joinpath("save_timers")
+    marker_path = tmp_path.joinpath("marker")
+    with open(pickle_path, "wb") as data_file:
+        pickle.dump([_Exploit(str(marker_path))], data_file)
+    journal = TimerJournal(tmp_path.joinpath("timers.journal"))
+
+    assert journal.migrate_pickle(pickle_path) == []
+    assert not marker_path.exists()
+
+
+def test_newer_journal_version_is_set_aside(tmp_path):
+    journal_path = tmp_path.joinpath("timers.journal")
+    journal_path.write_text('{"op":"version","version":99}\n')
+
+    assert TimerJournal(journal_path).load() == []
+    assert journal_path.with_suffix(".unsupported").exists()
+
+
+class _Exploit:
+    def __init__(self, path):
+        self.path = path
+
+    def __reduce__(self):
+        return open, (self.path, "w")
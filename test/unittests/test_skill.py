@@ -0,0 +1,62 @@
+# Copyright 2021 Mycroft AI Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Unit tests for what the timer skill speaks, and when."""
+import sys
+
+from harness import add_timers, expire_timers, FakeBus, load_skill
+
+
+def _trace_expiration(skill):
+    trace = []
+    skill.beeper.start = lambda: trace.append("start")
+    skill.beeper.stop = lambda: trace.append("stop")
+    skill.speak_dialog = lambda name, data=None: trace.append(("speak", name))
+
+    return trace
+
+
+def test_beeper_not_started_on_a_pass_that_announces(tmp_path):
+    skill = load_skill(tmp_path, FakeBus())
+    add_timers(skill, 1)
+    expire_timers(skill)
+    timer = skill.active_timers.snapshot()[0]
+    timer.expiration_announced = False
+    trace = _trace_expiration(skill)
+
+    skill.check_for_expired_timers()
+
+    assert "start" not in trace
+    assert trace[-1] == ("speak", "timer-expired")
+    assert timer.expiration_announced
+
+    trace.clear()
+    skill.check_for_expired_timers()
+
+    assert trace == ["start"]
+
+
+def test_number_of_matching_timers_spoken_in_the_skill_language(tmp_path, monkeypatch):
+    skill = load_skill(tmp_path, FakeBus())
+    add_timers(skill, 2)
+    skill_module = sys.modules[type(skill).__module__]
+    languages = []
+    monkeypatch.setattr(
+        skill_module,
+        "get_speakable_number",
+        lambda number, lang=None: languages.append(lang) or str(number),
+    )
+
+    skill._speak_timer_status_matches(list(skill.active_timers))
+
+    assert languages == [skill.lang]
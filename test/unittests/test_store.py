@@ -0,0 +1,193 @@
+# Copyright 2021 Mycroft AI Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Unit tests for the active timer collection."""
+from datetime import timedelta
+from pathlib import Path
+
+from skill.match import get_timers_matching_utterance
+from skill.store import TimerStore
+from skill.timer import CountdownTimer
+
+REGEX_FILE_PATH = Path(__file__).parents[2].joinpath("locale", "en-us", "name.rx")
+TEN_MINUTES = timedelta(minutes=10)
+
+
+def _add_timer(store: TimerStore, duration: timedelta, name: str) -> CountdownTimer:
+    timer = CountdownTimer(duration, name)
+    store.add(timer)
+    return timer
+
+
+def test_timers_kept_in_expiration_order():
+    store = TimerStore()
+    _add_timer(store, timedelta(minutes=30), "rice")
+    _add_timer(store, timedelta(minutes=5), "tea")
+    _add_timer(store, TEN_MINUTES, "pasta")
+
+    assert [timer.name for timer in store] == ["tea", "pasta", "rice"]
+
+
+def test_name_lookup_ignores_case_and_follows_renames():
+    store = TimerStore()
+    timer = _add_timer(store, TEN_MINUTES, "Timer")
+
+    assert store.get_by_name("timer") is timer
+    store.rename(timer, "Timer 1")
+    assert store.get_by_name("timer") is None
+    assert store.get_by_name("TIMER 1") is timer
+    store.remove(timer)
+    assert store.get_by_name("timer 1") is None
+
+
+def test_snapshot_lookups_unaffected_by_later_changes():
+    store = TimerStore()
+    timer = _add_timer(store, TEN_MINUTES, "pasta")
+    snapshot = store.snapshot()
+
+    store.remove(timer)
+    _add_timer(store, TEN_MINUTES, "rice")
+
+    assert snapshot.get_by_name("pasta") is timer
+    assert snapshot.get_by_duration(TEN_MINUTES) == [timer]
+    assert snapshot.get_name_candidates("pasta", 0.5) == [timer]
+    assert store.get_by_name("pasta") is None
+
+
+def test_snapshot_names_and_ordinals_unaffected_by_later_changes():
+    store = TimerStore()
+    first = _add_timer(store, TEN_MINUTES, "a")
+    second = _add_timer(store, TEN_MINUTES, "b")
+    snapshot = store.snapshot()
+
+    store.remove(first)
+    store.rename(second, "zzz")
+
+    assert [snapshot.get_ordinal(first), snapshot.get_ordinal(second)] == [1, 2]
+    assert snapshot.get_by_name("b") is second
+    assert snapshot.get_name(second) == "b"
+    assert snapshot.get_by_name("zzz") is None
+    assert store.get_ordinal(second) == second.ordinal == 1
+    assert store.get_name(second) == second.name == "zzz"
+    assert store.get_ordinal(first) is None
+    assert get_timers_matching_utterance(
+        "cancel the second 10 minute timer",
+        snapshot,
+        str(REGEX_FILE_PATH),
+        "en-us",
+    ) == [second]
+
+
+def test_ordinals_renumbered_when_timer_removed():
+    store = TimerStore()
+    first = _add_timer(store, TEN_MINUTES, "first")
+    second = _add_timer(store, TEN_MINUTES, "second")
+    third = _add_timer(store, TEN_MINUTES, "third")
+    other = _add_timer(store, timedelta(minutes=5), "other")
+
+    assert [first.ordinal, second.ordinal, third.ordinal, other.ordinal] == [1, 2, 3, 1]
+    store.remove(first)
+    assert [second.ordinal, third.ordinal] == [1, 2]
+    fourth = _add_timer(store, TEN_MINUTES, "fourth")
+    assert fourth.ordinal == 3
+    assert store.get_by_duration(TEN_MINUTES) == [second, third, fourth]
+
+
+def test_timers_with_the_same_deadline_are_removed_by_index():
+    store = TimerStore()
+    timers = [_add_timer(store, TEN_MINUTES, "timer") for _ in range(5)]
+    for timer in timers:
+        timer.deadline = timers[0].deadline
+    store.replace_all(timers)
+
+    store.remove(timers[2])
+    assert list(store) == [timers[0], timers[1], timers[3], timers[4]]
+    assert timers[2] not in store
+    assert store.get(timers[3].index) is timers[3]
+
+
+def test_indexes_are_stable_and_never_reused():
+    store = TimerStore()
+    first = _add_timer(store, TEN_MINUTES, "first")
+    second = _add_timer(store, TEN_MINUTES, "second")
+    assert (first.index, second.index) == (1, 2)
+
+    store.remove(second)
+    store.clear()
+    third = _add_timer(store, TEN_MINUTES, "third")
+    assert third.index == 3
+    assert store.get(1) is None
+    assert store.get(3) is third
+
+
+def test_numbers_restart_once_no_timers_are_active():
+    store = TimerStore()
+    first = _add_timer(store, TEN_MINUTES, "first")
+    second = _add_timer(store, TEN_MINUTES, "second")
+    store.remove(first)
+    third = _add_timer(store, TEN_MINUTES, "third")
+    assert (second.number, third.number) == (2, 3)
+
+    store.remove(second)
+    store.remove(third)
+    fourth = _add_timer(store, TEN_MINUTES, "fourth")
+    assert (fourth.index, fourth.number) == (4, 1)
+
+
+def test_loaded_timers_keep_their_index():
+    store = TimerStore()
+    loaded = CountdownTimer(TEN_MINUTES, "loaded")
+    loaded.index = 7
+    store.replace_all([loaded])
+    new = _add_timer(store, TEN_MINUTES, "new")
+
+    assert loaded.index == 7
+    assert new.index == 8
+    assert (loaded.number, new.number) == (1, 2)
+
+
+def test_range_and_next_expiring_queries():
+    store = TimerStore()
+    timers = [
+        _add_timer(store, timedelta(minutes=minutes), str(minutes))
+        for minutes in (30, 5, 20, 10, 1)
+    ]
+    timers.sort(key=lambda timer: timer.deadline)
+    now = timers[0].deadline - 1
+
+    assert store.get_next_expiring(2, now) == timers[:2]
+    assert store.get_next_expiring(10, timers[1].deadline) == timers[2:]
+    assert store.get_expired(timers[1].deadline + 1) == timers[:2]
+    earliest, latest = timers[1].deadline, timers[3].deadline
+    assert store.get_expiring_between(earliest, latest) == timers[1:4]
+
+
+def test_listeners_told_about_changes_in_order():
+    store = TimerStore()
+    changes = []
+    store.add_listener(lambda change, timer: changes.append((change, timer)))
+    pasta = _add_timer(store, TEN_MINUTES, "pasta")
+    store.rename(pasta, "spaghetti")
+    store.remove(pasta)
+    store.remove(pasta)
+    store.clear()
+    rice = _add_timer(store, TEN_MINUTES, "rice")
+    store.clear()
+
+    assert changes == [
+        ("added", pasta),
+        ("renamed", pasta),
+        ("removed", pasta),
+        ("added", rice),
+        ("cleared", None),
+    ]
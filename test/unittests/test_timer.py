@@ -0,0 +1,35 @@
+# Copyright 2021 Mycroft AI Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Unit tests for the timer object."""
+import time
+from datetime import timedelta
+from unittest.mock import patch
+
+from skill.timer import CountdownTimer
+
+
+def test_display_expiration_follows_the_deadline_after_a_clock_change():
+    timer = CountdownTimer(timedelta(minutes=10), "pasta")
+    timer.index = 1
+    display_data = timer.display_data
+    assert display_data == timer.display_data
+
+    wall_clock = time.time()
+    with patch("skill.timer.time.time", return_value=wall_clock + 0.4):
+        assert timer.display_data == display_data
+    with patch("skill.timer.time.time", return_value=wall_clock + 3600):
+        moved_display_data = timer.display_data
+    assert moved_display_data["expiration"] - display_data["expiration"] == (
+        3600 * 1000
+    )
@@ -0,0 +1,126 @@
+# Copyright 2021 Mycroft AI Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Unit tests for the timer skill utility functions."""
+import os
+import random
+from datetime import timedelta
+
+import skill.util
+from skill.match import TimerMatcher
+from skill.store import TimerStore
+from skill.timer import CountdownTimer
+from skill.util import (
+    extract_timer_duration,
+    format_seconds,
+    format_timedelta,
+    parse_utterance,
+)
+
+THREE_DAYS = 3 * 24 * 60 * 60
+
+
+def _format_timedelta_with_timedelta_arithmetic(time_delta: timedelta) -> str:
+    """The original implementation of format_timedelta, used as the reference."""
+    hours = abs(time_delta // timedelta(hours=1))
+    minutes = abs((time_delta - timedelta(hours=hours)) // timedelta(minutes=1))
+    seconds = abs(
+        (time_delta - timedelta(hours=hours) - timedelta(minutes=minutes))
+        // timedelta(seconds=1)
+    )
+    if hours:
+        time_elements = [str(hours), str(minutes).zfill(2), str(seconds).zfill(2)]
+    else:
+        time_elements = [str(minutes).zfill(2), str(seconds).zfill(2)]
+
+    return ":".join(time_elements)
+
+
+def test_format_seconds_matches_original_for_every_second_near_an_hour():
+    for seconds in range(-2 * 3600, 2 * 3600 + 1):
+        expected = _format_timedelta_with_timedelta_arithmetic(
+            timedelta(seconds=seconds)
+        )
+        assert format_seconds(seconds) == expected
+
+
+def test_format_timedelta_matches_original_for_random_deltas():
+    rng = random.Random(2021)
+    for _ in range(20000):
+        time_delta = timedelta(
+            seconds=rng.randint(-THREE_DAYS, THREE_DAYS),
+            microseconds=rng.randint(0, 999999),
+        )
+        expected = _format_timedelta_with_timedelta_arithmetic(time_delta)
+        assert format_timedelta(time_delta) == expected
+
+
+def test_format_seconds_examples():
+    assert format_seconds(0) == "00:00"
+    assert format_seconds(299) == "04:59"
+    assert format_seconds(3599) == "59:59"
+    assert format_seconds(3600) == "1:00:00"
+    assert format_seconds(THREE_DAYS + 61) == "72:01:01"
+
+
+def _count_calls(monkeypatch, function_name):
+    calls = []
+    function = getattr(skill.util, function_name)
+
+    def counted(*args, **kwargs):
+        calls.append(args)
+        return function(*args, **kwargs)
+
+    monkeypatch.setattr(skill.util, function_name, counted)
+
+    return calls
+
+
+def test_one_parse_serves_every_step_of_a_request(monkeypatch, tmp_path):
+    regex_file = tmp_path.joinpath("name.rx")
+    regex_file.write_text("(?P<Name>\\w+) timer$\n")
+    duration_calls = _count_calls(monkeypatch, "extract_duration")
+    number_calls = _count_calls(monkeypatch, "extract_number")
+    timers = TimerStore()
+    timers.add(CountdownTimer(timedelta(minutes=5), "pasta"))
+    utterance = "cancel all 5 minute pasta timer"
+
+    # The cancel-all check.
+    parsed_utterance = parse_utterance(utterance, str(regex_file), "en-us")
+    assert parsed_utterance.includes_any({"all"})
+    # The response validator.
+    duration, _ = extract_timer_duration(utterance, "en-us")
+    assert duration == timedelta(minutes=5)
+    # The matcher.
+    matcher = TimerMatcher(utterance, timers, str(regex_file), "en-us")
+    assert matcher.requested_duration == duration
+    assert matcher.requested_name == "pasta"
+
+    assert len(duration_calls) == 1
+    assert len(number_calls) == 1
+
+
+def test_parse_reloaded_when_regex_file_modified(tmp_path):
+    regex_file = tmp_path.joinpath("name.rx")
+    regex_file.write_text("for (?P<Name>.+)\n")
+    utterance = "start a timer called tea for ten"
+    parsed_utterance = parse_utterance(utterance, str(regex_file))
+
+    assert parse_utterance(utterance, str(regex_file)) is parsed_utterance
+    assert parsed_utterance.name == "ten"
+
+    regex_file.write_text("called (?P<Name>\\w+)\n")
+    modified_time = os.stat(regex_file).st_mtime_ns + 1_000_000_000
+    os.utime(regex_file, ns=(modified_time, modified_time))
+
+    assert parse_utterance(utterance, str(regex_file)).name == "tea"
@@ -15,11 +15,13 @@
 import QtQuick 2.4
 import QtQuick.Layouts 1.1
 import QtQuick.Controls 2.3
+import "timer_format.js" as TimerFormat
 
 Rectangle {
     property color backgroundColor
     property var timerInfo
     property int timerCount
+    property real currentTime
 
     color: {
         if (timerInfo) {
@@ -46,7 +48,7 @@ Rectangle {
     /* Flash the background when the timer expires for a visual cue */
     SequentialAnimation on opacity {
         id: expireAnimation
-        running: timerInfo ? timerInfo.expired : false
+        running: timerInfo ? TimerFormat.isExpired(timerInfo.expiration, currentTime) : false
         loops: Animation.Infinite
         PropertyAnimation {
             from: 1;
@@ -119,7 +121,7 @@ Rectangle {
                 }
             }
             font.styleName: "Bold"
-            text: timerInfo ? timerInfo.timeDelta : ""
+            text: timerInfo ? TimerFormat.formatTimeDelta(timerInfo.expiration, currentTime) : ""
         }
     }
 
@@ -134,6 +136,14 @@ Rectangle {
         }
         height: gridUnit * 2
         radius: 16
-        width: timerInfo ? parent.width * timerInfo.percentRemaining : 0
+        width: {
+            if (timerInfo) {
+                return parent.width * TimerFormat.percentRemaining(
+                    timerInfo.expiration, timerInfo.duration, currentTime
+                )
+            } else {
+                return 0
+            }
+        }
     }
 }
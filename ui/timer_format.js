@@ -0,0 +1,53 @@
+// Copyright 2021, Mycroft AI Inc.
+//
+// Licensed under the Apache License, Version 2.0 (the "License");
+// you may not use this file except in compliance with the License.
+// You may obtain a copy of the License at
+//
+//    http://www.apache.org/licenses/LICENSE-2.0
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS,
+// WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+// See the License for the specific language governing permissions and
+// limitations under the License.
+
+// Count timers down locally so the skill only sends data when the timers change.
+// Expiration is milliseconds since the epoch and duration is in milliseconds.
+.pragma library
+
+function isExpired(expiration, currentTime) {
+    return expiration < currentTime
+}
+
+/* Same format as format_timedelta in the skill, e.g. "04:59", "1:04:59" or "-00:03" */
+function formatTimeDelta(expiration, currentTime) {
+    var delta = expiration - currentTime
+    var sign = ""
+    if (isExpired(expiration, currentTime)) {
+        sign = "-"
+        delta = -delta
+    }
+    var totalSeconds = Math.floor(delta / 1000)
+    var hours = Math.floor(totalSeconds / 3600)
+    var minutes = Math.floor((totalSeconds % 3600) / 60)
+    var seconds = totalSeconds % 60
+    var formatted = zeroPad(minutes) + ":" + zeroPad(seconds)
+    if (hours) {
+        formatted = hours + ":" + formatted
+    }
+
+    return sign + formatted
+}
+
+function percentRemaining(expiration, duration, currentTime) {
+    if (isExpired(expiration, currentTime) || !duration) {
+        return 0
+    }
+
+    return (expiration - currentTime) / duration
+}
+
+function zeroPad(value) {
+    return value < 10 ? "0" + value : "" + value
+}
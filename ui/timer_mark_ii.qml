@@ -18,12 +18,22 @@ import Mycroft 1.0 as Mycroft
 
 Mycroft.CardDelegate {
     id: timerScreen
+    property real currentTime: Date.now()
+
+    /* The skill only sends data when the timers change so count down locally */
+    Timer {
+        interval: 250
+        running: true
+        repeat: true
+        onTriggered: timerScreen.currentTime = Date.now()
+    }
 
     MycroftTimer {
         id: timerOne
         backgroundColor: "#22A7F0"
         timerInfo: sessionData.activeTimers.timers[0]
         timerCount: sessionData.activeTimerCount
+        currentTime: timerScreen.currentTime
     }
 
     MycroftTimer {
@@ -33,6 +43,7 @@ Mycroft.CardDelegate {
         backgroundColor: "#40DBB0"
         timerInfo: sessionData.activeTimers.timers[1]
         timerCount: sessionData.activeTimerCount
+        currentTime: timerScreen.currentTime
     }
 
     MycroftTimer {
@@ -42,6 +53,7 @@ Mycroft.CardDelegate {
         backgroundColor: "#BDC3C7"
         timerInfo: sessionData.activeTimers.timers[2]
         timerCount: sessionData.activeTimerCount
+        currentTime: timerScreen.currentTime
     }
 
     MycroftTimer {
@@ -53,5 +65,6 @@ Mycroft.CardDelegate {
         backgroundColor: "#4DE0FF"
         timerInfo: sessionData.activeTimers.timers[3]
         timerCount: sessionData.activeTimerCount
+        currentTime: timerScreen.currentTime
     }
 }
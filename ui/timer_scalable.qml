@@ -5,6 +5,7 @@ import QtGraphicalEffects 1.0
 import QtQml.Models 2.12
 import org.kde.kirigami 2.9 as Kirigami
 import Mycroft 1.0 as Mycroft
+import "timer_format.js" as TimerFormat
 
 Mycroft.CardDelegate {
     id: timerFrame
@@ -14,6 +15,15 @@ Mycroft.CardDelegate {
     bottomPadding: 0
 
     property bool horizontalMode: timerFrame.width > timerFrame.height ? 1 : 0
+    property real currentTime: Date.now()
+
+    /* The skill only sends data when the timers change so count down locally */
+    Timer {
+        interval: 250
+        running: true
+        repeat: true
+        onTriggered: timerFrame.currentTime = Date.now()
+    }
 
     Component {
         id: timerDelegate
@@ -56,12 +66,12 @@ Mycroft.CardDelegate {
                     width: timerBackground.width - Kirigami.Units.largeSpacing
                     font.pixelSize: parent.width * 0.20
                     font.weight: Font.Bold
-                    text: modelData.timeDelta
+                    text: TimerFormat.formatTimeDelta(modelData.expiration, timerFrame.currentTime)
 
                     /* Flash the time delta when the timer expires for a visual cue */
                     SequentialAnimation on opacity {
                         id: expireAnimation
-                        running: modelData.expired
+                        running: TimerFormat.isExpired(modelData.expiration, timerFrame.currentTime)
                         loops: Animation.Infinite
                         PropertyAnimation {
                             from: 1;
@@ -82,7 +92,9 @@ Mycroft.CardDelegate {
                     radius: timerBackground.radius
                     anchors.bottom: parent.bottom
                     color: "#FD9E66"
-                    width: parent.width * modelData.percentRemaining
+                    width: parent.width * TimerFormat.percentRemaining(
+                        modelData.expiration, modelData.duration, timerFrame.currentTime
+                    )
                 }
             }
         }